@@ -4,18 +4,28 @@ import sys
 import select
 from neopixel import NeoPixel
 import ssd1306  # (추가) OLED 라이브러리
+from textdisplay import TextDisplay  # (추가) 바뀐 줄만 다시 그리는 OLED 텍스트 화면
+from binlog import BinLog  # (추가) 고정 크기 이진 로그 (모아서 쓰기, 크기 제한)
 
 # --- 1. 학습된 핀 번호 설정 ---
 NEOPIXEL_PIN = 21  # 네오픽셀 (GP21)
 BUZZER_PIN = 22    # 부저 (GP22)
 I2C_SDA_PIN = 4    # I2C SDA (GP4)
 I2C_SCL_PIN = 5    # I2C SCL (GP5)
-LOG_FILE = 'serial_log.txt'
+# (수정) 로그는 serial_log.0, serial_log.1 ... 파일에 이진 레코드로 저장 (가장 오래된 파일부터 자동 삭제)
+LOG_PREFIX = 'serial_log'
+LOG_FORMAT = '<I44s'     # (ticks_ms, 메시지 앞 44바이트) + CRC 4바이트 = 레코드 하나 52바이트
+LOG_MESSAGE_BYTES = 44     # LOG_FORMAT 의 메시지 칸 크기 (넘으면 글자 단위로 자름)
+LOG_SEGMENT_RECORDS = 512  # 파일 하나에 담을 레코드 수
+LOG_SEGMENTS = 4           # 남겨 둘 파일 수 (최대 약 106KB)
+LOG_BUFFER_RECORDS = 8     # 이만큼 모이면 한 번에 플래시에 씀
+LOG_FLUSH_MS = 5000        # 덜 모였어도 이 시간이 지나면 씀 (ms)
 
 # --- 2. (추가) OLED 설정 ---
 OLED_WIDTH = 128
 OLED_HEIGHT = 64
 I2C_ADDR = 0x3C # OLED 주소
+OLED_MAX_FPS = 10 # OLED 화면 갱신 최대 횟수 (초당)
 
 # --- 3. (추가) OLED에 표시할 텍스트 (128x64, 4줄 맞춤) ---
 OLED_TEXTS = {
@@ -93,33 +103,37 @@ def set_neopixel(color):
     np[0] = color
     np.write()
 
-def log_message(msg):
-    """파일에 로그를 기록합니다."""
+# (수정) 메시지마다 파일을 열고 닫지 않고, 버퍼에 모았다가 한 번에 씀 (플래시 수명 보호)
+# 저장된 로그 보기 (REPL): for t, m in log.records(): print(t, m.rstrip(b"\0"))
+log = BinLog(LOG_PREFIX, LOG_FORMAT, LOG_SEGMENT_RECORDS, LOG_SEGMENTS, LOG_BUFFER_RECORDS, LOG_FLUSH_MS)
+
+def encode_message(msg):
+    """메시지를 UTF-8 로 바꾸고 LOG_MESSAGE_BYTES 에 맞게 자릅니다. (한글처럼 여러 바이트인 글자를 중간에서 자르지 않음)"""
+    data = msg.encode()
+    if len(data) <= LOG_MESSAGE_BYTES:
+        return data
+    cut = LOG_MESSAGE_BYTES
+    while cut > 0 and data[cut] & 0xC0 == 0x80:  # 잘린 자리가 글자 중간(이어지는 바이트)이면 그 글자 앞까지
+        cut -= 1
+    return data[:cut]
+
+def log_message(msg, flush=False):
+    """로그를 기록합니다. flush=True 면 바로 플래시에 씀 (오류 등)"""
     try:
-        with open(LOG_FILE, 'a') as f:
-            f.write(f"{time.ticks_ms()}: {msg}\n")
+        log.append(time.ticks_ms(), encode_message(msg))
+        if flush:
+            log.flush()
     except Exception as e:
         print(f"Failed to write log: {e}")
 
-def display_text(text_list):
-    """OLED에 텍스트 목록을 출력합니다."""
-    if oled is None: # OLED가 초기화되지 않았다면 함수 종료
-        return
-        
-    oled.fill(0) # 화면 지우기
-    for i, line_text in enumerate(text_list):
-        # (수정) Y 좌표 계산: 인덱스(i) * 한 줄 높이(16)
-        y_pos = i * 16
-        
-        if y_pos < OLED_HEIGHT:
-            oled.text(line_text, 0, y_pos) # (텍스트, X좌표, Y좌표)
-        else:
-            break
-    oled.show() # 화면 갱신
+# (수정) OLED 텍스트 화면: 바뀐 줄만 다시 그리고 초당 OLED_MAX_FPS 번까지만 갱신
+# OLED가 없으면(None) display_text()는 아무 동작도 하지 않습니다.
+screen = TextDisplay(oled, lines=OLED_HEIGHT // 16, line_height=16, max_fps=OLED_MAX_FPS)
+display_text = screen.show
 
 # --- 8. 부팅 및 시작 ---
 log_message("---- SCRIPT STARTED ----")
-display_text(OLED_TEXTS["boot"]) # (추가) OLED에 부팅 메시지
+display_text(OLED_TEXTS["boot"], force=True) # (추가) OLED에 부팅 메시지
 set_neopixel(COLOR_GREEN)
 current_state = 3
 time.sleep(1) # 부팅 메시지를 1초간 보여줌
@@ -127,79 +141,88 @@ display_text(OLED_TEXTS[current_state]) # (추가) OLED에 현재 상태(안전)
 print("Pico Ready. Waiting for Serial commands...")
 
 # --- 9. 메인 루프 ---
-while True:
-    try:
-        now = time.ticks_ms()
+# (추가) 끝날 때(Ctrl+C 등) 버퍼에 남은 로그를 플래시에 씀
+try:
+    while True:
+        try:
+            now = time.ticks_ms()
+
+            # 미뤄진 OLED 갱신이 있으면 내보냄
+            screen.poll()
+            # 오래 기다린 로그가 있으면 플래시에 씀
+            log.poll()
 
-        # --- A. 시리얼 입력 처리 ---
-        events = poller.poll(10)
+            # --- A. 시리얼 입력 처리 ---
+            events = poller.poll(10)
         
-        if events:
-            line_data = sys.stdin.readline()
-            if line_data:
-                class_name = line_data.strip()
-                log_message(f"Received: {class_name}")
+            if events:
+                line_data = sys.stdin.readline()
+                if line_data:
+                    class_name = line_data.strip()
+                    log_message(f"Received: {class_name}")
                 
-                new_state = 0 # 기본값 (알수없는 명령)
-                if class_name == "Class 1":
-                    new_state = 1
-                elif class_name == "Class 2":
-                    new_state = 2
-                elif class_name == "Class 3":
-                    new_state = 3
-
-                # 상태가 변경되었을 때만 실행
-                if new_state != current_state:
-                    current_state = new_state
+                    new_state = 0 # 기본값 (알수없는 명령)
+                    if class_name == "Class 1":
+                        new_state = 1
+                    elif class_name == "Class 2":
+                        new_state = 2
+                    elif class_name == "Class 3":
+                        new_state = 3
+
+                    # 상태가 변경되었을 때만 실행
+                    if new_state != current_state:
+                        current_state = new_state
                     
-                    # (추가) OLED에 즉시 상태 텍스트 출력
-                    display_text(OLED_TEXTS[current_state])
+                        # (추가) OLED에 즉시 상태 텍스트 출력
+                        display_text(OLED_TEXTS[current_state])
                     
-                    # --- 장치 초기화 ---
-                    buzzer.duty_u16(0)
-                    buzzer_on = False
-                    neopixel_on = False
+                        # --- 장치 초기화 ---
+                        buzzer.duty_u16(0)
+                        buzzer_on = False
+                        neopixel_on = False
                     
-                    if current_state == 3:
-                        set_neopixel(COLOR_GREEN)
-                    elif current_state == 0:
-                        set_neopixel(COLOR_OFF)
+                        if current_state == 3:
+                            set_neopixel(COLOR_GREEN)
+                        elif current_state == 0:
+                            set_neopixel(COLOR_OFF)
                     
-                    last_blink_time = now
-                    last_beep_time = now
+                        last_blink_time = now
+                        last_beep_time = now
 
-        # --- B. 현재 상태에 따른 동작 처리 (비차단) ---
+            # --- B. 현재 상태에 따른 동작 처리 (비차단) ---
 
-        # 1. 비상 (Class 1): 빨간색 깜빡임 + 2초 간격 비프음
-        if current_state == 1:
-            if time.ticks_diff(now, last_blink_time) > 500:
-                neopixel_on = not neopixel_on
-                set_neopixel(COLOR_RED if neopixel_on else COLOR_OFF)
-                last_blink_time = now
+            # 1. 비상 (Class 1): 빨간색 깜빡임 + 2초 간격 비프음
+            if current_state == 1:
+                if time.ticks_diff(now, last_blink_time) > 500:
+                    neopixel_on = not neopixel_on
+                    set_neopixel(COLOR_RED if neopixel_on else COLOR_OFF)
+                    last_blink_time = now
 
-            if not buzzer_on and time.ticks_diff(now, last_beep_time) > 2000:
-                buzzer.duty_u16(30000)
-                buzzer_on = True
-                last_beep_time = now
+                if not buzzer_on and time.ticks_diff(now, last_beep_time) > 2000:
+                    buzzer.duty_u16(30000)
+                    buzzer_on = True
+                    last_beep_time = now
             
-            if buzzer_on and time.ticks_diff(now, last_beep_time) > 500:
-                buzzer.duty_u16(0)
-                buzzer_on = False
-
-        # 2. 주의 (Class 2): 보라색 깜빡임
-        elif current_state == 2:
-            if time.ticks_diff(now, last_blink_time) > 500:
-                neopixel_on = not neopixel_on
-                set_neopixel(COLOR_PURPLE if neopixel_on else COLOR_OFF)
-                last_blink_time = now
-        
-        # 3. 안전 (Class 3) 또는 0. IDLE (Class 0):
-        #    (상태 변경 시 이미 네오픽셀/부저가 설정되었으므로
-        #     루프에서 추가로 할 작업 없음)
+                if buzzer_on and time.ticks_diff(now, last_beep_time) > 500:
+                    buzzer.duty_u16(0)
+                    buzzer_on = False
 
-    except Exception as e:
-        log_message(f"ERROR: {str(e)}")
-        display_text(OLED_TEXTS["error"]) # (추가) OLED에 오류 메시지
-        for _ in range(5):
-            set_neopixel(COLOR_ERROR); time.sleep_ms(50)
-            set_neopixel(COLOR_OFF); time.sleep_ms(50)
+            # 2. 주의 (Class 2): 보라색 깜빡임
+            elif current_state == 2:
+                if time.ticks_diff(now, last_blink_time) > 500:
+                    neopixel_on = not neopixel_on
+                    set_neopixel(COLOR_PURPLE if neopixel_on else COLOR_OFF)
+                    last_blink_time = now
+        
+            # 3. 안전 (Class 3) 또는 0. IDLE (Class 0):
+            #    (상태 변경 시 이미 네오픽셀/부저가 설정되었으므로
+            #     루프에서 추가로 할 작업 없음)
+
+        except Exception as e:
+            log_message(f"ERROR: {str(e)}", flush=True)
+            display_text(OLED_TEXTS["error"], force=True) # (추가) OLED에 오류 메시지
+            for _ in range(5):
+                set_neopixel(COLOR_ERROR); time.sleep_ms(50)
+                set_neopixel(COLOR_OFF); time.sleep_ms(50)
+finally:
+    log.flush()
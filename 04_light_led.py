@@ -6,8 +6,9 @@ light = BH1750(0x23, I2C(0, sda=Pin(4), scl=Pin(5)))
 led = Pin('LED', Pin.OUT)
 
 while True:
-  print(light.measurement)      # 현재 조도센서 밝기(lx) 출력
-  if light.measurement >= 500:  # 밝기 값이 500 이상이면
+  lux = light.measurement       # 한 번만 측정해서 출력과 비교에 같이 사용
+  print(lux)                    # 현재 조도센서 밝기(lx) 출력
+  if lux >= 500:                # 밝기 값이 500 이상이면
     led.off()                   # LED 끄기
   else:                         # 아니라면
     led.on()                    # LED LED 켜기
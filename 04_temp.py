@@ -14,7 +14,6 @@ except Exception as e:
 
 # ---- 반복 읽기 ----
 while True:
-    t = sensor.temperature          # 섭씨 온도
-    h = sensor.relative_humidity    # 상대습도 %
+    t, h = sensor.measure()         # 한 번의 측정으로 섭씨 온도, 상대습도 % 를 함께 읽기
     print("온도: {:.2f} °C  습도: {:.2f} %".format(t, h))
     time.sleep(0.5)
\ No newline at end of file
@@ -14,8 +14,7 @@ buzzer.duty_u16(0) # 👈 **중요: 처음엔 소리를 끈 상태로 시작**
 # --- 2. 메인 루프 (무한 반복) ---
 while True:
     # 1. 센서 값 읽기
-    temperature_c = sensor.temperature
-    humidity = sensor.relative_humidity
+    temperature_c, humidity = sensor.measure()  # 온도와 습도를 한 번에 읽기
 
     # 터미널에 현재 상태 출력
     print(f"현재 상태: 온도 {temperature_c:.1f} °C / 습도 {humidity:.1f} %")
@@ -1,20 +1,87 @@
+// 시트 열: 측정 시각, 온도, 습도, 장치
+const SHEET_NAME = '시트1';
+const LOCK_WAIT_MS = 10000;  // 다른 피코의 기록이 끝나기를 기다리는 최대 시간
+
 function doPost(e) {
-  const sheet = SpreadsheetApp.getActiveSpreadsheet().getSheetByName('시트1');
+  let batch = null;
   try {
-    const data = JSON.parse(e.postData.contents);
+    const payload = parsePayload(JSON.parse(e.postData.contents));
+    batch = payload.batch;
 
-    sheet.appendRow([
-      new Date(),
-      data.temperature,
-      data.humidity,
-      data.device
-    ]);
+    // (추가) 여러 피코가 동시에 보내도 같은 행에 덮어쓰지 않도록 한 번에 하나씩 기록
+    const lock = LockService.getScriptLock();
+    lock.waitLock(LOCK_WAIT_MS);
+    let result;
+    try {
+      const sheet = SpreadsheetApp.getActiveSpreadsheet().getSheetByName(SHEET_NAME);
+      result = writeRecords(sheet, PropertiesService.getScriptProperties(), payload, new Date());
+      SpreadsheetApp.flush();  // 잠금을 풀기 전에 기록을 끝냄 (다음 요청의 getLastRow 가 정확하도록)
+    } finally {
+      lock.releaseLock();
+    }
 
-    return ContentService.createTextOutput("OK")
-        .setMimeType(ContentService.MimeType.TEXT);
+    // (추가) 묶음 확인(ack): 피코는 ok 와 batch 가 맞을 때만 보관한 측정값을 지움
+    return reply({ ok: true, batch: batch, written: result.written, skipped: result.skipped });
 
   } catch (error) {
-    return ContentService.createTextOutput("ERROR: " + error)
-        .setMimeType(ContentService.MimeType.TEXT);
+    return reply({ ok: false, batch: batch, error: String(error) });
   }
 }
+
+// 받은 JSON 을 { device, batch, records } 로 맞춤
+//   { "device": "...", "batch": 7, "records": [{ "timestamp": 초, "temperature": .., "humidity": .. }, ...] }
+//   예전 형식인 객체 배열이나 객체 하나도 받음 (장치 이름은 각 객체의 device)
+function parsePayload(data) {
+  if (Array.isArray(data)) {
+    return { device: null, batch: null, records: data };
+  }
+  if (data && Array.isArray(data.records)) {
+    return { device: data.device || null, batch: data.batch === undefined ? null : data.batch, records: data.records };
+  }
+  return { device: null, batch: null, records: [data] };
+}
+
+// 행을 모두 만든 뒤 setValues 한 번으로 기록 (appendRow 를 여러 번 부르는 것보다 훨씬 빠름)
+// timestamp(초)가 있으면 피코가 측정한 시각, 없거나 0 이면 받은 시각을 씀
+// 장치마다 마지막으로 기록한 timestamp 를 저장해 두고, 그보다 이르거나 같은 측정값은 건너뜀
+// (확인 응답을 못 받은 피코가 같은 묶음을 다시 보내도 두 번 기록되지 않음)
+function writeRecords(sheet, properties, payload, now) {
+  const lastWritten = {};
+  const rows = [];
+  let skipped = 0;
+  payload.records.forEach(function (record) {
+    const device = record.device || payload.device || '';
+    const key = 'last:' + device;
+    if (!(key in lastWritten)) {
+      lastWritten[key] = Number(properties.getProperty(key)) || 0;
+    }
+    const timestamp = Number(record.timestamp) || 0;
+    if (timestamp && timestamp <= lastWritten[key]) {
+      skipped += 1;
+      return;
+    }
+    if (timestamp) {
+      lastWritten[key] = timestamp;
+    }
+    rows.push([
+      timestamp ? new Date(timestamp * 1000) : now,
+      record.temperature,
+      record.humidity,
+      device
+    ]);
+  });
+
+  if (rows.length > 0) {
+    sheet.getRange(sheet.getLastRow() + 1, 1, rows.length, rows[0].length).setValues(rows);
+    properties.setProperties(Object.keys(lastWritten).reduce(function (out, key) {
+      out[key] = String(lastWritten[key]);
+      return out;
+    }, {}));
+  }
+  return { written: rows.length, skipped: skipped };
+}
+
+function reply(result) {
+  return ContentService.createTextOutput(JSON.stringify(result))
+      .setMimeType(ContentService.MimeType.JSON);
+}
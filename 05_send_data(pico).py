@@ -1,8 +1,10 @@
-from machine import Pin, I2C
+from machine import Pin, I2C, unique_id
+import binascii
 import time
 import network
-import urequests
+from httpclient import HttpClient  # (수정) urequests 대신: 연결을 유지해서 업로드마다 TLS 연결을 새로 맺지 않음
 from ahtx0 import AHT20   # AHT20 sensor driver
+from uploader import Uploader  # (추가) 측정값을 모아서 한 번에 전송 (실패하면 보관 후 재전송)
 
 # --------------------------
 # WiFi 정보
@@ -14,6 +16,21 @@ WIFI_PASS = "#############"    # 네트워크 비밀번호
 # Google Apps Script Webhook URL
 # --------------------------
 WEBHOOK_URL = "##############"  # 구글 웹훅 URL
+# (수정) 피코 여러 대가 같은 시트에 보낼 수 있도록 보드 고유 번호를 붙임 (예: PicoW_AHT20-e6614c31)
+DEVICE_NAME = "PicoW_AHT20-" + binascii.hexlify(unique_id()).decode()[-8:]
+
+# --------------------------
+# (추가) 전송 설정
+# --------------------------
+SAMPLE_INTERVAL_MS = 5000   # 측정 주기 (5초)
+BATCH_SIZE = 12             # 이만큼 모이면 한 번에 전송 (5초 x 12 = 1분)
+BATCH_MS = 60000            # 덜 모였어도 가장 오래된 값이 이만큼 기다렸으면 전송
+QUEUE_SIZE = 60             # RAM 에 둘 최대 개수, 넘치면 오래된 것부터 플래시에 보관
+SPOOL_PREFIX = "upload_spool"  # 플래시 보관 파일 (upload_spool.0, upload_spool.1 ...)
+SPOOL_RECORDS = 256         # 보관 파일 하나의 레코드 수
+SPOOL_SEGMENTS = 4          # 보관 파일 수 (256 x 4 x 5초 = 약 85분 분량)
+RETRY_MS = 5000             # 전송 실패 후 첫 재시도까지 기다릴 시간, 실패할 때마다 두 배
+MAX_RETRY_MS = 300000       # 재시도 간격 최대값 (5분)
 
 # --------------------------
 # WiFi 연결 함수
@@ -38,6 +55,24 @@ def connect_wifi():
 
 connect_wifi()
 
+# --------------------------
+# (추가) 시계 맞추기 (묶어서 보내도 측정 시각이 그대로 기록되도록)
+# --------------------------
+# 펌웨어에 따라 time.time() 의 기준이 2000년일 수 있어 1970년 기준으로 바꿔 보냄
+EPOCH_OFFSET = 946684800 if time.gmtime(0)[0] == 2000 else 0
+clock_ok = False
+
+def sync_clock():
+    try:
+        import ntptime
+        ntptime.settime()
+        return True
+    except Exception as e:
+        print("시간 맞추기 실패:", e)
+        return False
+
+clock_ok = sync_clock()
+
 # --------------------------
 # 센서 설정 (AHT20)
 # --------------------------
@@ -50,44 +85,93 @@ except Exception as e:
     raise SystemExit
 
 # --------------------------
-# Google Sheet로 데이터 전송
+# (수정) Google Sheet로 데이터 묶음 전송
 # --------------------------
-def send_to_google(temp, hum):
-    data = {
-        "temperature": round(temp, 2),
-        "humidity": round(hum, 2),
-        "device": "PicoW_AHT20"
-    }
-
+# batch: [(timestamp, 온도, 습도), ...] -> JSON 한 번에 POST
+#   {"device": 장치 이름, "batch": 묶음 번호, "records": [{"timestamp", "temperature", "humidity"}, ...]}
+# 시트가 {"ok": true, "batch": 같은 번호} 로 확인해 주면 True,
+# 아니면 False (Uploader 가 보관해 두었다가 다시 보냄, 이미 기록된 값은 시트가 건너뜀)
+batch_number = 0
+# (추가) 구글 서버와의 연결(DNS 결과, TCP, TLS)을 업로드 사이에 계속 유지
+# Apps Script 는 302 로 다른 주소(script.googleusercontent.com)에 답을 두므로 연결이 두 개 유지됨
+client = HttpClient(timeout=10)
+
+def send_to_google(batch):
+    global clock_ok, batch_number
+    if not network.WLAN(network.STA_IF).isconnected():
+        client.close()  # WiFi 가 끊겼던 연결은 쓸 수 없음
+        if not connect_wifi():
+            return False
+    if not clock_ok:
+        clock_ok = sync_clock()
+
+    batch_number += 1
+    records = [
+        {
+            "timestamp": timestamp,  # 0 이면 시계를 못 맞춘 것 (받는 쪽 시각 사용)
+            "temperature": round(temp, 2),
+            "humidity": round(hum, 2)
+        }
+        for timestamp, temp, hum in batch
+    ]
+
+    res = client.post_json(
+        WEBHOOK_URL,
+        {"device": DEVICE_NAME, "batch": batch_number, "records": records}
+    )
+    # (추가) 단계별 소요 시간 (ms): 연결을 재사용하면 dns/connect/tls 가 0
+    timing = res.timings
+    print("업로드 {} ms (dns {}, 연결 {}, tls {}, 보내기 {}, 대기 {}, 받기 {}, 리디렉션 {}, 재사용 {})".format(
+        timing["total"], timing["dns"], timing["connect"], timing["tls"], timing["send"],
+        timing["wait"], timing["receive"], timing["redirects"], timing["reused"]))
+    if not 200 <= res.status < 300:
+        print("전송 실패 코드:", res.status)
+        return False
+    # (수정) 상태 코드만으로는 부족함: Apps Script 는 오류가 나도 200 으로 답함
     try:
-        res = urequests.post(
-            WEBHOOK_URL,
-            json=data,
-            headers={"Content-Type": "application/json"}
-        )
-
-        # Google sometimes returns HTML even when successful.
-        # Treat ANY 200-range status as success.
-        if 200 <= res.status_code < 300:
-            print("전송 성공")
-        else:
-            print("전송 실패 코드:", res.status_code)
-
-        # Avoid printing HTML body
-        res.close()
-
-    except Exception as e:
-        print("전송 오류:", e)
+        ack = res.json()
+    except ValueError:
+        print("전송 실패: 확인 응답이 JSON 이 아님")  # Avoid printing HTML body
+        return False
+    if ack.get("ok") and ack.get("batch") == batch_number:
+        print("전송 성공: {}개 기록, {}개 중복".format(ack.get("written"), ack.get("skipped")))
+        return True
+    print("전송 실패:", ack.get("error"))
+    return False
+
+uploader = Uploader(
+    send_to_google, "<ff",
+    batch_size=BATCH_SIZE, batch_ms=BATCH_MS, capacity=QUEUE_SIZE,
+    spool_prefix=SPOOL_PREFIX, spool_records=SPOOL_RECORDS, spool_segments=SPOOL_SEGMENTS,
+    backoff_ms=RETRY_MS, max_backoff_ms=MAX_RETRY_MS,
+)
+if uploader.spool_backlog():
+    print("보관된 측정값:", uploader.spool_backlog(), "개 (연결되면 먼저 전송)")
 
 # --------------------------
 # 메인 루프
 # --------------------------
-while True:
-    t = sensor.temperature
-    h = sensor.relative_humidity
-
-    print("온도: {:.2f} °C  습도: {:.2f} %".format(t, h))
-
-    send_to_google(t, h)
-
-    time.sleep(5)   # 5초마다 업로드
+next_ms = time.ticks_ms()
+# (추가) 끝날 때(Ctrl+C, 오류) RAM 에 모아 둔 측정값을 플래시 보관함에 씀 (다음 부팅 때 전송)
+try:
+    while True:
+        t, h = sensor.measure()  # 온도와 습도를 한 번의 측정으로 읽기
+
+        print("온도: {:.2f} °C  습도: {:.2f} %".format(t, h))
+
+        timestamp = time.time() + EPOCH_OFFSET if clock_ok else 0
+        uploader.add(timestamp, t, h)
+        uploader.poll()
+        if uploader.last_error:  # 마지막 전송이 실패했으면 밀린 개수 표시
+            print("전송 대기: {}개 (실패 {}회, 마지막 오류: {})".format(
+                uploader.backlog(), uploader.failures, uploader.last_error))
+
+        # 전송에 걸린 시간을 빼고 다음 측정까지 기다림 (5초 주기 유지)
+        next_ms = time.ticks_add(next_ms, SAMPLE_INTERVAL_MS)
+        delay_ms = time.ticks_diff(next_ms, time.ticks_ms())
+        if delay_ms < 0:
+            next_ms = time.ticks_ms()
+            delay_ms = 0
+        time.sleep_ms(delay_ms)
+finally:
+    uploader.flush()
@@ -2,9 +2,24 @@ import network
 import socket
 import json
 import time
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio  # 예전 MicroPython 펌웨어
 from machine import Pin, I2C, PWM, ADC
 import neopixel
 import ssd1306  # (추가) OLED
+from textdisplay import TextDisplay  # (추가) 바뀐 줄만 다시 그리는 OLED 텍스트 화면
+import httpreq  # (추가) 나눠서 도착하는 HTTP 요청을 해석하는 파서
+import httpresp  # (추가) 미리 만든 헤더와 재사용 버퍼로 HTTP 응답을 보내는 라이브러리
+import wsproto  # (추가) 웹소켓(WebSocket) 라이브러리
+from history import RingHistory  # (추가) 측정 기록 원형 버퍼
+from rollup import Rollup  # (추가) 긴 기간 기록을 구간별 최소/최대/평균으로 요약
+from binlog import BinLog  # (추가) 플래시에 고정 크기 이진 레코드로 저장 (재부팅 후 복원)
+import sensorpack  # (추가) /sensors 이진 형식 (고정 크기 struct 레코드)
+import metrics  # (추가) 성능 지표 (고정 크기 히스토그램, 카운터), /metrics 로 제공
+import adccap  # (추가) 마이크를 고정 속도로 모으는 ADC 수집 (DMA)
+import dsp  # (추가) 마이크 버퍼 분석 (RMS, 고정소수점 FFT 대역 에너지)
 from ahtx0 import AHT20
 from bh1750 import BH1750 # (추가) 조도
 
@@ -12,6 +27,55 @@ from bh1750 import BH1750 # (추가) 조도
 WIFI_SSID = "#############"  # 학교/교육장 WiFi 이름
 WIFI_PASSWORD = "#############"  # WiFi 비밀번호
 
+# ---- 서버 모드 설정 ----
+SERVER_MODE = "async"  # "async": 여러 연결 동시 처리, "loop": 기존처럼 한 번에 한 명씩 처리
+MAX_CONNECTIONS = 4    # (async 모드) 동시에 처리할 최대 연결 수, 초과 시 503 응답
+CLIENT_TIMEOUT = 5     # 요청을 기다리는 최대 시간 (초)
+RECV_SIZE = 512        # 소켓에서 한 번에 읽는 최대 바이트 수
+RESPONSE_BUFFER_SIZE = 1024  # 응답 작성 버퍼 크기 (헤더+본문이 이보다 크면 나눠서 보냄)
+KEEP_ALIVE_TIMEOUT = 5       # (async 모드) 연결 유지 중 다음 요청을 기다리는 최대 시간 (초)
+KEEP_ALIVE_MAX_REQUESTS = 100  # (async 모드) 연결 하나로 처리할 최대 요청 수, 넘으면 연결을 닫음
+SSE_HEARTBEAT_MS = 15000  # (async 모드) /events 에 새 측정값이 없을 때 연결 확인용 주석을 보내는 주기 (ms)
+SSE_RETRY_MS = 3000       # /events 연결이 끊겼을 때 브라우저가 다시 연결하기까지 기다릴 시간 (ms)
+WS_MAX_MESSAGE = 1024     # /ws 로 받을 수 있는 메시지 최대 크기 (바이트)
+METRICS_ENABLED = True    # (추가) 구간별 시간 측정과 GET /metrics (False 면 측정 코드가 아무 일도 하지 않음)
+
+# ---- 센서 샘플링 설정 ----
+SAMPLE_INTERVAL_MS = 1000   # (async 모드) 백그라운드 샘플링 주기 (ms)
+MAX_SNAPSHOT_AGE_MS = 3000  # 스냅샷이 이보다 오래되면 /sensors 요청 때 직접 측정 (ms)
+MIC_SAMPLE_RATE = 16000     # (추가) 마이크 샘플링 속도 (Hz), ADC 가 이 간격으로 직접 변환
+MIC_SAMPLES = 256           # (추가) 한 번에 모을 마이크 샘플 수 (16 kHz 에서 16 ms)
+MIC_BANDS = dsp.DEFAULT_BANDS  # (추가) 대역 에너지를 나눌 주파수 구간 (하한 Hz, 상한 Hz), 웅웅거림/목소리/배음/날카로운 소리
+MIC_ALARM_MODE = "band"     # (추가) "band": 대역 에너지로 마이크 알람, "p2p": 기존처럼 최댓값-최솟값으로 알람
+MIC_ALARM_BANDS = (1, 2, 3) # (추가) 알람에 쓰는 MIC_BANDS 번호 (0번 300 Hz 아래 웅웅거림/바람은 무시)
+
+# ---- (추가) 측정 기록 설정 ----
+HISTORY_SIZE = 600           # 저장할 최근 측정 수 (1초 주기면 10분), 메모리는 시작할 때 한 번에 잡음
+HISTORY_DEFAULT_LIMIT = 120  # /history 요청에 limit 이 없을 때 보낼 최대 개수
+# (항목 이름, array 타입, 배율): 정수 타입은 값 x 배율을 정수로 저장 (예: 온도 23.4 -> 234)
+HISTORY_FIELDS = (
+    ("temperature", "h", 10),     # 0.1 °C 단위
+    ("humidity", "h", 10),        # 0.1 % 단위
+    ("light", "f", 10),           # lx (출력은 소수 첫째 자리)
+    ("mic", "H", 1),              # ADC 값 0~65534 (65535 는 "없음" 표시라 65534 로 저장)
+    ("water_distance", "h", 100), # 0.01 cm 단위
+    ("alarm", "b", 1),            # 0/1
+)
+# (추가) 요약 단계: (구간 길이 초, 구간 수). 1분 x 180 = 3시간, 10분 x 144 = 24시간, 1시간 x 168 = 7일
+ROLLUP_TIERS = ((60, 180), (600, 144), (3600, 168))
+HISTORY_MAX_POINTS = 1000  # /history?points= 로 요청할 수 있는 최대 점 개수
+
+# ---- (추가) 플래시 저장 설정 (재부팅해도 측정 기록과 임계값/센서 타입 유지) ----
+# 측정 레코드: 순번, 시각(초), HISTORY_FIELDS 값 (기록과 같은 배율의 정수)
+HISTORY_LOG_PREFIX = "history_log"      # history_log.0, history_log.1 ... 파일
+HISTORY_LOG_FORMAT = "<II" + "".join(typecode for _, typecode, _ in HISTORY_FIELDS)
+HISTORY_LOG_SEGMENT_RECORDS = 900       # 파일 하나에 담을 레코드 수 (1초 주기면 15분)
+HISTORY_LOG_SEGMENTS = 4                # 남겨 둘 파일 수 (1초 주기면 최근 1시간)
+HISTORY_LOG_BUFFER = 30                 # 이만큼 모아서 한 번에 플래시에 씀
+SETTINGS_LOG_PREFIX = "settings_log"
+SETTINGS_LOG_FORMAT = "<fffffB"         # 임계값 5개 + 센서 타입 번호
+SENSOR_TYPES = ("mic", "water")
+
 # --- 2. 학습된 핀 번호 설정 ---
 I2C_SDA_PIN = 4     # I2C SDA (GP4)
 I2C_SCL_PIN = 5     # I2C SCL (GP5)
@@ -23,6 +87,7 @@ ADC_SENSOR_PIN = 28 # 마이크/수위 센서 (GP28)
 OLED_WIDTH = 128
 OLED_HEIGHT = 64
 I2C_ADDR = 0x3C
+OLED_MAX_FPS = 5  # OLED 화면 갱신 최대 횟수 (초당)
 
 # --- 4. (수정) 알람 임계값 (전역 변수) ---
 # 기본값을 100만으로 설정하여 "비활성화" 상태로 시작
@@ -35,6 +100,9 @@ alarm_thresholds = {
     "water": HIGH_THRESHOLD
 }
 
+# 서버 IP 주소 (WiFi 연결 후 설정, "/" 페이지에 표시)
+server_ip = None
+
 # 센서 타입 선택 (기본값: "mic" - 마이크)
 sensor_type = "mic"  # "mic" 또는 "water"
 
@@ -56,6 +124,10 @@ np = neopixel.NeoPixel(Pin(NEOPIXEL_PIN), 1)
 
 # ADC 센서 (마이크/수위) 초기화
 adc_sensor = ADC(Pin(ADC_SENSOR_PIN))
+# (추가) 마이크 샘플은 미리 잡은 버퍼에 고정 속도로 모음 (피코: ADC FIFO + DMA)
+mic_capture = adccap.Capture(adc_sensor, ADC_SENSOR_PIN, MIC_SAMPLES, MIC_SAMPLE_RATE)
+# (추가) 모은 버퍼의 RMS/대역 에너지 계산기 (FFT 표와 작업 버퍼는 여기서 한 번만 잡음)
+mic_analyzer = dsp.Analyzer(MIC_SAMPLES, mic_capture.rate, MIC_BANDS)
 
 # OLED 초기화
 try:
@@ -74,6 +146,7 @@ try:
     print("AHT20 (온습도) 초기화 성공")
     if oled: oled.text("AHT20 OK", 0, 16); oled.show()
     bh_sensor = BH1750(0x23, i2c)
+    bh_sensor.start_continuous()  # 한 번만 설정하고, 이후에는 대기 없이 최신 값만 읽음
     print("BH1750 (조도) 초기화 성공")
     if oled: oled.text("BH1750 OK", 0, 32); oled.show()
 except Exception as e:
@@ -83,19 +156,38 @@ except Exception as e:
     np.write()
     raise SystemExit
 
-# --- 7. (추가) OLED 텍스트 출력 함수 ---
-def display_text(lines):
-    """OLED에 텍스트 목록(최대 4줄)을 출력합니다."""
-    if oled is None: return
-    oled.fill(0)
-    y_pos = 0
-    for i, line_text in enumerate(lines):
-        if y_pos < OLED_HEIGHT:
-            oled.text(line_text, 0, y_pos)
-            y_pos += 16 
-        else:
-            break
-    oled.show()
+# --- 7. (수정) OLED 텍스트 출력 ---
+# 4줄(16픽셀 간격) 화면에서 바뀐 줄만 다시 그리고, 초당 OLED_MAX_FPS 번까지만 갱신합니다.
+# OLED가 없으면(None) display_text()는 아무 동작도 하지 않습니다.
+# 바로 뒤에 sleep 하는 메시지는 force=True 로 즉시 화면에 보냅니다.
+screen = TextDisplay(oled, lines=OLED_HEIGHT // 16, line_height=16, max_fps=OLED_MAX_FPS)
+display_text = screen.show
+
+# --- (추가) 성능 지표 ---
+# "연결 안됨"의 원인이 WiFi 인지, 느린 I2C 읽기인지, GC 멈춤인지 알 수 있도록
+# 주요 구간의 시간(ticks_us)을 고정 크기 히스토그램에, 횟수를 카운터에 모아 GET /metrics 로 보냅니다.
+# 히스토그램 하나는 구간 13개짜리 정수 목록이라, 측정할 때 메모리를 새로 잡지 않습니다.
+registry = metrics.Registry(METRICS_ENABLED)
+SENSOR_READ_METRIC = "pico_sensor_read_microseconds"
+aht_read_us = registry.histogram(SENSOR_READ_METRIC, "Sensor read time", 'sensor="aht20"')
+bh_read_us = registry.histogram(SENSOR_READ_METRIC, "Sensor read time", 'sensor="bh1750"')
+adc_read_us = registry.histogram(SENSOR_READ_METRIC, "Sensor read time", 'sensor="adc"')
+parse_us = registry.histogram("pico_request_parse_microseconds", "HTTP request parse time")
+handle_us = registry.histogram("pico_request_handle_microseconds", "Route handler time")
+send_us = registry.histogram("pico_response_send_microseconds", "HTTP response write time")
+json_encode_us = registry.histogram("pico_json_encode_microseconds", "Snapshot JSON encode time")
+oled_refresh_us = registry.histogram("pico_oled_refresh_microseconds", "OLED refresh (show) time")
+mic_analysis_us = registry.histogram("pico_mic_analysis_microseconds", "Mic RMS and band energy time")
+METRIC_PATHS = ("/", "/sensors", "/history", "/sensor_type", "/alarm_threshold", "/events", "/ws", "/metrics", "other")
+requests_total = registry.counter("pico_requests_total", "HTTP requests by path", "path", METRIC_PATHS)
+errors_total = registry.counter(
+    "pico_errors_total", "Errors by kind", "kind", ("wifi", "sensor", "bad_request", "timeout", "busy", "server")
+)
+alarm_transitions = registry.counter("pico_alarm_transitions_total", "Alarm state changes", "to", ("on", "off"))
+heap = metrics.HeapMonitor(registry)
+registry.gauge("pico_wifi_connected", "1 while the WiFi station is connected", lambda: network.WLAN(network.STA_IF).isconnected())
+if oled:
+    oled.show = oled_refresh_us.wrap(oled.show)  # TextDisplay 가 부르는 show() 를 시간 측정 버전으로 교체
 
 # --- (추가) 임계값 포맷팅 함수 ---
 def format_threshold(value):
@@ -121,26 +213,26 @@ def connect_wifi():
             time.sleep(0.1)
             timeout += 1
             print(".", end="")
-            if oled and timeout % 5 == 0:
-                oled.text(".", (timeout % 16) * 8, 48) 
-                oled.show()
+            if timeout % 5 == 0:
+                screen.set_line(3, "." * ((timeout // 5) % 17))
 
         if wlan.isconnected():
             ip_address = wlan.ifconfig()[0]
             print(f"\nWiFi 연결 성공!")
             print(f"IP 주소: {ip_address}")
-            display_text(["WiFi OK!", "IP Address:", f"{ip_address}"])
+            display_text(["WiFi OK!", "IP Address:", f"{ip_address}"], force=True)
             time.sleep(2) 
             return ip_address
         else:
             print("\nWiFi 연결 실패!")
-            display_text(["WiFi FAILED!", "Check SSID/PW", "Retrying..."])
+            errors_total.inc("wifi")
+            display_text(["WiFi FAILED!", "Check SSID/PW", "Retrying..."], force=True)
             time.sleep(2)
             return None
     else:
         ip_address = wlan.ifconfig()[0]
         print(f"이미 WiFi 연결됨: {ip_address}")
-        display_text(["WiFi Already OK", "IP Address:", f"{ip_address}"])
+        display_text(["WiFi Already OK", "IP Address:", f"{ip_address}"], force=True)
         time.sleep(2)
         return ip_address
 
@@ -159,20 +251,44 @@ def buzzer_on():
 def buzzer_off():
     buzzer.duty_u16(0)
 
-# --- 10. (추가) 마이크 센서 읽기 함수 ---
+# --- 10. (수정) 마이크 센서 읽기 함수 ---
+# 파이썬 반복문으로 read_u16() 을 100번 부르면 샘플 간격이 들쭉날쭉하고 CPU 를 계속 씁니다.
+# ADC 가 MIC_SAMPLE_RATE 간격으로 변환한 MIC_SAMPLES 개를 DMA 로 버퍼에 모은 뒤 한 번에 계산합니다.
 def read_mic_sensor():
-    """마이크 센서의 Peak-to-Peak 값을 읽습니다."""
-    sample_size = 100
-    max_val = 0
-    min_val = 65535
-    for _ in range(sample_size):
-        val = adc_sensor.read_u16()
-        if val > max_val:
-            max_val = val
-        if val < min_val:
-            min_val = val
-    peak_to_peak = max_val - min_val
-    return peak_to_peak
+    """마이크 센서의 Peak-to-Peak 값을 읽습니다. (read_u16 과 같은 0~65535 단위)"""
+    mic_capture.capture()
+    return mic_capture.stats()[0]
+
+async def read_mic_sensor_async():
+    """(추가) read_mic_sensor() 의 비동기 버전: DMA 가 모으는 동안 다른 작업이 실행됩니다."""
+    await mic_capture.capture_async()
+    return mic_capture.stats()[0]
+
+# (추가) 최댓값-최솟값은 튀는 샘플 하나에 크게 흔들리고 주파수를 알 수 없으므로,
+# 방금 모은 버퍼에서 RMS(직류 제거)와 MIC_BANDS 대역별 RMS 를 계산합니다. (단위는 read_u16 과 같음)
+SINE_PEAK_TO_PEAK = 2 * 2 ** 0.5  # 사인파의 최댓값-최솟값 / RMS
+
+def analyze_mic():
+    """(추가) 마지막으로 모은 마이크 버퍼의 (RMS, 대역별 RMS 목록) 을 반환합니다. (목록은 다음 호출 때 다시 씀)"""
+    start = time.ticks_us()
+    rms = mic_analyzer.rms(mic_capture.buf)
+    bands = mic_analyzer.band_levels(mic_capture.buf)
+    mic_analysis_us.since(start)
+    return rms, bands
+
+def mic_alarm_level(mic_value, mic_bands=None):
+    """
+    (추가) 마이크 알람에 비교할 값을 반환합니다.
+    "band" 모드: MIC_ALARM_BANDS 중 가장 큰 대역 RMS 를 같은 RMS 의 사인파 최댓값-최솟값으로 바꾼 값
+    (기존 마이크 임계값과 대시보드 슬라이더 범위를 그대로 쓸 수 있음)
+    """
+    if MIC_ALARM_MODE != "band" or mic_bands is None:
+        return mic_value
+    level = 0.0
+    for index in MIC_ALARM_BANDS:
+        if mic_bands[index] > level:
+            level = mic_bands[index]
+    return level * SINE_PEAK_TO_PEAK
 
 # --- 11. (추가) 수위 센서 읽기 함수 ---
 def read_water_sensor():
@@ -188,9 +304,11 @@ def read_water_sensor():
     return distance_cm, adc_value
 
 # --- 12. (수정) 모든 임계값 확인하는 알람 함수 ---
-def check_alarms(temp, hum, light, mic_value=None, water_value=None):
-    """모든 센서의 임계값을 확인하고 알람을 울립니다."""
-    global alarm_thresholds, sensor_type # 전역 변수 사용
+alarm_state = False  # (추가) 직전 알람 상태 (켜짐/꺼짐 전환 횟수를 세기 위해)
+
+def check_alarms(temp, hum, light, mic_value=None, water_value=None, mic_bands=None):
+    """모든 센서의 임계값을 확인하고 알람을 울립니다. (mic_bands: 마이크 대역별 RMS, 있으면 대역 에너지로 판단)"""
+    global alarm_thresholds, sensor_type, alarm_state # 전역 변수 사용
     
     # 기존 센서들 확인 (임계값이 비활성화 상태가 아닐 때만 확인)
     temp_alarm = False
@@ -210,14 +328,19 @@ def check_alarms(temp, hum, light, mic_value=None, water_value=None):
     if sensor_type == "mic" and mic_value is not None:
         # 마이크 임계값이 비활성화 상태가 아닐 때만 확인
         if alarm_thresholds["mic"] < HIGH_THRESHOLD:
-            adc_alarm = mic_value > alarm_thresholds["mic"]
+            adc_alarm = mic_alarm_level(mic_value, mic_bands) > alarm_thresholds["mic"]
     elif sensor_type == "water" and water_value is not None:
         # 수위 센서는 수위(거리 값)가 임계값을 넘었을 때를 "위험"으로 판단
         # 임계값이 비활성화 상태가 아닐 때만 확인
         if alarm_thresholds["water"] < HIGH_THRESHOLD:
             adc_alarm = water_value > alarm_thresholds["water"]
     
-    if temp_alarm or hum_alarm or light_alarm or adc_alarm:
+    active = temp_alarm or hum_alarm or light_alarm or adc_alarm
+    if active != alarm_state:
+        alarm_state = active
+        alarm_transitions.inc("on" if active else "off")
+
+    if active:
         buzzer_on()
         led_red()
         return True
@@ -228,70 +351,430 @@ def check_alarms(temp, hum, light, mic_value=None, water_value=None):
 
 # --- 13. (수정) 모든 센서 데이터 읽기 함수 ---
 def read_sensors():
-    global sensor_type
     try:
-        temperature = aht_sensor.temperature
-        humidity = aht_sensor.relative_humidity
+        start = time.ticks_us()
+        temperature, humidity = aht_sensor.measure()  # 한 번의 측정으로 온도/습도 읽기
+        aht_read_us.since(start)
+        start = time.ticks_us()
         lux = bh_sensor.measurement
+        bh_read_us.since(start)
+        return build_sensor_data(temperature, humidity, lux)
+    except Exception as e:
+        print(f"센서 읽기 오류: {e}")
+        errors_total.inc("sensor")
+        buzzer_off()
+        return { "error": str(e) }
 
-        # 선택된 센서 타입에 따라 읽기
-        mic_value = None
-        water_value = None
-        water_adc = None
-        
-        if sensor_type == "mic":
-            mic_value = read_mic_sensor()
-        elif sensor_type == "water":
-            water_value, water_adc = read_water_sensor()
-
-        # 알람 확인
-        alarm_active = check_alarms(temperature, humidity, lux, mic_value, water_value)
-
-        result = {
-            "temperature": round(temperature, 1),
-            "humidity": round(humidity, 1),
-            "light": round(lux, 1),
-            "sensor_type": sensor_type,
-            "timestamp": time.time(),
-            "alarm": alarm_active,
-        }
-        
-        # 선택된 센서 데이터 추가
-        if sensor_type == "mic":
-            result["mic"] = mic_value
-        elif sensor_type == "water":
-            result["water_distance"] = round(water_value, 2)
-            result["water_adc"] = water_adc
+async def timed_read(histogram, measure_async):
+    """(추가) await measure_async() 에 걸린 시간을 histogram 에 기록하고 결과를 반환합니다."""
+    start = time.ticks_us()
+    result = await measure_async()
+    histogram.since(start)
+    return result
 
-        return result
+# (추가) read_sensors() 의 비동기 버전: 두 센서의 변환을 동시에 시작하고,
+# 변환을 기다리는 동안 웹 서버 등 다른 작업이 계속 실행됩니다.
+async def read_sensors_async():
+    try:
+        if sensor_type == "mic":
+            # (추가) 마이크도 I2C 센서의 변환을 기다리는 동안 함께 모음
+            (temperature, humidity), lux, mic_value = await asyncio.gather(
+                timed_read(aht_read_us, aht_sensor.measure_async),
+                timed_read(bh_read_us, bh_sensor.measure_async),
+                timed_read(adc_read_us, read_mic_sensor_async),
+            )
+            return build_sensor_data(temperature, humidity, lux, mic_value)
+        (temperature, humidity), lux = await asyncio.gather(
+            timed_read(aht_read_us, aht_sensor.measure_async),
+            timed_read(bh_read_us, bh_sensor.measure_async),
+        )
+        return build_sensor_data(temperature, humidity, lux)
     except Exception as e:
         print(f"센서 읽기 오류: {e}")
+        errors_total.inc("sensor")
         buzzer_off()
         return { "error": str(e) }
 
-# --- 12. HTTP 응답 생성 함수 (원본 유지) ---
-def create_response(status_code, content_type, body):
-    response = f"HTTP/1.1 {status_code}\r\n"
-    response += f"Content-Type: {content_type}\r\n"
-    response += "Access-Control-Allow-Origin: *\r\n"
-    response += "Access-Control-Allow-Methods: GET, POST, OPTIONS\r\n"
-    response += "Access-Control-Allow-Headers: Content-Type\r\n"
-    response += f"Content-Length: {len(body)}\r\n"
-    response += "Connection: close\r\n"
-    response += "\r\n"
-    response += body
-    return response
+def build_sensor_data(temperature, humidity, lux, mic_value=None):
+    """
+    I2C 센서 값에 ADC 센서 값을 더하고 알람을 확인한 뒤 결과 딕셔너리를 만듭니다.
+    mic_value: 이미 읽은 마이크 값 (없으면 여기서 읽음)
+    """
+    global sensor_type
+    # 선택된 센서 타입에 따라 읽기
+    water_value = None
+    water_adc = None
+    mic_rms = None
+    mic_bands = None
+    
+    if sensor_type == "mic":
+        if mic_value is None:
+            start = time.ticks_us()
+            mic_value = read_mic_sensor()
+            adc_read_us.since(start)
+        mic_rms, mic_bands = analyze_mic()  # (추가) 같은 버퍼에서 RMS/대역 에너지
+    elif sensor_type == "water":
+        start = time.ticks_us()
+        water_value, water_adc = read_water_sensor()
+        adc_read_us.since(start)
 
-# --- 14. 메인 서버 함수 (POST 처리 수정) ---
-def start_server():
-    global alarm_thresholds, sensor_type # 전역 변수 수정 허용
+    # 알람 확인
+    alarm_active = check_alarms(temperature, humidity, lux, mic_value, water_value, mic_bands)
+
+    result = {
+        "temperature": round(temperature, 1),
+        "humidity": round(humidity, 1),
+        "light": round(lux, 1),
+        "sensor_type": sensor_type,
+        "timestamp": time.time(),
+        "alarm": alarm_active,
+    }
     
-    ip_address = connect_wifi()
-    if not ip_address:
-        print("WiFi 연결 실패로 서버 시작 불가")
-        display_text(["WiFi FAILED!", "Server STOP."])
+    # 선택된 센서 데이터 추가
+    if sensor_type == "mic":
+        result["mic"] = mic_value
+        result["mic_rms"] = round(mic_rms)
+        result["mic_bands"] = [round(level) for level in mic_bands]
+        result["mic_level"] = round(mic_alarm_level(mic_value, mic_bands))  # 알람에 비교한 값
+    elif sensor_type == "water":
+        result["water_distance"] = round(water_value, 2)
+        result["water_adc"] = water_adc
+
+    return result
+
+# --- (추가) OLED에 센서 값 표시 함수 ---
+def display_sensor_data(sensor_data):
+    """측정 결과를 OLED에 표시합니다. (오류 결과는 표시하지 않음)"""
+    if "error" in sensor_data:
+        return
+    lines = [
+        f"T: {sensor_data['temperature']} C",
+        f"H: {sensor_data['humidity']} %",
+        f"L: {sensor_data['light']} lx"
+    ]
+    if sensor_data['sensor_type'] == "mic" and "mic" in sensor_data:
+        lines.append(f"Mic: {sensor_data['mic']}")
+    elif sensor_data['sensor_type'] == "water" and "water_distance" in sensor_data:
+        lines.append(f"W: {sensor_data['water_distance']} cm")
+    display_text(lines)
+
+# --- (추가) 측정 기록 (고정 크기 원형 버퍼) ---
+# 측정값마다 딕셔너리를 쌓지 않고, 항목별 array 에 숫자만 저장합니다.
+history = RingHistory(HISTORY_SIZE, HISTORY_FIELDS)
+print(f"측정 기록: 최근 {HISTORY_SIZE}개, {history.memory_bytes()} 바이트")
+# (추가) 긴 기간은 원본 대신 1분/10분/1시간 구간 요약으로 보관 (구간마다 항목별 최소/최대/합계/개수)
+rollup = Rollup(HISTORY_FIELDS, ROLLUP_TIERS)
+print(f"기록 요약: {ROLLUP_TIERS}, {rollup.memory_bytes()} 바이트")
+
+# --- (추가) 플래시 저장 (이진 로그) ---
+# 측정값은 HISTORY_LOG_BUFFER 개씩 모아서 쓰고, 설정은 바뀔 때마다 레코드 하나를 덧붙입니다.
+# 파일 수가 정해져 있어서 가장 오래된 파일부터 지워지므로 플래시가 가득 차지 않습니다.
+history_log = BinLog(
+    HISTORY_LOG_PREFIX, HISTORY_LOG_FORMAT,
+    HISTORY_LOG_SEGMENT_RECORDS, HISTORY_LOG_SEGMENTS, HISTORY_LOG_BUFFER,
+)
+settings_log = BinLog(SETTINGS_LOG_PREFIX, SETTINGS_LOG_FORMAT, 64, 2, 1)
+
+def save_settings():
+    """현재 임계값과 센서 타입을 플래시에 저장합니다."""
+    try:
+        settings_log.append(
+            alarm_thresholds["temperature"], alarm_thresholds["humidity"], alarm_thresholds["light"],
+            alarm_thresholds["mic"], alarm_thresholds["water"], SENSOR_TYPES.index(sensor_type),
+        )
+    except Exception as e:
+        print(f"설정 저장 오류: {e}")
+
+def restore_settings():
+    """마지막으로 저장된 임계값과 센서 타입을 불러옵니다."""
+    global sensor_type
+    saved = settings_log.last()
+    if saved is None:
         return
+    for name, value in zip(("temperature", "humidity", "light", "mic", "water"), saved):
+        # (수정) float32 로 저장돼서 30.1 이 30.100000381 로 돌아오므로 유효숫자 7자리로 되돌림
+        alarm_thresholds[name] = float("%.7g" % value)
+    sensor_type = SENSOR_TYPES[saved[5]] if saved[5] < len(SENSOR_TYPES) else sensor_type
+    print(f"저장된 설정 복원: {sensor_type}, {alarm_thresholds}")
+
+def restore_history():
+    """
+    플래시에 남은 측정값으로 기록과 요약을 다시 채우고, 순번을 이어서 씁니다.
+    시계가 아직 맞춰지지 않았으면(저장된 시각보다 이전) 요약은 채우지 않습니다.
+    """
+    global snapshot_seq
+    start = time.ticks_ms()
+    count = 0
+    clock_ok = True
+    last = history_log.last()
+    if last is not None and time.time() < last[1]:
+        clock_ok = False
+    for record in history_log.records():
+        stored = record[2:]
+        history.append_encoded(record[0], record[1], stored)
+        if clock_ok:
+            rollup.add(record[1], history.decode(stored))
+        snapshot_seq = record[0]
+        count += 1
+    print(f"측정 기록 복원: {count}개, {time.ticks_diff(time.ticks_ms(), start)} ms")
+
+def sync_clock():
+    """인터넷 시간(NTP)으로 피코 시계를 맞춥니다. (재부팅 후에도 기록 시각이 이어지도록)"""
+    try:
+        import ntptime
+        ntptime.settime()
+        return True
+    except Exception as e:
+        print(f"시간 맞추기 실패: {e}")
+        return False
+
+restore_settings()
+
+# --- (추가) 최신 측정값 스냅샷 ---
+# 스냅샷은 (순번, 측정 시각 ticks_ms, 센서 데이터, JSON 문자열) 튜플입니다.
+# 만든 뒤에는 수정하지 않고 latest_snapshot 을 통째로 바꿔 끼웁니다.
+latest_snapshot = None
+snapshot_seq = 0
+# (추가) 새 스냅샷이 공개될 때마다 /events 구독자들을 깨우는 이벤트 (async 모드에서 만듦)
+snapshot_event = None
+# (추가) async 모드에서 센서(I2C 변환, 마이크 ADC/DMA 버퍼)를 한 번에 한 작업만 쓰도록 잡는 잠금 (run_async_server 에서 만듦)
+sensor_lock = None
+
+def publish_snapshot(sensor_data):
+    """측정 결과에 순번을 붙여 새 스냅샷으로 공개합니다."""
+    global latest_snapshot, snapshot_seq
+    snapshot_seq += 1
+    sensor_data["seq"] = snapshot_seq
+    start = time.ticks_us()
+    encoded = json.dumps(sensor_data)
+    json_encode_us.since(start)
+    latest_snapshot = (snapshot_seq, time.ticks_ms(), sensor_data, encoded)
+    heap.sample()  # (추가) 측정마다 남은 힙 확인 (GC 실행 감지)
+    if "error" not in sensor_data:
+        stored = history.encode(sensor_data)
+        history.append_encoded(snapshot_seq, sensor_data["timestamp"], stored)
+        rollup.add(sensor_data["timestamp"], sensor_data)
+        try:
+            history_log.append(snapshot_seq, int(sensor_data["timestamp"]), *stored)
+        except Exception as e:
+            print(f"측정 기록 저장 오류: {e}")
+    display_sensor_data(sensor_data)
+    if snapshot_event is not None:
+        # 기다리던 구독자를 모두 깨우고, 다음 스냅샷을 위해 바로 다시 닫아 둠
+        snapshot_event.set()
+        snapshot_event.clear()
+    return latest_snapshot
+
+def sample_sensors():
+    """센서를 한 번 읽고 그 결과를 스냅샷으로 공개합니다."""
+    return publish_snapshot(read_sensors())
+
+def snapshot_stale(snapshot):
+    """스냅샷이 없거나 MAX_SNAPSHOT_AGE_MS 보다 오래되었으면 True"""
+    return snapshot is None or time.ticks_diff(time.ticks_ms(), snapshot[1]) > MAX_SNAPSHOT_AGE_MS
+
+def get_snapshot():
+    """
+    최신 스냅샷을 반환합니다.
+    loop 모드에서는 스냅샷이 없거나 오래되었으면 직접 측정합니다.
+    (수정) async 모드에서는 센서를 직접 읽지 않음: 서버가 처리 함수보다 먼저 refresh_snapshot() 을 기다림
+    """
+    snapshot = latest_snapshot
+    if sensor_lock is None and snapshot_stale(snapshot):
+        snapshot = sample_sensors()
+    return snapshot
+
+async def refresh_snapshot():
+    """
+    (추가) async 모드: 스냅샷이 없거나 오래되었으면 센서 잠금을 잡고 측정해 공개합니다.
+    샘플러가 측정 중이면 잠금을 기다렸다가 그 결과를 씀 (같은 센서를 동시에 읽지 않음)
+    """
+    if snapshot_stale(latest_snapshot):
+        async with sensor_lock:
+            if snapshot_stale(latest_snapshot):
+                publish_snapshot(await read_sensors_async())
+
+def snapshot_json(snapshot):
+    """스냅샷 JSON 끝에 age_ms(측정 후 지난 시간)를 붙여 반환합니다."""
+    age_ms = time.ticks_diff(time.ticks_ms(), snapshot[1])
+    return snapshot[3][:-1] + f', "age_ms": {age_ms}}}'
+
+async def sampler_task():
+    """SAMPLE_INTERVAL_MS 마다 센서를 읽는 백그라운드 작업"""
+    next_ms = time.ticks_ms()
+    while True:
+        async with sensor_lock:
+            publish_snapshot(await read_sensors_async())
+        next_ms = time.ticks_add(next_ms, SAMPLE_INTERVAL_MS)
+        delay_ms = time.ticks_diff(next_ms, time.ticks_ms())
+        if delay_ms < 0:
+            # 측정이 주기보다 오래 걸렸다면 밀린 주기는 건너뜀
+            next_ms = time.ticks_ms()
+            delay_ms = 0
+        await asyncio.sleep(delay_ms / 1000)
+
+# --- 12. (수정) HTTP 응답 작성기 ---
+# 헤더는 미리 만든 bytes를 재사용 버퍼에 이어 붙여 만들고, 본문 길이는 UTF-8 바이트 수로 계산합니다.
+# 처리 함수들은 (상태 코드, Content-Type, 본문) 튜플을 반환하고, 서버가 이 작성기로 보냅니다.
+# (추가) 연결 유지(keep-alive) 응답에는 서버의 대기 시간과 최대 요청 수를 함께 알려 줌
+responder = httpresp.ResponseWriter(
+    RESPONSE_BUFFER_SIZE,
+    keep_alive=httpresp.keep_alive_lines(KEEP_ALIVE_TIMEOUT, KEEP_ALIVE_MAX_REQUESTS),
+)
+
+# --- 14. (수정) 요청 처리 함수 (반복문/비동기 서버 공용) ---
+# (추가) 설정 변경 함수: HTTP POST 와 WebSocket 메시지가 함께 사용
+def apply_sensor_type(new_type):
+    """센서 타입을 바꿉니다. 올바른 타입이면 True"""
+    global sensor_type, latest_snapshot # 전역 변수 수정 허용
+    if new_type not in SENSOR_TYPES:
+        return False
+    sensor_type = new_type
+    latest_snapshot = None  # 다른 센서 타입의 스냅샷은 다음 요청 때 새로 측정
+    save_settings()
+    print(f"센서 타입 변경됨: {sensor_type}")
+    display_text(["Sensor Type", f"Changed to:", f"{sensor_type.upper()}"])
+    return True
+
+def apply_thresholds(new_thresholds):
+    """받은 값만 알람 임계값에 반영합니다. (숫자가 아니면 ValueError/TypeError)"""
+    global alarm_thresholds # 전역 변수 수정 허용
+    # 전역 변수 업데이트
+    if "temperature" in new_thresholds:
+        alarm_thresholds["temperature"] = float(new_thresholds["temperature"])
+    if "humidity" in new_thresholds:
+        alarm_thresholds["humidity"] = float(new_thresholds["humidity"])
+    if "light" in new_thresholds:
+        alarm_thresholds["light"] = float(new_thresholds["light"])
+    if "mic" in new_thresholds:
+        alarm_thresholds["mic"] = float(new_thresholds["mic"])
+    if "water" in new_thresholds:
+        alarm_thresholds["water"] = float(new_thresholds["water"])
+
+    save_settings()
+    print(f"임계값 업데이트됨: {alarm_thresholds}")
+
+    # (수정) OLED 표시에 format_threshold 함수 적용
+    t_str = format_threshold(alarm_thresholds['temperature'])
+    h_str = format_threshold(alarm_thresholds['humidity'])
+    l_str = format_threshold(alarm_thresholds['light'])
+    m_str = format_threshold(alarm_thresholds['mic'])
+    w_str = format_threshold(alarm_thresholds['water'])
+    display_text(["Thresholds SET", f"T:{t_str} H:{h_str}", f"L:{l_str} M:{m_str}", f"W:{w_str}"])
+
+# (추가) POST /sensor_type 요청 처리 (센서 타입 변경)
+def handle_sensor_type(request):
+    try:
+        data = json.loads(request.body)
+
+        if "type" in data and apply_sensor_type(data["type"]):
+            return 200, "application/json", json.dumps({"status": "ok", "sensor_type": sensor_type})
+        else:
+            return 400, "text/plain", "Invalid sensor type"
+    except Exception as e:
+        print(f"센서 타입 변경 오류: {e}")
+        return 400, "text/plain", "Bad Request"
+
+# (수정) POST /alarm_threshold 요청 처리
+def handle_alarm_threshold(request):
+    try:
+        apply_thresholds(json.loads(request.body))
+        return 200, "application/json", json.dumps({"status": "ok", "thresholds": alarm_thresholds})
+    except Exception as e:
+        print(f"POST 요청 처리 오류: {e}")
+        return 400, "text/plain", "Bad Request"
+
+# (추가) /sensors 이진 응답용 버퍼 (순번마다 한 번만 채우고 age_ms 만 고침)
+sensor_packer = sensorpack.SensorPacker()
+
+def wants_binary(request):
+    """?fmt=bin 이거나 Accept 에 application/octet-stream 이 있으면 True (?fmt=json 이 우선)"""
+    fmt = request.query_params().get("fmt")
+    if fmt is not None:
+        return fmt == "bin"
+    return sensorpack.CONTENT_TYPE in request.header("accept", "")
+
+# (수정) 센서를 직접 읽지 않고 샘플러가 만든 최신 스냅샷을 응답
+# (추가) 이진 형식을 요청하면 JSON 대신 28바이트 레코드로 응답 (형식은 lib/sensorpack.py)
+def handle_sensors(request):
+    snapshot = get_snapshot()
+    if wants_binary(request):
+        age_ms = time.ticks_diff(time.ticks_ms(), snapshot[1])
+        return 200, sensorpack.CONTENT_TYPE, sensor_packer.pack(snapshot[2], age_ms)
+    return 200, "application/json", snapshot_json(snapshot)
+
+# (추가) GET /history?since=&limit=&fields= : 저장된 측정 기록을 항목별 배열(JSON)로 응답
+#   since : 이 순번(seq) 다음 기록부터 (없으면 가장 최근 기록들)
+#   limit : 최대 개수 (기본 HISTORY_DEFAULT_LIMIT)
+#   fields: 보낼 항목을 쉼표로 구분 (예: temperature,humidity, 없으면 전부)
+# (추가) GET /history?range=&points=&fields= : 최근 range 초를 points 개 이하의 점으로 응답
+#   원본 기록으로 충분하면 원본을, 아니면 점 개수에 맞는 가장 촘촘한 요약 단계를 보냄
+#   요약 응답: {"tier": 구간 초, "start": [...], "<항목>": {"min": [...], "max": [...], "mean": [...], "count": [...]}}
+def handle_history(request):
+    params = request.query_params()
+    try:
+        since = int(params["since"]) if "since" in params else None
+        limit = int(params.get("limit", HISTORY_DEFAULT_LIMIT))
+        points = int(params["points"]) if "points" in params else None
+        range_s = int(params.get("range", 3600))
+    except ValueError:
+        return 400, "text/plain", "since/limit/points/range must be integers"
+    if limit < 0 or range_s <= 0 or (points is not None and not 0 < points <= HISTORY_MAX_POINTS):
+        return 400, "text/plain", "since/limit/points/range out of range"
+    fields = params["fields"].split(",") if "fields" in params else None
+    # 본문은 항목 하나씩 만들어 보냄 (큰 문자열 하나를 만들지 않음)
+    if points is None:
+        return 200, "application/json", history.iter_json(since, limit, fields)
+
+    now = int(time.time())
+    raw_count = range_s * 1000 // SAMPLE_INTERVAL_MS
+    oldest = history.oldest_timestamp()
+    if raw_count <= points and (len(history) < HISTORY_SIZE or (oldest is not None and oldest <= now - range_s)):
+        return 200, "application/json", history.iter_json(None, raw_count, fields)
+    tier = rollup.choose(now, range_s, points)
+    return 200, "application/json", tier.iter_json(now - range_s, fields)
+
+def handle_index(request):
+    html = f"<html>...<body><h1>Pico Client Server</h1><p>IP: {server_ip}</p><p><a href='/sensors'>/sensors</a></p><p><a href='/history'>/history</a> ({len(history)}/{HISTORY_SIZE}, {history.memory_bytes()} bytes)</p></body></html>"
+    return 200, "text/html", html
+
+# (추가) GET /metrics: 성능 지표를 Prometheus 텍스트 형식으로 응답 (지표마다 한 조각씩 만들어 보냄)
+def handle_metrics(request):
+    return 200, metrics.CONTENT_TYPE, registry.render()
+
+# (메서드, 경로) -> 처리 함수. 경로는 정확히 일치해야 합니다.
+ROUTES = {
+    ("GET", "/"): handle_index,
+    ("GET", "/sensors"): handle_sensors,
+    ("GET", "/history"): handle_history,
+    ("POST", "/sensor_type"): handle_sensor_type,
+    ("POST", "/alarm_threshold"): handle_alarm_threshold,
+    ("GET", "/metrics"): handle_metrics,
+}
+# (추가) 최신 스냅샷으로 응답하는 경로: async 서버는 처리 전에 refresh_snapshot() 을 기다림
+SNAPSHOT_PATHS = ("/sensors",)
 
+def count_request(path):
+    """(추가) 경로별 요청 수 (알 수 없는 경로는 "other" 로 모아 종류 수를 고정)"""
+    requests_total.inc(path if path in METRIC_PATHS else "other")
+
+def handle_request(request):
+    """해석된 요청(httpreq.Request) 하나를 처리하고 (상태 코드, Content-Type, 본문)을 반환합니다."""
+    # 브라우저의 CORS 사전 요청(preflight)
+    if request.method == "OPTIONS":
+        return 200, "text/plain", ""
+
+    count_request(request.path)
+    handler = ROUTES.get((request.method, request.path))
+    if handler is None:
+        return 404, "text/plain", "Not Found"
+    start = time.ticks_us()
+    response = handler(request)
+    handle_us.since(start)  # 조각으로 만드는 본문은 보낼 때 만들어지므로 send 시간에 들어감
+    return response
+
+# --- 15. 기존 서버 (한 번에 한 명씩 처리하는 반복문) ---
+def run_loop_server(ip_address):
     addr = socket.getaddrinfo("0.0.0.0", 8080)[0][-1]
     s = socket.socket()
     s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
@@ -299,154 +782,355 @@ def start_server():
         s.bind(addr)
         s.listen(5)
     except OSError as e:
-        if e.errno == 98:  # EADDRINUSE
-            print(f"포트 8080이 이미 사용 중입니다. 다른 프로그램이 실행 중인지 확인하세요.")
-            display_text(["Port 8080", "Already in use", "Check running apps"])
-            return
-        else:
-            print(f"소켓 바인딩 오류: {e}")
-            display_text(["Socket Error", str(e)])
-            return
+        s.close()
+        raise e
 
-    led_green() 
+    led_green()
 
-    print(f"서버 시작됨: http://{ip_address}:8080")
+    print(f"서버 시작됨 (반복문 모드): http://{ip_address}:8080")
 
     display_text(["Server Running", f"IP: {ip_address}", "Port: 8080"])
 
+    parser = httpreq.RequestParser()
+
     try:
         while True:
             try:
                 cl, addr = s.accept()
+                cl.settimeout(CLIENT_TIMEOUT)
 
-                request_raw = cl.recv(1024)
-                request = request_raw.decode("utf-8")
-
-                if not request:
-                    cl.close()
-                    continue
-
-                if "OPTIONS" in request:
-                    response = create_response(200, "text/plain", "")
-                    cl.send(response.encode("utf-8"))
-
-                # (추가) POST /sensor_type 요청 처리 (센서 타입 변경)
-                elif "POST /sensor_type" in request:
-                    try:
-                        content_length_start = request.find("Content-Length: ") + 16
-                        content_length_end = request.find("\r\n", content_length_start)
-                        content_length = int(request[content_length_start:content_length_end])
-
-                        body_start = request.find("\r\n\r\n") + 4
-                        body = request[body_start : body_start + content_length]
-
-                        data = json.loads(body)
-
-                        if "type" in data and data["type"] in ["mic", "water"]:
-                            sensor_type = data["type"]
-                            print(f"센서 타입 변경됨: {sensor_type}")
-                            display_text(["Sensor Type", f"Changed to:", f"{sensor_type.upper()}"])
-                            response = create_response(200, "application/json", json.dumps({"status": "ok", "sensor_type": sensor_type}))
-                        else:
-                            response = create_response(400, "text/plain", "Invalid sensor type")
-                    except Exception as e:
-                        print(f"센서 타입 변경 오류: {e}")
-                        response = create_response(400, "text/plain", "Bad Request")
-
-                    cl.send(response.encode("utf-8"))
-
-                # (수정) POST /alarm_threshold 요청 처리
-                elif "POST /alarm_threshold" in request:
-                    try:
-                        # HTTP Body 부분 찾기
-                        content_length_start = request.find("Content-Length: ") + 16
-                        content_length_end = request.find("\r\n", content_length_start)
-                        content_length = int(request[content_length_start:content_length_end])
-
-                        body_start = request.find("\r\n\r\n") + 4
-                        body = request[body_start : body_start + content_length]
-
-                        new_thresholds = json.loads(body)
-
-                        # 전역 변수 업데이트
-                        if "temperature" in new_thresholds:
-                            alarm_thresholds["temperature"] = float(new_thresholds["temperature"])
-                        if "humidity" in new_thresholds:
-                            alarm_thresholds["humidity"] = float(new_thresholds["humidity"])
-                        if "light" in new_thresholds:
-                            alarm_thresholds["light"] = float(new_thresholds["light"])
-                        if "mic" in new_thresholds:
-                            alarm_thresholds["mic"] = float(new_thresholds["mic"])
-                        if "water" in new_thresholds:
-                            alarm_thresholds["water"] = float(new_thresholds["water"])
-
-                        print(f"임계값 업데이트됨: {alarm_thresholds}")
-
-                        # (수정) OLED 표시에 format_threshold 함수 적용
-                        t_str = format_threshold(alarm_thresholds['temperature'])
-                        h_str = format_threshold(alarm_thresholds['humidity'])
-                        l_str = format_threshold(alarm_thresholds['light'])
-                        m_str = format_threshold(alarm_thresholds['mic'])
-                        w_str = format_threshold(alarm_thresholds['water'])
-                        display_text(["Thresholds SET", f"T:{t_str} H:{h_str}", f"L:{l_str} M:{m_str}", f"W:{w_str}"])
-
-                        response = create_response(200, "application/json", json.dumps({"status": "ok", "thresholds": alarm_thresholds}))
-                    except Exception as e:
-                        print(f"POST 요청 처리 오류: {e}")
-                        response = create_response(400, "text/plain", "Bad Request")
-
-                    cl.send(response.encode("utf-8"))
-
-                elif "GET /sensors" in request:
-                    sensor_data = read_sensors()
-                    json_data = json.dumps(sensor_data)
-                    response = create_response(200, "application/json", json_data)
-                    cl.send(response.encode("utf-8"))
-
-                    if "error" not in sensor_data:
-                        lines = [
-                            f"T: {sensor_data['temperature']} C",
-                            f"H: {sensor_data['humidity']} %",
-                            f"L: {sensor_data['light']} lx"
-                        ]
-                        if sensor_data['sensor_type'] == "mic" and "mic" in sensor_data:
-                            lines.append(f"Mic: {sensor_data['mic']}")
-                        elif sensor_data['sensor_type'] == "water" and "water_distance" in sensor_data:
-                            lines.append(f"W: {sensor_data['water_distance']} cm")
-                        display_text(lines)
-
-                elif "GET /" in request:
-                    html = f"<html>...<body><h1>Pico Client Server</h1><p>IP: {ip_address}</p><p><a href='/sensors'>/sensors</a></p></body></html>"
-                    response = create_response(200, "text/html", html)
-                    cl.send(response.encode("utf-8"))
-
-                else:
-                    response = create_response(404, "text/plain", "Not Found")
-                    cl.send(response.encode("utf-8"))
+                # 요청 하나가 다 도착할 때까지 읽기
+                state = httpreq.NEED_MORE
+                parse_time = 0  # (추가) 받기를 기다린 시간은 빼고 해석 시간만 더함
+                while state == httpreq.NEED_MORE:
+                    data = cl.recv(RECV_SIZE)
+                    if not data:
+                        break
+                    start = time.ticks_us()
+                    state = parser.feed(data)
+                    parse_time += time.ticks_diff(time.ticks_us(), start)
+                parse_us.observe(parse_time)
 
+                # 반복문 모드는 한 번에 한 연결만 처리하므로 연결 유지 없이 응답마다 닫음
+                if state == httpreq.DONE:
+                    status, content_type, body = handle_request(parser.request)
+                    start = time.ticks_us()
+                    if not isinstance(body, (str, bytes, bytearray)):
+                        body = "".join(body)  # 조각으로 만든 본문 (예: /history)
+                    responder.send(cl, status, content_type, body)
+                    send_us.since(start)
+                elif state == httpreq.ERROR:
+                    errors_total.inc("bad_request")
+                    responder.send(cl, parser.error, "text/plain", "Bad Request")
                 cl.close()
 
             except Exception as e:
                 print(f"서버 오류: {e}")
-                display_text(["Server Error", str(e)])
+                errors_total.inc("server")
+                display_text(["Server Error", str(e)], force=True)
                 if 'cl' in locals():
                     cl.close()
                 time.sleep(1)
+            finally:
+                parser.reset()
+    finally:
+        # 서버 소켓 닫기 (포트 회수)
+        s.close()
+        print("포트 8080이 회수되었습니다.")
+
+# --- 16. (추가) 비동기 서버 (여러 연결을 동시에 처리) ---
+active_connections = 0  # 현재 처리 중인 연결 수
+# 연결마다 쓸 요청 파서를 미리 만들어 둠 (연결 수 제한과 같은 개수)
+parser_pool = []
+
+async def read_request(reader, parser, first_timeout=CLIENT_TIMEOUT):
+    """
+    요청 하나가 다 도착할 때까지 읽습니다.
+    first_timeout: 요청의 첫 데이터를 기다리는 시간 (연결 유지 중에는 KEEP_ALIVE_TIMEOUT)
+    (반환값: httpreq.DONE 또는 httpreq.ERROR, 연결이 끊기면 None)
+    """
+    state = parser.state
+    timeout = first_timeout if parser.length == 0 else CLIENT_TIMEOUT
+    parse_time = 0  # (추가) 받기를 기다린 시간은 빼고 해석 시간만 더함
+    while state == httpreq.NEED_MORE:
+        data = await asyncio.wait_for(reader.read(RECV_SIZE), timeout)
+        if not data:
+            return None
+        timeout = CLIENT_TIMEOUT
+        start = time.ticks_us()
+        state = parser.feed(data)
+        parse_time += time.ticks_diff(time.ticks_us(), start)
+    parse_us.observe(parse_time)
+    return state
+
+# (추가) GET /events: Server-Sent Events 로 새 측정값을 밀어 주기
+# 센서는 샘플러가 한 번만 읽고, 같은 이벤트 bytes 를 모든 구독자에게 보냅니다.
+_event_cache = (0, b"")
+
+def snapshot_event_bytes(snapshot):
+    """스냅샷을 SSE 이벤트(id + data) bytes 로 만듭니다. 순번마다 한 번만 만듦"""
+    global _event_cache
+    if _event_cache[0] != snapshot[0]:
+        _event_cache = (snapshot[0], b"id: %d\ndata: " % snapshot[0] + snapshot[3].encode() + b"\n\n")
+    return _event_cache[1]
+
+async def stream_events(reader, writer, request):
+    """
+    text/event-stream 연결을 열어 두고 새 스냅샷마다 이벤트를 보냅니다.
+    다시 연결한 브라우저가 보낸 Last-Event-ID 가 최신 순번과 같으면 다음 측정값부터 보냅니다.
+    """
+    await responder.awrite_stream_head(writer, 200, "text/event-stream", httpresp.NO_CACHE)
+    writer.write(b"retry: %d\n\n" % SSE_RETRY_MS)
+    await writer.drain()
+
+    try:
+        last_id = int(request.header("last-event-id", "-1"))
+    except ValueError:
+        last_id = -1
+    try:
+        while True:
+            snapshot = latest_snapshot
+            if snapshot is not None and snapshot[0] != last_id:
+                last_id = snapshot[0]
+                writer.write(snapshot_event_bytes(snapshot))
+                await writer.drain()
+                continue
+            try:
+                await asyncio.wait_for(snapshot_event.wait(), SSE_HEARTBEAT_MS / 1000)
+            except asyncio.TimeoutError:
+                # 연결이 살아 있는지 확인 (브라우저/공유기의 유휴 연결 종료 방지)
+                writer.write(b": ping\n\n")
+                await writer.drain()
+    except OSError:
+        pass  # 브라우저가 탭을 닫는 등 연결이 끊김
+
+# (추가) GET /ws: 웹소켓 하나로 측정값 받기 + 임계값/센서 타입 바꾸기
+# 보내는 측정값: 스냅샷 JSON 텍스트 프레임 (순번마다 한 번만 만들어 모든 연결에 보냄)
+# 받는 메시지 (JSON 텍스트):
+#   {"thresholds": {"temperature": 30, ...}}  -> {"ack": "thresholds", "thresholds": {...}}
+#   {"sensor_type": "water"}                  -> {"ack": "sensor_type", "sensor_type": "water"}
+#   {"ping": 아무 값}                          -> {"pong": 같은 값} (지연 시간 측정용)
+_frame_cache = (0, b"")
+
+def snapshot_frame_bytes(snapshot):
+    """스냅샷을 웹소켓 텍스트 프레임 bytes 로 만듭니다. 순번마다 한 번만 만듦"""
+    global _frame_cache
+    if _frame_cache[0] != snapshot[0]:
+        _frame_cache = (snapshot[0], wsproto.frame(wsproto.TEXT, snapshot[3]))
+    return _frame_cache[1]
+
+def handle_ws_message(text):
+    """웹소켓으로 받은 메시지 하나를 처리하고 답장(dict)을 반환합니다."""
+    try:
+        message = json.loads(text)
+        if "ping" in message:
+            return {"pong": message["ping"]}
+        if "thresholds" in message:
+            apply_thresholds(message["thresholds"])
+            return {"ack": "thresholds", "thresholds": alarm_thresholds}
+        if "sensor_type" in message:
+            if apply_sensor_type(message["sensor_type"]):
+                return {"ack": "sensor_type", "sensor_type": sensor_type}
+            return {"error": "Invalid sensor type"}
+        return {"error": "Unknown message"}
+    except Exception as e:
+        print(f"웹소켓 메시지 오류: {e}")
+        return {"error": "Bad Request"}
+
+async def ws_send_readings(ws):
+    """새 스냅샷마다 측정값 프레임을 보내는 작업 (연결마다 하나)"""
+    last_seq = -1
+    try:
+        while not ws.closed:
+            snapshot = latest_snapshot
+            if snapshot is not None and snapshot[0] != last_seq:
+                last_seq = snapshot[0]
+                await ws.send_raw(snapshot_frame_bytes(snapshot))
+            else:
+                await snapshot_event.wait()
+    except OSError:
+        ws.closed = True  # 연결이 끊김 (받는 쪽도 곧 끝남)
+
+async def websocket_session(reader, writer, request):
+    """웹소켓 연결 수락 후, 연결이 끊길 때까지 측정값을 보내고 메시지를 받습니다."""
+    if not wsproto.is_upgrade(request):
+        await responder.awrite(writer, 400, "text/plain", "WebSocket upgrade required")
+        return
+    writer.write(wsproto.upgrade_response(request.header("sec-websocket-key")))
+    await writer.drain()
+
+    ws = wsproto.WebSocket(reader, writer, WS_MAX_MESSAGE)
+    sender = asyncio.create_task(ws_send_readings(ws))
+    try:
+        while True:
+            message = await ws.recv()
+            if message is None:
+                break
+            opcode, payload = message
+            if opcode == wsproto.TEXT:
+                await ws.send_text(json.dumps(handle_ws_message(payload)))
+    except OSError:
+        pass  # 연결이 끊김
+    finally:
+        ws.closed = True
+        sender.cancel()
+
+# 연결이 끊길 때까지 한 연결을 계속 쓰는 경로 (GET 전용, 연결 수 제한에 포함)
+STREAM_ROUTES = {
+    "/events": stream_events,
+    "/ws": websocket_session,
+}
+
+async def handle_client(reader, writer):
+    """연결 하나를 처리하는 코루틴. 느린 클라이언트가 다른 연결을 막지 않습니다."""
+    global active_connections
+
+    # 연결 수 제한: 초과하면 바로 503을 보내고 닫기
+    if active_connections >= MAX_CONNECTIONS:
+        errors_total.inc("busy")
+        try:
+            await responder.awrite(writer, 503, "text/plain", "Busy")
+        except Exception:
+            pass
+        writer.close()
+        await writer.wait_closed()
+        return
+
+    active_connections += 1
+    parser = parser_pool.pop()
+    served = 0
+    try:
+        # (추가) 연결 유지: 응답 후 닫지 않고 같은 연결에서 다음 요청을 처리
+        # (이미 받아 둔 다음 요청이 있으면 parser.next() 가 바로 DONE 을 반환 = 파이프라이닝)
+        state = await read_request(reader, parser)
+        while state == httpreq.DONE:
+            served += 1
+            request = parser.request
+            # 마지막 연결 자리는 연결 유지를 하지 않음: 다른 탭/기기가 들어올 자리를 남겨 둠
+            keep_alive = (
+                request.keep_alive()
+                and served < KEEP_ALIVE_MAX_REQUESTS
+                and active_connections < MAX_CONNECTIONS
+            )
+            stream = STREAM_ROUTES.get(request.path) if request.method == "GET" else None
+            if stream is not None:
+                count_request(request.path)
+                # 이벤트 스트림/웹소켓은 연결이 끊길 때까지 이 연결을 씀
+                if active_connections >= MAX_CONNECTIONS:
+                    errors_total.inc("busy")
+                    await responder.awrite(writer, 503, "text/plain", "Busy")
+                else:
+                    await stream(reader, writer, request)
+                break
+            if request.path in SNAPSHOT_PATHS:
+                await refresh_snapshot()  # (추가) 오래된 스냅샷이면 센서 잠금을 잡고 새로 측정
+            status, content_type, body = handle_request(request)
+            start = time.ticks_us()
+            if isinstance(body, (str, bytes, bytearray)):
+                await responder.awrite(writer, status, content_type, body, keep_alive=keep_alive)
+            else:
+                # 조각으로 만든 본문 (예: /history) 은 chunked 로 보냄
+                await responder.awrite_chunked(writer, status, content_type, body, keep_alive=keep_alive)
+            send_us.since(start)  # 느린 클라이언트/WiFi 를 기다린 시간 포함
+            if not keep_alive:
+                break
+            state = parser.next()
+            if state == httpreq.NEED_MORE:
+                state = await read_request(reader, parser, KEEP_ALIVE_TIMEOUT)
+
+        if state == httpreq.ERROR:
+            # 잘못된 요청: 그 뒤의 데이터는 읽지 않고 400 계열 응답 후 종료
+            errors_total.inc("bad_request")
+            await responder.awrite(writer, parser.error, "text/plain", "Bad Request")
+    except asyncio.TimeoutError:
+        # 연결 유지 중 다음 요청이 오지 않은 것은 정상 종료
+        if served == 0 or parser.length:
+            print("클라이언트 응답 시간 초과")
+            errors_total.inc("timeout")
+    except Exception as e:
+        print(f"서버 오류: {e}")
+        errors_total.inc("server")
+    finally:
+        parser.reset()  # 다음 연결이 이 연결의 남은 데이터를 보지 않도록 비움
+        parser_pool.append(parser)
+        active_connections -= 1
+        try:
+            writer.close()
+            await writer.wait_closed()
+        except Exception:
+            pass
+
+async def run_async_server(ip_address):
+    global snapshot_event, sensor_lock
+    snapshot_event = asyncio.Event()
+    sensor_lock = asyncio.Lock()
+    while len(parser_pool) < MAX_CONNECTIONS:
+        parser_pool.append(httpreq.RequestParser())
+
+    server = await asyncio.start_server(handle_client, "0.0.0.0", 8080, backlog=5)
+    sampler = asyncio.create_task(sampler_task())
+
+    led_green()
+
+    print(f"서버 시작됨 (비동기 모드): http://{ip_address}:8080")
+
+    display_text(["Server Running", f"IP: {ip_address}", "Port: 8080"])
+
+    try:
+        while True:
+            # 너무 빨리 와서 미뤄진 OLED 갱신을 내보냄
+            screen.poll()
+            await asyncio.sleep(1 / OLED_MAX_FPS)
+    finally:
+        snapshot_event = None
+        sensor_lock = None
+        sampler.cancel()
+        server.close()
+        await server.wait_closed()
+        print("포트 8080이 회수되었습니다.")
+
+# --- 17. 메인 서버 함수 (서버 모드 선택) ---
+def start_server():
+    global server_ip
+
+    ip_address = connect_wifi()
+    if not ip_address:
+        print("WiFi 연결 실패로 서버 시작 불가")
+        display_text(["WiFi FAILED!", "Server STOP."], force=True)
+        return
+    server_ip = ip_address
+
+    # (추가) 시계를 맞춘 뒤 플래시에 남은 측정 기록 복원
+    sync_clock()
+    restore_history()
+
+    try:
+        if SERVER_MODE == "async":
+            asyncio.run(run_async_server(ip_address))
+        else:
+            run_loop_server(ip_address)
+
+    except OSError as e:
+        if e.errno == 98:  # EADDRINUSE
+            print(f"포트 8080이 이미 사용 중입니다. 다른 프로그램이 실행 중인지 확인하세요.")
+            display_text(["Port 8080", "Already in use", "Check running apps"], force=True)
+        else:
+            print(f"소켓 바인딩 오류: {e}")
+            display_text(["Socket Error", str(e)], force=True)
 
     except KeyboardInterrupt:
         print("\n서버를 종료합니다...")
-        display_text(["Server", "Shutting down", "Good bye"])
+        display_text(["Server", "Shutting down", "Good bye"], force=True)
         buzzer_off()
         led_red()
         time.sleep(1)
     finally:
-        # 서버 소켓 닫기 (포트 회수)
-        if 's' in locals():
-            s.close()
-            print("포트 8080이 회수되었습니다.")
+        history_log.flush()  # 모아 둔 측정값을 플래시에 씀
+        if SERVER_MODE == "async":
+            asyncio.new_event_loop()  # 다음 실행을 위해 이벤트 루프 상태 초기화
 
 
 # ---- 프로그램 시작 ----
 if __name__ == "__main__":
-    print("Pico 센서 서버 (WiFi Client, 3-Threshold, OLED) 시작...")
-    start_server()
\ No newline at end of file
+    print(f"Pico 센서 서버 (WiFi Client, 3-Threshold, OLED, {SERVER_MODE}) 시작...")
+    start_server()
@@ -0,0 +1,154 @@
+"""
+마이크 ADC 수집 방식 비교 (기존 read_u16() 반복문 vs lib/adccap.py 고정 속도 수집)
+
+1. 기존 방식: read_u16() 100번 반복 - 걸린 시간, 실제 샘플링 속도, 샘플 간격의 흔들림(지터)
+2. adccap: 설정한 속도(--rate)로 --samples 개 수집 - 걸린 시간, 실제 샘플링 속도,
+   그동안 CPU 를 쓴 시간 (dma 는 시작/확인 시간만, 나머지 방식은 수집 시간 전체)
+3. 통계 계산: stats() (최댓값-최솟값, RMS, dB) 한 번의 시간
+
+피코에서는 DMA 가 있으면 "dma", 없으면 "fifo"(viper) 방식으로, PC 에서는 sim 의 가짜 ADC 와
+"loop" 방식으로 실행됩니다. PC 의 시간은 가상 시계 기준이라 방식끼리의 비교용입니다.
+
+사용 예:
+    python3 bench/bench_adccap.py
+    python3 bench/bench_adccap.py --rate 32000 --samples 512 --json
+    (피코) lib/ 를 올린 뒤: mpremote run bench/bench_adccap.py
+"""
+
+import json
+import sys
+import time
+
+ON_HOST = sys.implementation.name != "micropython"
+
+if ON_HOST:
+    import os
+
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    import sim  # noqa: E402
+
+    sim.install()
+
+from machine import ADC, Pin  # noqa: E402
+
+import adccap  # noqa: E402
+
+MIC_PIN = 28
+LEGACY_SAMPLES = 100
+
+
+def legacy_read(adc):
+    """기존 read_mic_sensor(): read_u16() 을 100번 읽어 최댓값-최솟값"""
+    max_val = 0
+    min_val = 65535
+    for _ in range(LEGACY_SAMPLES):
+        val = adc.read_u16()
+        if val > max_val:
+            max_val = val
+        if val < min_val:
+            min_val = val
+    return max_val - min_val
+
+
+def legacy_intervals(adc):
+    """기존 반복문의 샘플 간격 (µs). 시각을 재는 만큼 조금 느려지므로 흔들림 확인용"""
+    stamps = [0] * LEGACY_SAMPLES
+    for i in range(LEGACY_SAMPLES):
+        adc.read_u16()
+        stamps[i] = time.ticks_us()
+    return [time.ticks_diff(stamps[i], stamps[i - 1]) for i in range(1, LEGACY_SAMPLES)]
+
+
+def bench_legacy(adc, rounds):
+    total = 0
+    for _ in range(rounds):
+        start = time.ticks_us()
+        legacy_read(adc)
+        total += time.ticks_diff(time.ticks_us(), start)
+    mean_us = total / rounds
+    intervals = legacy_intervals(adc)
+    return {
+        "samples": LEGACY_SAMPLES,
+        "mean_us": int(mean_us),
+        "cpu_us": int(mean_us),
+        "samples_per_s": int(LEGACY_SAMPLES * 1000000 / mean_us) if mean_us else 0,
+        "interval_min_us": min(intervals),
+        "interval_max_us": max(intervals),
+    }
+
+
+def bench_capture(capture, rounds):
+    total = 0
+    cpu = 0
+    for _ in range(rounds):
+        start = time.ticks_us()
+        if capture.engine == "dma":
+            # 시작과 완료 확인에 쓴 시간만 CPU 시간으로 셈 (기다리는 동안은 다른 작업 가능)
+            capture.start()
+            cpu += time.ticks_diff(time.ticks_us(), start)
+            time.sleep_ms(capture.duration_ms())
+            while True:
+                check = time.ticks_us()
+                finished = capture.done()
+                cpu += time.ticks_diff(time.ticks_us(), check)
+                if finished:
+                    break
+        else:
+            capture.capture()
+            cpu += time.ticks_diff(time.ticks_us(), start)
+        total += time.ticks_diff(time.ticks_us(), start)
+    mean_us = total / rounds
+
+    stats_total = 0
+    for _ in range(rounds):
+        start = time.ticks_us()
+        capture.stats()
+        stats_total += time.ticks_diff(time.ticks_us(), start)
+
+    peak_to_peak, rms, db = capture.stats()
+    return {
+        "engine": capture.engine,
+        "samples": capture.size,
+        "rate": capture.rate,
+        "mean_us": int(mean_us),
+        "cpu_us": cpu // rounds,
+        "samples_per_s": int(capture.size * 1000000 / mean_us) if mean_us else 0,
+        "stats_us": stats_total // rounds,
+        "peak_to_peak": peak_to_peak,
+        "rms": round(rms, 1),
+        "db": round(db, 1),
+    }
+
+
+def run(rate, samples, rounds):
+    adc = ADC(Pin(MIC_PIN))
+    capture = adccap.Capture(adc, MIC_PIN, samples, rate)
+    return {"legacy": bench_legacy(adc, rounds), "capture": bench_capture(capture, rounds)}
+
+
+def main():
+    if not ON_HOST:
+        print(json.dumps(run(16000, 256, 20)))
+        return
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="마이크 ADC 수집 방식 비교")
+    parser.add_argument("--rate", type=int, default=16000, help="adccap 샘플링 속도 (Hz)")
+    parser.add_argument("--samples", type=int, default=256, help="adccap 한 번에 모을 샘플 수")
+    parser.add_argument("--rounds", type=int, default=20, help="반복 횟수")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 한 줄로 출력")
+    args = parser.parse_args()
+
+    report = run(args.rate, args.samples, args.rounds)
+    if args.json:
+        print(json.dumps(report))
+        return
+    for name, entry in report.items():
+        print(f"[{name}]")
+        for key, value in entry.items():
+            print(f"  {key:>16}: {value}")
+
+
+if __name__ == "__main__":
+    main()
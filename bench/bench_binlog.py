@@ -0,0 +1,134 @@
+"""
+이진 로그(lib/binlog.py)와 기존 텍스트 로그 비교 (PC/리눅스에서 실행)
+
+1. 쓰기: 기존 log_message 방식(메시지마다 파일 열고 한 줄 추가 후 닫기)과
+   BinLog(고정 크기 레코드를 모아서 한 번에 쓰기)의 초당 기록 수, 쓴 바이트, write 횟수
+2. 플래시 마모 추정: write 한 번마다 마지막 페이지(256바이트)를 다시 쓰고
+   메타데이터 블록도 한 번 고친다고 보고 프로그램되는 바이트 수를 계산 (LittleFS 근사)
+3. 재생: 부팅 때처럼 저장된 레코드를 전부 읽는 속도 (텍스트는 줄 단위 해석)
+
+사용 예:
+    python3 bench/bench_binlog.py
+    python3 bench/bench_binlog.py --records 20000 --buffer 30 --json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib"))
+
+from binlog import BinLog  # noqa: E402
+
+PAGE = 256  # RP2040 플래시 프로그램 단위
+METADATA = 256  # write 한 번마다 고쳐 쓰는 메타데이터 양 (근사)
+
+# 06 대시보드의 측정 기록 레코드와 같은 모양: seq, 시각, 필드 6개
+FORMAT = "<IIhhfHhb"
+
+
+def program_bytes(write_sizes):
+    """write 크기 목록으로 플래시에 프로그램되는 바이트 수 추정"""
+    total = 0
+    offset = 0
+    for size in write_sizes:
+        first_page = offset // PAGE
+        offset += size
+        last_page = (offset - 1) // PAGE
+        total += (last_page - first_page + 1) * PAGE + METADATA
+    return total
+
+
+def sample(n):
+    return (n, 1700000000 + n, 231 + n % 7, 455, 312.5, n % 4096, -32768, n % 2)
+
+
+def bench_text(path, count):
+    sizes = []
+    start = time.perf_counter()
+    for n in range(count):
+        line = "[%d] %s\n" % (n * 1000, ",".join(str(v) for v in sample(n)))
+        with open(path, "a") as f:  # 기존 log_message 방식
+            f.write(line)
+        sizes.append(len(line.encode()))
+    elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    replayed = 0
+    with open(path) as f:
+        for line in f:
+            stamp, _, rest = line.partition(" ")
+            values = [float(v) for v in rest.split(",")]
+            replayed += len(values) > 0 and stamp.startswith("[")
+    replay = time.perf_counter() - start
+    return {
+        "records_per_s": round(count / elapsed),
+        "bytes_written": sum(sizes),
+        "writes": len(sizes),
+        "est_program_bytes": program_bytes(sizes),
+        "replay_records_per_s": round(replayed / replay),
+    }
+
+
+def bench_binlog(prefix, count, buffer_records):
+    log = BinLog(prefix, FORMAT, segment_records=count, max_segments=2, buffer_records=buffer_records)
+    sizes = []
+    start = time.perf_counter()
+    for n in range(count):
+        before = log.bytes_written
+        log.append(*sample(n))
+        if log.bytes_written != before:
+            sizes.append(log.bytes_written - before)
+    before = log.bytes_written
+    log.flush()
+    if log.bytes_written != before:
+        sizes.append(log.bytes_written - before)
+    elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    replayed = sum(1 for _ in log.records())
+    replay = time.perf_counter() - start
+    return {
+        "records_per_s": round(count / elapsed),
+        "bytes_written": log.bytes_written,
+        "writes": log.writes,
+        "est_program_bytes": program_bytes(sizes),
+        "replay_records_per_s": round(replayed / replay),
+        "record_size": log.size,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="텍스트 로그와 BinLog 쓰기/재생 비교")
+    parser.add_argument("--records", type=int, default=5000, help="기록할 레코드 수")
+    parser.add_argument("--buffer", type=int, default=30, help="BinLog 가 모아서 쓰는 레코드 수")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 한 줄로 출력")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        report = {
+            "records": args.records,
+            "text": bench_text(os.path.join(directory, "serial_log.txt"), args.records),
+            "binlog": bench_binlog(os.path.join(directory, "history_log"), args.records, args.buffer),
+        }
+    finally:
+        shutil.rmtree(directory)
+    text, binlog = report["text"], report["binlog"]
+    report["program_bytes_ratio"] = round(text["est_program_bytes"] / binlog["est_program_bytes"], 1)
+
+    if args.json:
+        print(json.dumps(report))
+        return
+    print("레코드 %d개" % args.records)
+    for key in ("records_per_s", "bytes_written", "writes", "est_program_bytes", "replay_records_per_s"):
+        print("%22s: text %10s   binlog %10s" % (key, text[key], binlog[key]))
+    print("플래시 프로그램 바이트 (추정) %.1f배 감소" % report["program_bytes_ratio"])
+
+
+if __name__ == "__main__":
+    main()
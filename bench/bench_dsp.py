@@ -0,0 +1,188 @@
+"""
+마이크 버퍼 분석(lib/dsp.py) 시간과 정확도 측정
+
+1. 시간: dc(), rms(), envelope(), zero_crossing_rate(), band_levels() 한 번의 시간과
+   같은 버퍼의 최댓값-최솟값(기존 방식) 시간
+2. 정확도: 합성한 사인파(주파수, 진폭을 알고 있음)를 넣어 비교
+   - rms: 이론값 (진폭 / √2, read_u16 단위)과의 차이 (%)
+   - 영교차율: 2 x 주파수와의 차이 (%)
+   - 대역 에너지: 사인파가 든 대역의 비율 (%), sqrt(대역² 합) 과 rms 의 차이 (%)
+   (100 Hz 처럼 버퍼 길이에 몇 주기만 들어가는 낮은 소리는 rms 와 영교차율의 오차가 커짐)
+3. 튀는 샘플: 조용한 버퍼에 샘플 하나만 튀게 했을 때 최댓값-최솟값과 rms 가 얼마나 커지는지
+4. (PC, NumPy 가 있을 때) engine="numpy" 결과를 같은 버퍼의 "kernel" 결과와 비교:
+   rms/대역 에너지의 최대 차이 (%, 대역은 rms 대비), 포락선의 최대 차이, 영교차율이 다른 버퍼 수
+
+1~3 은 기본 엔진("kernel")으로 잽니다: 피코에서는 viper 커널, PC 에서는 같은 정수 계산을 하는 파이썬 코드.
+
+사용 예:
+    python3 bench/bench_dsp.py
+    python3 bench/bench_dsp.py --samples 512 --rate 32000 --json
+    (피코) lib/ 를 올린 뒤: mpremote run bench/bench_dsp.py
+"""
+
+import json
+import math
+import sys
+import time
+from array import array
+
+ON_HOST = sys.implementation.name != "micropython"
+
+if ON_HOST:
+    import os
+
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    import sim  # noqa: E402
+
+    sim.install()
+
+import dsp  # noqa: E402
+
+# (주파수 Hz, 진폭 12비트 단위): 웅웅거림, 목소리, 경보음, 날카로운 소리
+TONES = ((100, 400), (440, 300), (1500, 1000), (5000, 200))
+MIDSCALE = 2048
+NOISE = 3  # 합성 신호에 더하는 흔들림 (12비트 단위, 결과가 매번 같도록 고정된 순서)
+
+
+def tone(buf, rate, frequency, amplitude):
+    """buf 를 MIDSCALE 중심의 사인파(+작은 흔들림)로 채움"""
+    for i in range(len(buf)):
+        noise = ((i * 7919) % (2 * NOISE + 1)) - NOISE
+        buf[i] = MIDSCALE + int(round(amplitude * math.sin(2 * math.pi * frequency * i / rate))) + noise
+
+
+def timed(function, buf, rounds):
+    start = time.ticks_us()
+    for _ in range(rounds):
+        function(buf)
+    return time.ticks_diff(time.ticks_us(), start) // rounds
+
+
+def peak_to_peak(buf):
+    """adccap.Capture.stats()[0] 과 같은 값 (read_u16 단위)"""
+    return (max(buf) - min(buf)) << 4
+
+
+def bench_timing(analyzer, buf, rounds):
+    tone(buf, analyzer.rate, 1500, 1000)
+    return {
+        "dc_us": timed(analyzer.dc, buf, rounds),
+        "rms_us": timed(analyzer.rms, buf, rounds),
+        "envelope_us": timed(analyzer.envelope, buf, rounds),
+        "zero_crossing_us": timed(analyzer.zero_crossing_rate, buf, rounds),
+        "band_levels_us": timed(analyzer.band_levels, buf, rounds),
+        "peak_to_peak_us": timed(peak_to_peak, buf, rounds),
+    }
+
+
+def band_of(analyzer, frequency):
+    for index, (low, high) in enumerate(analyzer.bands):
+        if low <= frequency < high:
+            return index
+    return None
+
+
+def bench_accuracy(analyzer, buf):
+    report = {}
+    for frequency, amplitude in TONES:
+        tone(buf, analyzer.rate, frequency, amplitude)
+        rms = analyzer.rms(buf)
+        expected = amplitude / math.sqrt(2) * 16
+        zcr = analyzer.zero_crossing_rate(buf)
+        levels = analyzer.band_levels(buf)
+        energy = sum(level * level for level in levels)
+        index = band_of(analyzer, frequency)
+        report["%d_hz" % frequency] = {
+            "rms": round(rms, 1),
+            "rms_error_percent": round(100 * (rms - expected) / expected, 2),
+            "zcr_error_percent": round(100 * (zcr - 2 * frequency) / (2 * frequency), 1),
+            "bands": [round(level) for level in levels],
+            "in_band_percent": round(100 * levels[index] ** 2 / energy, 1) if energy else 0.0,
+            "band_total_error_percent": round(100 * (math.sqrt(energy) - rms) / rms, 1) if rms else 0.0,
+        }
+    return report
+
+
+def bench_spike(analyzer, buf):
+    """조용한 버퍼(흔들림만)에 샘플 하나가 튀었을 때"""
+    tone(buf, analyzer.rate, 440, 0)
+    quiet_p2p, quiet_rms = peak_to_peak(buf), analyzer.rms(buf)
+    buf[len(buf) // 2] = MIDSCALE + 1500
+    return {
+        "p2p_quiet": quiet_p2p,
+        "p2p_spike": peak_to_peak(buf),
+        "rms_quiet": round(quiet_rms, 1),
+        "rms_spike": round(analyzer.rms(buf), 1),
+    }
+
+
+def bench_numpy(analyzer, buf, rounds):
+    """engine="numpy" 를 "kernel" 과 같은 버퍼로 비교 (NumPy 가 없으면 건너뜀)"""
+    if dsp.np is None:
+        return {"skipped": "numpy not installed"}
+    numpy_analyzer = dsp.Analyzer(analyzer.size, analyzer.rate, analyzer.bands, analyzer.window, engine="numpy")
+    rms_error = band_error = envelope_diff = 0.0
+    zcr_mismatches = 0
+    for frequency, amplitude in TONES:
+        tone(buf, analyzer.rate, frequency, amplitude)
+        rms = analyzer.rms(buf)
+        rms_error = max(rms_error, abs(numpy_analyzer.rms(buf) - rms) * 100 / rms)
+        kernel_levels = list(analyzer.band_levels(buf))
+        for kernel, other in zip(kernel_levels, numpy_analyzer.band_levels(buf)):
+            band_error = max(band_error, abs(other - kernel) * 100 / rms)
+        kernel_envelope = list(analyzer.envelope(buf))
+        for kernel, other in zip(kernel_envelope, numpy_analyzer.envelope(buf)):
+            envelope_diff = max(envelope_diff, abs(other - kernel))
+        if analyzer.zero_crossing_rate(buf) != numpy_analyzer.zero_crossing_rate(buf):
+            zcr_mismatches += 1
+    tone(buf, analyzer.rate, 1500, 1000)
+    return {
+        "rms_max_error_percent": round(rms_error, 4),
+        "band_max_error_percent": round(band_error, 2),
+        "envelope_max_diff": envelope_diff,
+        "zcr_mismatches": zcr_mismatches,
+        "rms_us": timed(numpy_analyzer.rms, buf, rounds),
+        "band_levels_us": timed(numpy_analyzer.band_levels, buf, rounds),
+    }
+
+
+def run(samples, rate, rounds):
+    analyzer = dsp.Analyzer(samples, rate)
+    buf = array("H", bytes(2 * samples))
+    report = {
+        "config": {"samples": samples, "rate": rate, "engine": analyzer.engine},
+        "timing": bench_timing(analyzer, buf, rounds),
+        "accuracy": bench_accuracy(analyzer, buf),
+        "spike": bench_spike(analyzer, buf),
+    }
+    if ON_HOST:
+        report["numpy"] = bench_numpy(analyzer, buf, rounds)
+    return report
+
+
+def main():
+    if not ON_HOST:
+        print(json.dumps(run(256, 16000, 20)))
+        return
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="마이크 버퍼 분석(dsp) 시간과 정확도")
+    parser.add_argument("--samples", type=int, default=256, help="버퍼 샘플 수 (2의 거듭제곱)")
+    parser.add_argument("--rate", type=int, default=16000, help="샘플링 속도 (Hz)")
+    parser.add_argument("--rounds", type=int, default=20, help="반복 횟수")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 한 줄로 출력")
+    args = parser.parse_args()
+
+    report = run(args.samples, args.rate, args.rounds)
+    if args.json:
+        print(json.dumps(report))
+        return
+    for name, entry in report.items():
+        print(f"[{name}]")
+        for key, value in entry.items():
+            print(f"  {key:>26}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+연결 유지 HTTPS 클라이언트(lib/httpclient.py) 측정 (PC/리눅스에서 실행)
+
+bench/tls_standin.py 서버(Apps Script 처럼 POST -> 302 -> 다른 호스트로 GET)에
+05_send_data 와 같은 묶음을 여러 번 올리면서
+1. new_connection: 올릴 때마다 새 클라이언트 (urequests 처럼 매번 DNS + TCP + TLS)
+2. persistent: 클라이언트 하나로 연결과 DNS 결과를 재사용
+의 단계별 평균 시간(ms), 연결/핸드셰이크/DNS 조회 수를 비교합니다.
+마지막으로 서버가 쉬는 연결을 닫은 뒤에도 업로드가 다시 연결해서 성공하는지 확인합니다.
+
+피코에서는 TLS 핸드셰이크가 1초 이상 걸리므로 --handshake-ms 로 그 비용을 흉내 낼 수 있습니다.
+
+사용 예:
+    python3 bench/bench_httpclient.py
+    python3 bench/bench_httpclient.py --uploads 50 --handshake-ms 300 --json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import ssl
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "lib"))
+sys.path.insert(0, HERE)
+
+# lib/httpclient.py 가 쓰는 MicroPython time 함수를 PC 에서 대신함
+if not hasattr(time, "ticks_ms"):
+    time.ticks_ms = lambda: int(time.perf_counter() * 1000)
+    time.ticks_diff = lambda a, b: a - b
+
+from httpclient import HttpClient  # noqa: E402
+from tls_standin import start  # noqa: E402
+
+PHASES = ("dns", "connect", "tls", "send", "wait", "receive", "total")
+
+
+def payload(batch):
+    records = [{"timestamp": 1760000000 + batch * 60 + i * 5, "temperature": 21.5, "humidity": 48.2} for i in range(12)]
+    return {"device": "bench", "batch": batch, "records": records}
+
+
+def run(args, mode, server, context):
+    url = "https://localhost:%d/macros/s/test/exec" % server.server_address[1]
+    before = server.stats()
+    totals = dict.fromkeys(PHASES, 0)
+    opened = lookups = reused = redirects = 0
+    client = HttpClient(ssl_context=context)
+    for batch in range(1, args.uploads + 1):
+        if mode == "new_connection":
+            client = HttpClient(ssl_context=context)
+        response = client.post_json(url, payload(batch))
+        ack = response.json()
+        if response.status != 200 or not ack.get("ok") or ack.get("batch") != batch:
+            raise AssertionError("bad ack %r" % (ack,))
+        for phase in PHASES:
+            totals[phase] += response.timings[phase]
+        reused += response.timings["reused"]
+        redirects += response.timings["redirects"]
+        if mode == "new_connection":
+            opened += client.connections_opened
+            lookups += client.dns_lookups
+            client.close()
+    if mode == "persistent":
+        opened, lookups = client.connections_opened, client.dns_lookups
+        client.close()
+    after = server.stats()
+    report = {phase + "_ms": round(totals[phase] / args.uploads, 2) for phase in PHASES}
+    report.update(
+        {
+            "connections": opened,
+            "handshakes": after["handshakes"] - before["handshakes"],
+            "dns_lookups": lookups,
+            "reused_requests": reused,
+            "redirects": redirects,
+        }
+    )
+    return report
+
+
+def stale_connection(args, directory, context):
+    """The server closes an idle connection; the next upload must reconnect and succeed"""
+    server, cert = start(directory, idle_close=0.3)
+    context = ssl.create_default_context(cafile=cert)
+    try:
+        client = HttpClient(ssl_context=context)
+        url = "https://localhost:%d/macros/s/test/exec" % server.server_address[1]
+        first = client.post_json(url, payload(1)).json()
+        time.sleep(0.6)
+        second = client.post_json(url, payload(2)).json()
+        client.close()
+        return {"ok": bool(first["ok"] and second["ok"]), "connections": client.connections_opened}
+    finally:
+        server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTPS 연결 유지 클라이언트 단계별 시간 비교")
+    parser.add_argument("--uploads", type=int, default=20, help="업로드 횟수 (방식마다)")
+    parser.add_argument("--handshake-ms", type=int, default=0, help="새 연결마다 서버가 기다리는 시간 (ms)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 한 줄로 출력")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        server, cert = start(directory, handshake_ms=args.handshake_ms)
+        context = ssl.create_default_context(cafile=cert)
+        report = {"uploads": args.uploads, "handshake_ms": args.handshake_ms}
+        for mode in ("new_connection", "persistent"):
+            report[mode] = run(args, mode, server, context)
+        server.shutdown()
+        report["stale_connection"] = stale_connection(args, directory, context)
+    finally:
+        shutil.rmtree(directory)
+    report["speedup"] = round(report["new_connection"]["total_ms"] / max(report["persistent"]["total_ms"], 0.01), 1)
+
+    if args.json:
+        print(json.dumps(report))
+        return
+    print("업로드 %d회 (방식마다), 핸드셰이크 지연 %d ms" % (args.uploads, args.handshake_ms))
+    print("%16s %15s %12s" % ("", "new_connection", "persistent"))
+    for key in report["new_connection"]:
+        print("%16s %15s %12s" % (key, report["new_connection"][key], report["persistent"][key]))
+    print("연결이 끊긴 뒤 재연결:", report["stale_connection"])
+    print("업로드당 총 시간 %.1f배 감소" % report["speedup"])
+
+
+if __name__ == "__main__":
+    main()
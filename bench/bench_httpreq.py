@@ -0,0 +1,192 @@
+"""
+HTTP 요청 파서(lib/httpreq.py) 퍼징 및 속도 측정 (PC/리눅스에서 실행)
+
+1. 분할 검사: 정상 요청을 가능한 모든 위치에서 나눠 보내도 한 번에 보낸 것과 같은 결과인지 확인
+2. 퍼징: 무작위로 망가뜨린 요청을 넣어도 예외 없이 NEED_MORE / DONE / ERROR 중 하나로 끝나는지 확인
+3. 속도: 초당 해석 요청 수를 기존 방식(문자열 검색)과 비교
+
+사용 예:
+    python3 bench/bench_httpreq.py
+    python3 bench/bench_httpreq.py --fuzz 20000 --seed 1 --json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib"))
+
+import httpreq  # noqa: E402
+
+VALID_REQUESTS = [
+    b"GET /sensors HTTP/1.1\r\nHost: 192.168.0.10:8080\r\nAccept: */*\r\n\r\n",
+    b"GET / HTTP/1.0\r\n\r\n",
+    b"OPTIONS /alarm_threshold HTTP/1.1\r\nOrigin: null\r\n"
+    b"Access-Control-Request-Method: POST\r\n\r\n",
+    b'POST /sensor_type HTTP/1.1\r\ncontent-type: application/json\r\ncontent-length: 16\r\n\r\n{"type":"water"}',
+    b"POST /alarm_threshold HTTP/1.1\r\nHost: pico\r\nContent-Type: application/json\r\n"
+    b'CONTENT-LENGTH: 62\r\n\r\n{"temperature":30,"humidity":80,"light":500,"mic":1000000.0}  ',
+    b"GET /history?since=10&limit=20&fields=temperature HTTP/1.1\r\nConnection: keep-alive\r\n\r\n",
+]
+
+# 해석 결과 비교용
+def summary(parser):
+    r = parser.request
+    return (parser.state, parser.error, r.method, r.path, r.query, sorted(r.headers.items()), r.body)
+
+
+def parse_once(data, chunk_sizes=None):
+    parser = httpreq.RequestParser()
+    state = httpreq.NEED_MORE
+    pos = 0
+    while pos < len(data) and state == httpreq.NEED_MORE:
+        size = chunk_sizes.pop(0) if chunk_sizes else len(data) - pos
+        state = parser.feed(data[pos : pos + size])
+        pos += size
+    return parser
+
+
+def check_splits():
+    """모든 요청을 두 조각, 그리고 1바이트씩 나눠 보내도 결과가 같은지 확인"""
+    checked = 0
+    for data in VALID_REQUESTS:
+        expected = summary(parse_once(data))
+        assert expected[0] == httpreq.DONE, (data, expected)
+        for cut in range(1, len(data)):
+            got = summary(parse_once(data, [cut, len(data) - cut]))
+            assert got == expected, (data, cut, got, expected)
+            checked += 1
+        got = summary(parse_once(data, [1] * len(data)))
+        assert got == expected, (data, "bytewise")
+        checked += 1
+    return checked
+
+
+def check_pipelining():
+    """여러 요청을 이어 붙여 보내도 순서대로 하나씩 해석되는지 확인"""
+    parser = httpreq.RequestParser()
+    stream = b"".join(VALID_REQUESTS)
+    seen = []
+    state = parser.feed(stream[:700])
+    rest = stream[700:]
+    while True:
+        if state == httpreq.DONE:
+            seen.append(parser.request.path)
+            state = parser.next()
+            continue
+        assert state == httpreq.NEED_MORE, parser.error
+        if not rest:
+            break
+        state = parser.feed(rest[:100])
+        rest = rest[100:]
+    expected = [summary(parse_once(d))[3] for d in VALID_REQUESTS]
+    assert seen == expected, (seen, expected)
+    return len(seen)
+
+
+def mutate(rng, data):
+    data = bytearray(data)
+    for _ in range(rng.randint(1, 4)):
+        kind = rng.randint(0, 5)
+        pos = rng.randint(0, max(0, len(data) - 1))
+        if kind == 0 and data:
+            data[pos] = rng.randint(0, 255)
+        elif kind == 1:
+            data[pos:pos] = bytes(rng.randint(0, 255) for _ in range(rng.randint(1, 8)))
+        elif kind == 2:
+            del data[pos : pos + rng.randint(1, 8)]
+        elif kind == 3:
+            data[pos:pos] = rng.choice([b"\r\n", b":", b" ", b"\r\n\r\n", b"Content-Length: 99999\r\n"])
+        elif kind == 4:
+            data[pos:pos] = b"X" * rng.randint(500, 3000)
+        else:
+            data = data[: pos]
+    return bytes(data)
+
+
+def fuzz(count, seed):
+    """망가뜨린 요청에서 예외가 나지 않는지, 오류 코드가 알려진 값인지 확인"""
+    rng = random.Random(seed)
+    outcomes = {"done": 0, "need_more": 0, "error": 0}
+    for _ in range(count):
+        data = mutate(rng, rng.choice(VALID_REQUESTS))
+        sizes = []
+        remaining = len(data)
+        while remaining > 0:
+            size = rng.randint(1, 64)
+            sizes.append(size)
+            remaining -= size
+        parser = parse_once(data, sizes)
+        if parser.state == httpreq.DONE:
+            outcomes["done"] += 1
+            assert parser.request.path.startswith("/")
+            assert len(parser.request.body) == parser.request.content_length
+        elif parser.state == httpreq.ERROR:
+            outcomes["error"] += 1
+            assert parser.error in (400, 413, 414, 431, 501), parser.error
+        else:
+            outcomes["need_more"] += 1
+    return outcomes
+
+
+def legacy_route(request_raw):
+    """기존 start_server() 방식: 통째로 decode 후 문자열 검색"""
+    request = request_raw.decode("utf-8")
+    if "POST /alarm_threshold" in request:
+        start = request.find("Content-Length: ") + 16
+        end = request.find("\r\n", start)
+        length = int(request[start:end])
+        body_start = request.find("\r\n\r\n") + 4
+        return request[body_start : body_start + length]
+    return "GET /sensors" in request
+
+
+def bench(rounds):
+    data = VALID_REQUESTS[0]
+    post = VALID_REQUESTS[4].replace(b"CONTENT-LENGTH", b"Content-Length")
+    results = {}
+
+    parser = httpreq.RequestParser()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        parser.feed(data)
+        parser.next()
+        parser.feed(post)
+        parser.next()
+    results["parser_requests_per_s"] = round(2 * rounds / (time.perf_counter() - start))
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        legacy_route(data)
+        legacy_route(post)
+    results["legacy_requests_per_s"] = round(2 * rounds / (time.perf_counter() - start))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP 요청 파서 퍼징/속도 측정")
+    parser.add_argument("--fuzz", type=int, default=5000, help="퍼징 횟수")
+    parser.add_argument("--rounds", type=int, default=20000, help="속도 측정 반복 횟수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 한 줄로 출력")
+    args = parser.parse_args()
+
+    report = {
+        "split_cases": check_splits(),
+        "pipelined_requests": check_pipelining(),
+        "fuzz": fuzz(args.fuzz, args.seed),
+    }
+    report.update(bench(args.rounds))
+
+    if args.json:
+        print(json.dumps(report))
+    else:
+        for key, value in report.items():
+            print(f"{key:>22}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+/sensors 응답 형식 비교: JSON 과 이진 레코드(lib/sensorpack.py) (PC/리눅스에서 실행)
+
+1. 확인: 여러 측정값을 이진 레코드로 만들고 다시 풀었을 때 JSON 과 같은 값인지 확인
+2. 크기: 본문 바이트 수와 HTTP 헤더를 포함한 전송 바이트 수 (lib/httpresp.py 로 만든 응답)
+3. 속도: 측정값 하나를 응답 본문으로 만드는 시간
+   - json: 피코처럼 json.dumps 후 age_ms 를 붙임 (순번마다 새 측정값)
+   - bin: 순번마다 새로 채움 / bin_cached: 같은 순번을 다시 보낼 때 (age_ms 만 고침)
+
+피코에서의 시간은 PC 보다 수십~수백 배 길지만 두 방식의 비율을 보는 데 씁니다.
+
+사용 예:
+    python3 bench/bench_sensorpack.py
+    python3 bench/bench_sensorpack.py --samples 50000 --json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib"))
+
+import httpresp  # noqa: E402
+import sensorpack  # noqa: E402
+
+
+def sample(seq, rng):
+    """06_web_dashboard_WIFI.py 의 build_sensor_data() 결과와 같은 모양"""
+    data = {
+        "temperature": round(rng.uniform(15, 35), 1),
+        "humidity": round(rng.uniform(20, 90), 1),
+        "light": round(rng.uniform(0, 2000), 1),
+        "sensor_type": "mic" if seq % 2 else "water",
+        "timestamp": 1760000000 + seq,
+        "alarm": rng.random() < 0.1,
+    }
+    if data["sensor_type"] == "mic":
+        data["mic"] = rng.randrange(65535)
+        data["mic_rms"] = rng.randrange(23000)
+        data["mic_bands"] = [rng.randrange(23000) for _ in range(4)]
+        data["mic_level"] = rng.randrange(65535)
+    else:
+        data["water_distance"] = round(rng.uniform(0, 4), 2)
+        data["water_adc"] = rng.randrange(65535)
+    data["seq"] = seq
+    return data
+
+
+def json_body(data, age_ms):
+    text = json.dumps(data)
+    return text[:-1] + f', "age_ms": {age_ms}}}'
+
+
+JSON_ONLY = ("mic_rms", "mic_bands")  # 이진 레코드에 없는 JSON 항목 (비교에서 뺌)
+
+
+def check(samples):
+    packer = sensorpack.SensorPacker()
+    for data in samples + [{"error": "I2C timeout", "seq": 99}]:
+        decoded = sensorpack.unpack(packer.pack(data, 123))
+        expected = json.loads(json_body(data, 123))
+        if "error" in expected:
+            expected = {"seq": 99, "timestamp": 0, "age_ms": 123, "error": decoded.get("error")}
+        for name in JSON_ONLY:
+            expected.pop(name, None)
+        if decoded != expected:
+            raise AssertionError(f"mismatch:\n{expected}\n{decoded}")
+
+
+def wire_bytes(content_type, body):
+    writer = httpresp.ResponseWriter(1024, keep_alive=httpresp.keep_alive_lines(5, 100))
+    return sum(len(part) for part in writer.parts(200, content_type, body, keep_alive=True))
+
+
+def per_sample_us(func, samples, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for data in samples:
+            func(data)
+    return round((time.perf_counter() - start) / (repeat * len(samples)) * 1e6, 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/sensors JSON 과 이진 레코드 크기/속도 비교")
+    parser.add_argument("--samples", type=int, default=10000, help="측정값 개수")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 한 줄로 출력")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    samples = [sample(seq, rng) for seq in range(1, args.samples + 1)]
+    check(samples)
+
+    json_sizes = [len(json_body(data, 12).encode()) for data in samples]
+    json_body_bytes = sum(json_sizes) / len(json_sizes)
+    packer = sensorpack.SensorPacker()
+    report = {
+        "samples": args.samples,
+        "json_body_bytes": round(json_body_bytes, 1),
+        "bin_body_bytes": sensorpack.SIZE,
+        "json_wire_bytes": round(
+            sum(wire_bytes("application/json", json_body(data, 12)) for data in samples[:100]) / 100, 1
+        ),
+        "bin_wire_bytes": wire_bytes(sensorpack.CONTENT_TYPE, packer.pack(samples[0], 12)),
+        "json_encode_us": per_sample_us(lambda data: json_body(data, 12), samples, args.repeat),
+    }
+    packer = sensorpack.SensorPacker()
+    report["bin_encode_us"] = per_sample_us(lambda data: packer.pack(data, 12), samples, args.repeat)
+    latest = samples[-1]
+    report["bin_cached_encode_us"] = per_sample_us(lambda data: packer.pack(latest, 12), samples, args.repeat)
+    report["body_ratio"] = round(report["json_body_bytes"] / report["bin_body_bytes"], 1)
+    report["wire_ratio"] = round(report["json_wire_bytes"] / report["bin_wire_bytes"], 2)
+
+    if args.json:
+        print(json.dumps(report))
+    else:
+        for key, value in report.items():
+            print(f"{key:>22}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,474 @@
+"""
+웹 대시보드(06_web_dashboard_WIFI.py) 성능 측정 모음 (PC 에서는 가짜 하드웨어로, 피코에서는 실제 하드웨어로 실행)
+
+1. 센서: read_sensors() 와 센서별(AHT20, BH1750, 마이크, 수위) 읽기 시간, I2C 트랜잭션/바이트 수
+2. 알람: check_alarms() 한 번의 시간 (임계값 꺼짐 / 켜짐 / 알람 울림)
+3. HTTP: /sensors, /sensors?fmt=bin, /history, / 요청 해석 + 처리 + 응답 쓰기 시간, 초당 요청 수,
+   응답 크기, 요청 하나가 할당하는 힙 바이트
+4. OLED: display_text() + SSD1306.show() 한 번의 시간과 I2C 로 보낸 바이트 (바뀐 부분만 / 화면 전체)
+5. 마이크: read_mic_sensor() 의 초당 ADC 샘플 수, analyze_mic() (RMS + 대역 에너지) 시간
+6. 이벤트 루프 지연: 센서를 읽는 동안 다른 작업이 늦어지는 최대 시간 (read_sensors / read_sensors_async,
+   I2C 센서만 / 마이크 수집만 따로: 수집 방식이 "fifo" 면 마이크 수집 동안은 막힘)
+7. 성능 지표(lib/metrics.py) 비용: 시간 기록/카운터 한 번의 시간, 요청 하나에 붙는 기록 수와 추가 시간,
+   히스토그램 하나의 메모리, /metrics 응답 (HTTP 항목에 포함)
+
+결과는 JSON 으로 저장해 두고 --compare 로 다음 실행과 비교할 수 있습니다.
+PC 에서는 sim 패키지(가짜 I2C 버스, ADC, OLED)로 06 을 불러오고, 시간은 가상 시계(time.ticks_us)로 잽니다.
+가상 시계에는 I2C 전송 시간과 센서 변환 대기 시간이 들어가지만 CPU 시간은 PC 기준이므로,
+PC 결과는 실행 사이의 비교용이고 피코의 절대값은 피코에서 재야 합니다.
+힙 할당은 피코에서는 GC 를 끄고 gc.mem_alloc() 차이로, PC 에서는 tracemalloc 최고값으로 잽니다.
+네트워크를 거친 응답 시간은 bench/http_load.py 로 잽니다.
+
+사용 예:
+    python3 bench/bench_suite.py
+    python3 bench/bench_suite.py --json > before.json
+    python3 bench/bench_suite.py --compare before.json
+    (피코) 06_web_dashboard_WIFI.py 와 lib/ 를 올린 뒤:
+    mpremote run bench/bench_suite.py > pico.json
+"""
+
+import gc
+import json
+import sys
+import time
+
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
+
+ON_HOST = sys.implementation.name != "micropython"
+
+if ON_HOST:
+    import os
+
+    ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+    sys.path.insert(0, ROOT)
+    import sim  # noqa: E402
+
+    sim.install()  # machine/neopixel/... 를 가짜 모듈로 바꾸고 lib/ 를 import 경로에 추가
+
+import httpreq  # noqa: E402
+
+DASHBOARD = "06_web_dashboard_WIFI"
+
+REQUESTS = (
+    ("/sensors", b"GET /sensors HTTP/1.1\r\nHost: pico\r\nAccept: */*\r\n\r\n"),
+    ("/sensors?fmt=bin", b"GET /sensors?fmt=bin HTTP/1.1\r\nHost: pico\r\n\r\n"),
+    ("/history", b"GET /history?limit=120 HTTP/1.1\r\nHost: pico\r\n\r\n"),
+    ("/", b"GET / HTTP/1.1\r\nHost: pico\r\n\r\n"),
+    ("/metrics", b"GET /metrics HTTP/1.1\r\nHost: pico\r\n\r\n"),
+)
+
+# 서버 반복문이 요청마다 handle_request() 밖에서 더 남기는 기록 (해석 시간, 보내기 시간)
+SERVER_OBSERVATIONS = 2
+
+
+class _Module:
+    """runpy 결과(전역 변수 딕셔너리)를 모듈처럼 속성으로 다루기 위한 껍데기"""
+
+    def __init__(self, namespace):
+        self.__dict__ = namespace
+
+
+def load_dashboard():
+    """06 을 서버는 시작하지 않고 불러옴 (하드웨어 초기화와 설정 복원까지만 실행)"""
+    if not ON_HOST:
+        return __import__(DASHBOARD)
+    import contextlib
+    import io
+    import runpy
+    import tempfile
+
+    os.chdir(tempfile.mkdtemp(prefix="bench-fs-"))  # 측정 기록/설정 파일은 임시 폴더에
+    with contextlib.redirect_stdout(io.StringIO()):
+        namespace = runpy.run_path(os.path.join(ROOT, DASHBOARD + ".py"), run_name="dashboard")
+    # run_path() 는 전역 변수의 복사본을 돌려주므로, 함수들이 실제로 쓰는 딕셔너리를 사용
+    return _Module(namespace["handle_request"].__globals__)
+
+
+class CountingI2C:
+    """I2C 객체를 감싸 트랜잭션 수와 바이트 수를 셈 (드라이버의 i2c 속성을 바꿔 끼워 사용)"""
+
+    def __init__(self, i2c):
+        self.i2c = i2c
+        self.reset()
+
+    def reset(self):
+        self.transactions = 0
+        self.bytes = 0
+
+    def writeto(self, addr, buf, stop=True):
+        self.transactions += 1
+        self.bytes += len(buf)
+        return self.i2c.writeto(addr, buf, stop)
+
+    def writevto(self, addr, vector, stop=True):
+        self.transactions += 1
+        for buf in vector:
+            self.bytes += len(buf)
+        return self.i2c.writevto(addr, vector, stop)
+
+    def readfrom_into(self, addr, buf, stop=True):
+        self.transactions += 1
+        self.bytes += len(buf)
+        return self.i2c.readfrom_into(addr, buf, stop)
+
+    def readfrom(self, addr, nbytes, stop=True):
+        self.transactions += 1
+        self.bytes += nbytes
+        return self.i2c.readfrom(addr, nbytes, stop)
+
+
+class NullSocket:
+    """보낸 바이트 수만 세는 소켓 (응답 쓰기 시간에서 네트워크를 빼고 잼)"""
+
+    def __init__(self):
+        self.bytes = 0
+        self.writes = 0
+
+    def send(self, data):
+        self.bytes += len(data)
+        self.writes += 1
+        return len(data)
+
+
+def timed(function, rounds):
+    """function() 을 rounds 번 실행하고 {"mean_us", "max_us"} 반환"""
+    total = 0
+    worst = 0
+    for _ in range(rounds):
+        start = time.ticks_us()
+        function()
+        us = time.ticks_diff(time.ticks_us(), start)
+        total += us
+        if us > worst:
+            worst = us
+    return {"mean_us": total // rounds, "max_us": worst}
+
+
+def per_call_ns(function, rounds):
+    """function() 을 rounds 번 연달아 실행한 평균 시간 (ns, 1 µs 보다 짧은 동작용)"""
+    start = time.ticks_us()
+    for _ in range(rounds):
+        function()
+    return time.ticks_diff(time.ticks_us(), start) * 1000 // rounds
+
+
+def alloc_bytes(function):
+    """function() 한 번이 할당하는 힙 바이트"""
+    gc.collect()
+    if ON_HOST:
+        import tracemalloc
+
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return peak - before
+    gc.disable()  # GC 가 중간에 돌면 차이가 줄어 보이므로 끄고 잼
+    try:
+        before = gc.mem_alloc()
+        function()
+        return gc.mem_alloc() - before
+    finally:
+        gc.enable()
+
+
+def bench_sensors(app, rounds):
+    """read_sensors() 전체와 센서별 읽기 시간, 한 번에 쓰는 I2C 트랜잭션/바이트"""
+    aht_bus = CountingI2C(app.aht_sensor._i2c)
+    bh_bus = CountingI2C(app.bh_sensor._i2c)
+    app.aht_sensor._i2c = aht_bus
+    app.bh_sensor._i2c = bh_bus
+    try:
+        cases = (
+            ("aht20", lambda: app.aht_sensor.measure(), aht_bus),
+            ("bh1750", lambda: app.bh_sensor.measurement, bh_bus),
+            ("mic", app.read_mic_sensor, None),
+            ("water", app.read_water_sensor, None),
+            ("read_sensors", app.read_sensors, None),
+        )
+        result = {}
+        for name, function, bus in cases:
+            aht_bus.reset()
+            bh_bus.reset()
+            entry = timed(function, rounds)
+            if name == "read_sensors":
+                bus = aht_bus
+                bus.transactions += bh_bus.transactions
+                bus.bytes += bh_bus.bytes
+            if bus is not None:
+                entry["i2c_transactions"] = bus.transactions // rounds
+                entry["i2c_bytes"] = bus.bytes // rounds
+            result[name] = entry
+        result["read_sensors"]["alloc_bytes"] = alloc_bytes(app.read_sensors)
+    finally:
+        app.aht_sensor._i2c = aht_bus.i2c
+        app.bh_sensor._i2c = bh_bus.i2c
+    return result
+
+
+def bench_alarms(app, rounds):
+    """check_alarms() 한 번의 시간 (알람 출력 갱신 포함)"""
+    thresholds = app.alarm_thresholds
+    saved = dict(thresholds)
+    cases = (
+        ("disabled", app.HIGH_THRESHOLD),  # 모든 임계값 꺼짐 (기본값)
+        ("armed", 100000.0),  # 임계값은 켜져 있지만 넘지 않음
+        ("triggered", 0.0),  # 임계값을 넘어 부저/빨간 LED
+    )
+    result = {}
+    try:
+        for name, value in cases:
+            for key in thresholds:
+                thresholds[key] = value
+            result[name] = timed(lambda: app.check_alarms(22.5, 45.0, 320.0, 1200, 1.5), rounds)
+    finally:
+        thresholds.update(saved)
+        app.check_alarms(22.5, 45.0, 320.0, 1200, 1.5)
+    return result
+
+
+def bench_http(app, rounds):
+    """요청 해석 + handle_request() + 응답 쓰기 (반복문 서버와 같은 순서, 네트워크 제외)"""
+    parser = httpreq.RequestParser()
+    sock = NullSocket()
+
+    def serve(raw):
+        parser.feed(raw)
+        status, content_type, body = app.handle_request(parser.request)
+        if not isinstance(body, (str, bytes, bytearray)):
+            body = "".join(body)
+        app.responder.send(sock, status, content_type, body)
+        parser.reset()
+
+    result = {}
+    for path, raw in REQUESTS:
+        app.sample_sensors()  # 스냅샷이 오래되어 요청 안에서 센서를 읽는 일이 없도록
+        serve(raw)  # 처음 한 번은 캐시 준비
+        sock.bytes = 0
+        entry = timed(lambda: serve(raw), rounds)
+        entry["requests_per_s"] = 1000000 // max(entry["mean_us"], 1)
+        entry["response_bytes"] = sock.bytes // rounds
+        entry["alloc_bytes"] = alloc_bytes(lambda: serve(raw))
+        result[path] = entry
+    return result
+
+
+def bench_display(app, rounds):
+    """측정값 화면 한 번 갱신 (display_text() + SSD1306.show()) 의 시간과 I2C 전송량"""
+    oled = app.oled
+    if oled is None:
+        return None
+    bus = CountingI2C(oled.i2c)
+    oled.i2c = bus
+    data = dict(app.latest_snapshot[2])
+
+    def update(i, full):
+        # 마이크 값은 매번, 온도는 가끔 바뀌는 실제 화면과 비슷하게
+        data["mic"] = 300 + (i * 37) % 4000
+        if i % 5 == 0:
+            data["temperature"] = 22.0 + (i % 10) / 10
+        if full:
+            oled.invalidate()  # 다음 show() 가 화면 전체를 보냄
+        app.display_sensor_data(data)
+        app.screen.poll(force=True)
+
+    result = {}
+    try:
+        for name, full in (("update", False), ("full_refresh", True)):
+            counter = [0]
+
+            def step():
+                update(counter[0], full)
+                counter[0] += 1
+
+            step()
+            bus.reset()
+            entry = timed(step, rounds)
+            entry["i2c_transactions"] = bus.transactions // rounds
+            entry["i2c_bytes"] = bus.bytes // rounds
+            result[name] = entry
+    finally:
+        oled.i2c = bus.i2c
+    return result
+
+
+def bench_mic(app, rounds):
+    """read_mic_sensor() 의 시간과 초당 ADC 샘플 수, 분석 시간 (수집 방식별 비교는 bench/bench_adccap.py, 분석 함수별은 bench/bench_dsp.py)"""
+    capture = app.mic_capture
+    entry = timed(app.read_mic_sensor, rounds)
+    entry["engine"] = capture.engine
+    entry["samples_per_call"] = capture.size
+    entry["samples_per_s"] = capture.size * 1000000 // max(entry["mean_us"], 1)
+    entry["stats_us"] = timed(capture.stats, rounds)["mean_us"]
+    entry["analysis_us"] = timed(app.analyze_mic, rounds)["mean_us"]
+    return entry
+
+
+def bench_loop_latency(app, rounds, tick_ms=10):
+    """센서를 읽는 동안 tick_ms 마다 깨어나는 다른 작업이 늦어진 최대 시간 (ms)"""
+
+    async def ticker(state):
+        while state["run"]:
+            start = time.ticks_ms()
+            await asyncio.sleep(tick_ms / 1000)
+            late = time.ticks_diff(time.ticks_ms(), start) - tick_ms
+            if late > state["worst"]:
+                state["worst"] = late
+
+    async def blocking():
+        app.read_sensors()
+        await asyncio.sleep(0)
+
+    async def measure(read):
+        state = {"run": True, "worst": 0}
+        task = asyncio.create_task(ticker(state))
+        await asyncio.sleep(tick_ms / 1000)
+        for _ in range(rounds):
+            await read()
+        state["run"] = False
+        await task
+        return state["worst"]
+
+    async def i2c_async():
+        # I2C 센서 두 개만 (마이크 수집은 아래에 따로)
+        await asyncio.gather(app.aht_sensor.measure_async(), app.bh_sensor.measure_async())
+
+    return {
+        "read_sensors_max_late_ms": asyncio.run(measure(blocking)),
+        "read_sensors_async_max_late_ms": asyncio.run(measure(app.read_sensors_async)),
+        "i2c_async_max_late_ms": asyncio.run(measure(i2c_async)),
+        "mic_capture_async_max_late_ms": asyncio.run(measure(app.mic_capture.capture_async)),
+        "mic_engine": app.mic_capture.engine,
+    }
+
+
+def observations(registry):
+    """지금까지 남긴 기록 수 (히스토그램 관측 수 + 카운터 값의 합)"""
+    total = 0
+    for metric in registry.metrics:
+        if metric.kind == "histogram":
+            total += metric.count()
+        elif metric.kind == "counter":
+            total += sum(metric.values.values())
+    return total
+
+
+def bench_metrics(app, rounds, http):
+    """성능 지표를 남기는 비용과 /sensors 요청 하나에 더해지는 시간"""
+    import metrics
+
+    histogram = metrics.Histogram("bench_microseconds", "bench")
+    counter = metrics.Counter("bench_total", "bench", "path", ("/sensors",))
+    result = {
+        "since_ns": per_call_ns(lambda: histogram.since(time.ticks_us()), rounds),
+        "counter_inc_ns": per_call_ns(lambda: counter.inc("/sensors"), rounds),
+        "histogram_alloc_bytes": alloc_bytes(lambda: metrics.Histogram("bench_microseconds", "bench")),
+        "series": len(app.registry.metrics),
+    }
+    parser = httpreq.RequestParser()
+    parser.feed(REQUESTS[0][1])
+    app.sample_sensors()  # 요청 안에서 센서를 읽으면 센서 기록까지 세어짐
+    before = observations(app.registry)
+    app.handle_request(parser.request)
+    per_request = observations(app.registry) - before + SERVER_OBSERVATIONS
+    overhead_us = per_request * result["since_ns"] / 1000  # 카운터도 시간 기록만큼 걸린다고 보고 셈 (위쪽 어림)
+    result["observations_per_request"] = per_request
+    result["overhead_us_per_request"] = round(overhead_us, 1)
+    result["overhead_percent_of_sensors"] = round(100 * overhead_us / max(http["/sensors"]["mean_us"], 1), 1)
+    return result
+
+
+def run(rounds, sensor_rounds, history):
+    app = load_dashboard()
+    for _ in range(history):
+        app.sample_sensors()  # /history 응답에 기록이 차 있도록
+    http = bench_http(app, rounds)
+    return {
+        "platform": "cpython-sim" if ON_HOST else "micropython",
+        "version": sys.version.split()[0],
+        "sensors": bench_sensors(app, sensor_rounds),
+        "alarms": bench_alarms(app, rounds),
+        "http": http,
+        "display": bench_display(app, sensor_rounds),
+        "mic": bench_mic(app, sensor_rounds),
+        "loop_latency": bench_loop_latency(app, 5),
+        "metrics": bench_metrics(app, rounds, http),
+    }
+
+
+def flatten(report, prefix=""):
+    """{"a": {"b": 1}} -> {"a.b": 1} (숫자만)"""
+    items = {}
+    for key, value in report.items():
+        if isinstance(value, dict):
+            items.update(flatten(value, prefix + key + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            items[prefix + key] = value
+    return items
+
+
+def compare(old, new, threshold=0.1):
+    """두 결과에서 threshold(10%) 이상 달라진 항목을 출력 (한 번의 최대값인 max_* 는 흔들림이 커서 뺌)"""
+    before = flatten(old)
+    changed = 0
+    for key, value in flatten(new).items():
+        if key not in before or before[key] == value or key.rsplit(".", 1)[-1].startswith("max_"):
+            continue
+        base = before[key]
+        ratio = (value - base) / base if base else 1.0
+        if abs(ratio) >= threshold:
+            changed += 1
+            print(f"{key:>46}: {base} -> {value} ({ratio:+.0%})")
+    if not changed:
+        print(f"{threshold:.0%} 이상 달라진 항목 없음")
+
+
+def print_report(report):
+    for section, value in report.items():
+        if not isinstance(value, dict):
+            print(f"{section}: {value}")
+            continue
+        print(f"\n[{section}]")
+        for name, entry in value.items():
+            print(f"  {name:>32}: {json.dumps(entry)}")
+
+
+def main():
+    if not ON_HOST:
+        # 피코: 기본값으로 실행하고 결과를 JSON 한 줄로 출력 (시리얼로 받아 PC 에서 비교)
+        print(json.dumps(run(rounds=200, sensor_rounds=20, history=120)))
+        return
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="웹 대시보드 성능 측정 (가짜 하드웨어)")
+    parser.add_argument("--rounds", type=int, default=1000, help="알람/HTTP 측정 반복 횟수")
+    parser.add_argument("--sensor-rounds", type=int, default=50, help="센서/OLED/마이크 측정 반복 횟수")
+    parser.add_argument("--history", type=int, default=150, help="측정 전에 쌓아 둘 측정 기록 수")
+    parser.add_argument("--compare", metavar="JSON", help="이전 --json 결과 파일과 비교")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 한 줄로 출력")
+    args = parser.parse_args()
+
+    import contextlib
+    import io
+
+    with contextlib.redirect_stdout(io.StringIO()):  # 06 이 출력하는 메시지는 숨김
+        report = run(args.rounds, args.sensor_rounds, args.history)
+    report["sim"] = sim.stats()["clock"]
+
+    if args.json:
+        print(json.dumps(report))
+    else:
+        print_report(report)
+    if args.compare:
+        with open(args.compare) as f:
+            print(f"\n--- {args.compare} 와 비교 ---")
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
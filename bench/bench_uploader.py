@@ -0,0 +1,178 @@
+"""
+묶음 전송(lib/uploader.py)과 기존 방식(측정할 때마다 POST) 비교 (PC/리눅스에서 실행)
+
+bench/sheets_standin.py 서버를 띄우고, 5초마다 측정하는 피코를 가상 시계로 흉내 냅니다.
+중간에 서버를 --outage 초 동안 멈췄다가 되살려서
+1. POST 횟수 (피코에서는 POST 마다 DNS + TCP + TLS 연결 비용)
+2. 서버에 도착한 행 수와 잃어버린 측정값 수
+3. 서버가 되살아난 뒤 밀린 값을 모두 보내기까지 걸린 (가상) 시간
+4. 도착한 행의 시각 순서가 맞는지, 중복이 없는지
+를 확인합니다.
+
+사용 예:
+    python3 bench/bench_uploader.py
+    python3 bench/bench_uploader.py --samples 2000 --outage 3600 --json
+"""
+
+import argparse
+import http.client
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "lib"))
+sys.path.insert(0, HERE)
+
+from sheets_standin import SheetStandIn, make_server  # noqa: E402
+
+# 가상 시계: lib/uploader.py 가 쓰는 MicroPython time 함수를 PC 에서 대신함
+clock_ms = 0
+time.ticks_ms = lambda: clock_ms
+time.ticks_add = lambda a, b: a + b
+time.ticks_diff = lambda a, b: a - b
+
+from uploader import Uploader  # noqa: E402
+
+START_TIME = 1760000000
+
+
+def make_send(port, stats):
+    """05_send_data(pico).py 의 send_to_google() 과 같은 형식으로 보내고 확인 응답을 검사"""
+
+    def send(batch):
+        stats["batches"] += 1
+        records = [
+            {"timestamp": t, "temperature": round(temp, 2), "humidity": round(hum, 2)}
+            for t, temp, hum in batch
+        ]
+        body = json.dumps({"device": "bench", "batch": stats["batches"], "records": records}).encode()
+        stats["bytes"] += len(body)
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)  # 피코처럼 매번 새 연결
+        try:
+            conn.request("POST", "/", body, {"Content-Type": "application/json"})
+            response = conn.getresponse()
+            text = response.read()
+            if not 200 <= response.status < 300:
+                return False
+            ack = json.loads(text)
+            return ack.get("ok") and ack.get("batch") == stats["batches"]
+        finally:
+            conn.close()
+
+    return send
+
+
+def run(args, mode, directory):
+    global clock_ms
+    standin = SheetStandIn(fail_rate=args.fail_rate, seed=args.seed)
+    server = make_server(standin)
+    port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    stats = {"bytes": 0, "batches": 0}
+    send = make_send(port, stats)
+
+    if mode == "per_sample":
+        uploader = None
+    else:
+        uploader = Uploader(
+            send, "<ff",
+            batch_size=args.batch, batch_ms=args.batch * args.interval_ms, capacity=args.queue,
+            spool_prefix=os.path.join(directory, "spool") if mode == "batched_spool" else None,
+            spool_records=args.spool_records, spool_segments=4,
+        )
+
+    outage_start = args.samples // 3
+    outage_samples = args.outage * 1000 // args.interval_ms
+    lost = 0
+    recovered_at = None
+    drained_at = None
+    wall = time.perf_counter()
+    clock_ms = 0
+    n = 0
+    while n < args.samples or (uploader and uploader.backlog() and n < args.samples * 3):
+        standin.down = outage_start <= n < outage_start + outage_samples
+        if n == outage_start + outage_samples:
+            recovered_at = clock_ms
+        if n < args.samples:
+            sample = (START_TIME + n * args.interval_ms // 1000, 20 + n % 10 / 10, 50.0)
+            if uploader is None:
+                try:
+                    if not send([sample]):
+                        lost += 1
+                except OSError:
+                    lost += 1
+            else:
+                uploader.add(*sample)
+        if uploader is not None:
+            uploader.poll()
+            if recovered_at is not None and drained_at is None and uploader.backlog() < args.batch:
+                drained_at = clock_ms
+        n += 1
+        clock_ms += args.interval_ms
+    if uploader is not None:
+        # 남은 값은 시간 조건(batch_ms)으로 나감
+        clock_ms += args.batch * args.interval_ms
+        uploader.poll()
+        lost = uploader.dropped + uploader.backlog()
+    wall = time.perf_counter() - wall
+    server.shutdown()
+    server.server_close()
+
+    times = [row[0] for row in standin.rows]
+    report = {
+        "posts": standin.posts,
+        "failed_posts": standin.failed,
+        "rows": len(standin.rows),
+        "lost": lost,
+        "duplicates": len(times) - len(set(times)),
+        "in_order": times == sorted(times),
+        "bytes_sent": stats["bytes"],
+        "wall_s": round(wall, 2),
+    }
+    if uploader is not None:
+        report["spooled"] = uploader.spooled
+        report["drain_s"] = None if drained_at is None else (drained_at - recovered_at) / 1000
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="묶음 전송과 측정마다 전송 비교 (가상 시계)")
+    parser.add_argument("--samples", type=int, default=1000, help="측정 횟수")
+    parser.add_argument("--interval-ms", type=int, default=5000, help="측정 주기 (ms)")
+    parser.add_argument("--outage", type=int, default=1800, help="서버 중단 시간 (초)")
+    parser.add_argument("--fail-rate", type=float, default=0.02, help="평소 실패 비율")
+    parser.add_argument("--batch", type=int, default=12)
+    parser.add_argument("--queue", type=int, default=60, help="RAM 대기열 크기")
+    parser.add_argument("--spool-records", type=int, default=256, help="보관 파일 하나의 레코드 수 (파일 4개)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 한 줄로 출력")
+    args = parser.parse_args()
+
+    report = {"samples": args.samples, "outage_s": args.outage}
+    directory = tempfile.mkdtemp()
+    try:
+        for mode in ("per_sample", "batched_ram", "batched_spool"):
+            report[mode] = run(args, mode, directory)
+    finally:
+        shutil.rmtree(directory)
+
+    if args.json:
+        print(json.dumps(report))
+        return
+    print("측정 %d회, 서버 중단 %d초" % (args.samples, args.outage))
+    keys = ["posts", "failed_posts", "rows", "lost", "duplicates", "in_order", "bytes_sent", "spooled", "drain_s"]
+    print("%14s %12s %12s %14s" % ("", "per_sample", "batched_ram", "batched_spool"))
+    for key in keys:
+        print(
+            "%14s %12s %12s %14s"
+            % (key, *(report[mode].get(key, "-") for mode in ("per_sample", "batched_ram", "batched_spool")))
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+/*
+ * 구글 시트 받는 쪽(05_receive_data(google sheet).gs)을 PC 에서 실행하는 가짜 Apps Script 환경 (Node.js)
+ *
+ * SpreadsheetApp / LockService / PropertiesService / ContentService 를 흉내 내서 .gs 파일을 그대로 실행합니다.
+ * 1. 확인: 묶음/배열/객체 하나 형식, 다시 보낸 묶음 건너뛰기, 확인(ack) 응답
+ * 2. 동시 요청: 기록 도중에 다른 피코의 요청이 끼어드는 상황에서 잠금이 있을 때/없을 때 덮어쓴 행 수
+ * 3. 처리량: 예전 방식(행마다 appendRow)과 setValues 묶음 기록의 시트 API 호출 수와
+ *    호출당 --call-ms 로 계산한 예상 시간 (실제 Apps Script 는 API 호출 한 번이 수십 ms)
+ *
+ * 사용 예:
+ *     node bench/gs_mock.js
+ *     node bench/gs_mock.js --devices 5 --batches 40 --records 12 --call-ms 30 --json
+ */
+
+"use strict";
+
+const fs = require("fs");
+const path = require("path");
+const vm = require("vm");
+
+const GS_PATH = path.join(__dirname, "..", "05_receive_data(google sheet).gs");
+
+function parseArgs(argv) {
+  const args = { devices: 3, batches: 50, records: 12, callMs: 30, json: false };
+  for (let i = 0; i < argv.length; i++) {
+    const name = argv[i];
+    if (name === "--json") args.json = true;
+    else if (name === "--devices") args.devices = Number(argv[++i]);
+    else if (name === "--batches") args.batches = Number(argv[++i]);
+    else if (name === "--records") args.records = Number(argv[++i]);
+    else if (name === "--call-ms") args.callMs = Number(argv[++i]);
+    else throw new Error(`unknown option ${name}`);
+  }
+  return args;
+}
+
+// --- 가짜 Apps Script 서비스 ---
+class MockSheet {
+  constructor(calls) {
+    this.calls = calls;
+    this.cells = []; // 행 배열 (1행 = cells[0])
+    this.overwritten = 0;
+    this.onGetLastRow = null; // 동시 요청 흉내: getLastRow 직후 다른 요청을 끼워 넣음
+  }
+
+  getLastRow() {
+    this.calls.getLastRow++;
+    const last = this.cells.length;
+    if (this.onGetLastRow) this.onGetLastRow();
+    return last;
+  }
+
+  getRange(row, column, numRows, numColumns) {
+    this.calls.getRange++;
+    const sheet = this;
+    return {
+      setValues(values) {
+        sheet.calls.setValues++;
+        if (values.length !== numRows || values.some((r) => r.length !== numColumns)) {
+          throw new Error("The number of rows in the data does not match the number of rows in the range");
+        }
+        values.forEach((r, i) => {
+          if (sheet.cells[row - 1 + i] !== undefined) sheet.overwritten++;
+          sheet.cells[row - 1 + i] = r.slice();
+        });
+      },
+    };
+  }
+
+  appendRow(values) {
+    this.calls.appendRow++;
+    this.cells.push(values.slice());
+  }
+}
+
+class MockLock {
+  constructor(calls, enabled) {
+    this.calls = calls;
+    this.enabled = enabled;
+    this.held = false;
+    this.waiting = []; // 잠금을 기다리는 요청 (풀리면 차례로 실행)
+  }
+
+  waitLock() {
+    this.calls.lock++;
+    if (this.enabled && this.held) throw new Error("Lock timeout");
+    this.held = true;
+  }
+
+  releaseLock() {
+    this.held = false;
+    const waiting = this.waiting.splice(0);
+    waiting.forEach((run) => run());
+  }
+}
+
+function makeEnvironment({ lock = true } = {}) {
+  const calls = { getLastRow: 0, getRange: 0, setValues: 0, appendRow: 0, lock: 0, properties: 0, flush: 0 };
+  const sheet = new MockSheet(calls);
+  const scriptLock = new MockLock(calls, lock);
+  const properties = {};
+  const context = {
+    JSON,
+    Number,
+    String,
+    Object,
+    Array,
+    Date,
+    SpreadsheetApp: {
+      getActiveSpreadsheet: () => ({ getSheetByName: () => sheet }),
+      flush: () => calls.flush++,
+    },
+    LockService: { getScriptLock: () => scriptLock },
+    PropertiesService: {
+      getScriptProperties: () => ({
+        getProperty: (key) => {
+          calls.properties++;
+          return key in properties ? properties[key] : null;
+        },
+        setProperties: (values) => {
+          calls.properties++;
+          Object.assign(properties, values);
+        },
+      }),
+    },
+    ContentService: {
+      MimeType: { TEXT: "text/plain", JSON: "application/json" },
+      createTextOutput: (text) => ({
+        content: text,
+        setMimeType() {
+          return this;
+        },
+        getContent() {
+          return this.content;
+        },
+      }),
+    },
+  };
+  vm.createContext(context);
+  vm.runInContext(fs.readFileSync(GS_PATH, "utf8"), context, { filename: GS_PATH });
+  // 예전 방식 (행마다 appendRow, 잠금 없음) 비교용
+  vm.runInContext(
+    `function legacyDoPost(e) {
+       const sheet = SpreadsheetApp.getActiveSpreadsheet().getSheetByName(SHEET_NAME);
+       const data = JSON.parse(e.postData.contents);
+       (data.records || [data]).forEach(function (record) {
+         sheet.appendRow([new Date(record.timestamp * 1000), record.temperature, record.humidity, data.device]);
+       });
+       return ContentService.createTextOutput("OK");
+     }`,
+    context
+  );
+
+  function post(body, legacy = false) {
+    const e = { postData: { contents: JSON.stringify(body) } };
+    const output = (legacy ? context.legacyDoPost : context.doPost)(e);
+    return legacy ? output.getContent() : JSON.parse(output.getContent());
+  }
+  return { calls, sheet, scriptLock, properties, post };
+}
+
+function batchBody(device, batch, firstTimestamp, count) {
+  const records = [];
+  for (let i = 0; i < count; i++) {
+    records.push({ timestamp: firstTimestamp + i * 5, temperature: 20 + (i % 10) / 10, humidity: 50 });
+  }
+  return { device, batch, records };
+}
+
+function assert(condition, message) {
+  if (!condition) throw new Error(`check failed: ${message}`);
+}
+
+// --- 1. 확인 ---
+function checkFormats() {
+  const env = makeEnvironment();
+  let ack = env.post(batchBody("pico-a", 1, 1000, 3));
+  assert(ack.ok && ack.batch === 1 && ack.written === 3 && ack.skipped === 0, "batch written");
+  ack = env.post(batchBody("pico-a", 1, 1000, 3));
+  assert(ack.ok && ack.written === 0 && ack.skipped === 3, "resent batch skipped");
+  ack = env.post(batchBody("pico-a", 2, 1005, 4));
+  assert(ack.written === 2 && ack.skipped === 2, "overlapping batch partly skipped");
+  ack = env.post(batchBody("pico-b", 1, 1000, 2));
+  assert(ack.written === 2, "devices tracked separately");
+  ack = env.post([{ timestamp: 0, temperature: 1, humidity: 2, device: "old" }]);
+  assert(ack.ok && ack.batch === null && ack.written === 1, "plain array");
+  ack = env.post({ temperature: 1, humidity: 2, device: "old" });
+  assert(ack.ok && ack.written === 1, "single object without timestamp");
+  const bad = env.scriptLock;
+  bad.held = true; // 다른 요청이 잠금을 오래 잡고 있음
+  ack = env.post(batchBody("pico-a", 3, 2000, 1));
+  bad.held = false;
+  assert(!ack.ok && ack.batch === 3 && /Lock/.test(ack.error), "lock timeout reported, not acknowledged");
+  assert(env.sheet.cells.length === 9, "row count");
+  assert(env.sheet.cells[0][0].getTime() === 1000 * 1000, "device timestamp used");
+  return true;
+}
+
+// --- 2. 동시 요청 ---
+function concurrent(withLock) {
+  const env = makeEnvironment({ lock: withLock });
+  let pending = null;
+  env.sheet.onGetLastRow = () => {
+    // 첫 요청이 마지막 행을 읽은 직후 두 번째 피코의 요청이 도착
+    if (!pending) return;
+    const run = pending;
+    pending = null;
+    if (withLock && env.scriptLock.held) env.scriptLock.waiting.push(run);
+    else run();
+  };
+  if (!withLock) {
+    env.scriptLock.waitLock = () => {};
+    env.scriptLock.releaseLock = () => {};
+  }
+  pending = () => env.post(batchBody("pico-b", 1, 5000, 12));
+  env.post(batchBody("pico-a", 1, 1000, 12));
+  return { rows: env.sheet.cells.length, overwritten: env.sheet.overwritten };
+}
+
+// --- 3. 처리량 ---
+function throughput(args, legacy) {
+  const env = makeEnvironment();
+  const start = process.hrtime.bigint();
+  let acked = 0;
+  for (let b = 1; b <= args.batches; b++) {
+    for (let d = 0; d < args.devices; d++) {
+      const body = batchBody(`pico-${d}`, b, 1000 + (b - 1) * args.records * 5, args.records);
+      const result = env.post(body, legacy);
+      if (legacy || result.ok) acked++;
+    }
+  }
+  const elapsedMs = Number(process.hrtime.bigint() - start) / 1e6;
+  const records = args.devices * args.batches * args.records;
+  const sheetCalls = env.calls.appendRow + env.calls.setValues + env.calls.getRange + env.calls.getLastRow;
+  return {
+    records,
+    acked_posts: acked,
+    rows: env.sheet.cells.length,
+    sheet_calls: sheetCalls,
+    calls_per_record: Math.round((sheetCalls / records) * 1000) / 1000,
+    modelled_s: Math.round((sheetCalls * args.callMs) / 10) / 100,
+    mock_records_per_s: Math.round(records / (elapsedMs / 1000)),
+  };
+}
+
+function main() {
+  const args = parseArgs(process.argv.slice(2));
+  const report = {
+    formats_ok: checkFormats(),
+    concurrent_with_lock: concurrent(true),
+    concurrent_without_lock: concurrent(false),
+    append_row: throughput(args, true),
+    set_values: throughput(args, false),
+  };
+  report.modelled_speedup = Math.round((report.append_row.modelled_s / report.set_values.modelled_s) * 10) / 10;
+  if (args.json) {
+    console.log(JSON.stringify(report));
+    return;
+  }
+  for (const [key, value] of Object.entries(report)) {
+    console.log(`${key.padStart(24)}: ${typeof value === "object" ? JSON.stringify(value) : value}`);
+  }
+}
+
+main();
@@ -0,0 +1,225 @@
+"""
+피코 웹 서버 부하 테스트 (PC/리눅스에서 실행)
+
+여러 클라이언트가 동시에 요청을 보낼 때 초당 처리 요청 수와 응답 시간을 측정합니다.
+06_web_dashboard_WIFI.py 의 SERVER_MODE 를 "loop" / "async" 로 바꿔 가며
+같은 옵션으로 실행하면 두 서버 방식을 비교할 수 있습니다.
+
+--keep-alive 를 주면 클라이언트마다 연결 하나를 유지하며 요청을 보냅니다.
+--compare 를 주면 연결을 매번 새로 여는 경우와 연결을 유지하는 경우를 차례로 측정해
+연결 수립(TCP 연결) 비용을 비교합니다.
+
+사용 예:
+    python3 bench/http_load.py 192.168.1.105 --concurrency 4 --duration 10
+    python3 bench/http_load.py 192.168.1.105 --path / --json
+    python3 bench/http_load.py 192.168.1.105 --compare --duration 5
+"""
+
+import argparse
+import json
+import socket
+import threading
+import time
+
+
+def one_request(host, port, path, timeout):
+    """요청 하나를 보내고 (성공 여부, 응답 시간 초, 연결 수립 시간 초) 를 반환합니다."""
+    start = time.perf_counter()
+    s = socket.create_connection((host, port), timeout=timeout)
+    connected = time.perf_counter()
+    try:
+        s.sendall(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode())
+        data = b""
+        while True:
+            chunk = s.recv(4096)
+            if not chunk:
+                break
+            data += chunk
+    finally:
+        s.close()
+    ok = data.startswith(b"HTTP/1.1 200")
+    return ok, time.perf_counter() - start, connected - start
+
+
+class KeepAliveClient:
+    """연결 하나를 유지하며 요청을 보내는 클라이언트 (서버가 닫으면 다시 연결)"""
+
+    def __init__(self, host, port, timeout):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.sock = None
+        self.pending = b""
+        self.connections = 0
+        self.connect_time = 0.0
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+        self.pending = b""
+
+    def _recv(self):
+        chunk = self.sock.recv(4096)
+        if not chunk:
+            raise ConnectionError("connection closed by server")
+        self.pending += chunk
+
+    def request(self, path):
+        """요청 하나를 보내고 (성공 여부, 응답 시간 초, 연결 수립 시간 초) 를 반환합니다."""
+        start = time.perf_counter()
+        connect = 0.0
+        if self.sock is None:
+            self.sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+            connect = time.perf_counter() - start
+            self.connections += 1
+            self.connect_time += connect
+        try:
+            self.sock.sendall(f"GET {path} HTTP/1.1\r\nHost: {self.host}\r\n\r\n".encode())
+            while b"\r\n\r\n" not in self.pending:
+                self._recv()
+            head, _, self.pending = self.pending.partition(b"\r\n\r\n")
+            length = 0
+            close = False
+            for line in head.split(b"\r\n")[1:]:
+                name, _, value = line.partition(b":")
+                name = name.strip().lower()
+                if name == b"content-length":
+                    length = int(value)
+                elif name == b"connection" and b"close" in value.lower():
+                    close = True
+            while len(self.pending) < length:
+                self._recv()
+            self.pending = self.pending[length:]
+        except OSError:
+            self.close()
+            raise
+        if close:
+            self.close()
+        ok = head.startswith(b"HTTP/1.1 200")
+        return ok, time.perf_counter() - start, connect
+
+
+def worker(args, deadline, results, lock):
+    latencies = []
+    errors = 0
+    connections = 0
+    connect_time = 0.0
+    client = KeepAliveClient(args.host, args.port, args.timeout) if args.keep_alive else None
+    while time.perf_counter() < deadline:
+        try:
+            if client is None:
+                ok, latency, connect = one_request(args.host, args.port, args.path, args.timeout)
+                connections += 1
+                connect_time += connect
+            else:
+                ok, latency, connect = client.request(args.path)
+            if ok:
+                latencies.append(latency)
+            else:
+                errors += 1
+        except OSError:
+            errors += 1
+    if client is not None:
+        client.close()
+        connections = client.connections
+        connect_time = client.connect_time
+    with lock:
+        results["latencies"].extend(latencies)
+        results["errors"] += errors
+        results["connections"] += connections
+        results["connect_time"] += connect_time
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def run(args):
+    results = {"latencies": [], "errors": 0, "connections": 0, "connect_time": 0.0}
+    lock = threading.Lock()
+    start = time.perf_counter()
+    deadline = start + args.duration
+    threads = [
+        threading.Thread(target=worker, args=(args, deadline, results, lock))
+        for _ in range(args.concurrency)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    lat = results["latencies"]
+    connections = results["connections"]
+    return {
+        "host": args.host,
+        "path": args.path,
+        "keep_alive": args.keep_alive,
+        "concurrency": args.concurrency,
+        "duration_s": round(elapsed, 2),
+        "requests_ok": len(lat),
+        "errors": results["errors"],
+        "requests_per_s": round(len(lat) / elapsed, 2),
+        "latency_ms_p50": round(percentile(lat, 0.50) * 1000, 1),
+        "latency_ms_p95": round(percentile(lat, 0.95) * 1000, 1),
+        "latency_ms_max": round(max(lat) * 1000, 1) if lat else 0.0,
+        # 연결 수립 비용: 연 연결 수, 연결 하나를 여는 평균 시간, 요청 하나당 평균 연결 시간
+        "connections": connections,
+        "connect_ms_avg": round(results["connect_time"] / connections * 1000, 2) if connections else 0.0,
+        "connect_ms_per_request": round(results["connect_time"] / len(lat) * 1000, 3) if lat else 0.0,
+    }
+
+
+def print_report(report):
+    for key, value in report.items():
+        print(f"{key:>22}: {value}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="피코 웹 서버 동시 요청 부하 테스트")
+    parser.add_argument("host", help="피코 IP 주소 (OLED에 표시된 값)")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--path", default="/sensors")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 클라이언트 수")
+    parser.add_argument("--duration", type=float, default=10.0, help="측정 시간 (초)")
+    parser.add_argument("--timeout", type=float, default=2.0, help="요청 타임아웃 (초, 대시보드와 동일한 2초)")
+    parser.add_argument("--keep-alive", action="store_true", help="클라이언트마다 연결을 유지하며 요청")
+    parser.add_argument("--compare", action="store_true", help="연결 유지 없음/있음을 차례로 측정해 비교")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 한 줄로 출력")
+    args = parser.parse_args()
+
+    if not args.compare:
+        report = run(args)
+        if args.json:
+            print(json.dumps(report))
+        else:
+            print_report(report)
+        return
+
+    args.keep_alive = False
+    close_report = run(args)
+    args.keep_alive = True
+    keep_report = run(args)
+    report = {
+        "close": close_report,
+        "keep_alive": keep_report,
+        "speedup": round(keep_report["requests_per_s"] / close_report["requests_per_s"], 2)
+        if close_report["requests_per_s"]
+        else 0.0,
+    }
+    if args.json:
+        print(json.dumps(report))
+    else:
+        print("[Connection: close]")
+        print_report(close_report)
+        print("[keep-alive]")
+        print_report(keep_report)
+        print(f"{'speedup':>22}: {report['speedup']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+구글 시트 웹훅(05_receive_data(google sheet).gs) 대신 쓰는 PC용 HTTP 서버
+
+POST 로 받은 JSON 을 Apps Script 와 같은 규칙으로 행으로 저장하고 확인(ack) JSON 으로 답합니다.
+    {"device", "batch", "records": [...]} 묶음, 객체 배열, 객체 하나를 모두 받음
+    장치마다 마지막으로 기록한 timestamp 이하인 측정값은 건너뜀 (다시 보낸 묶음)
+    응답: {"ok": true, "batch": 번호, "written": n, "skipped": n}
+고장 상황을 흉내 낼 수 있습니다:
+    --fail-rate   이 비율의 요청에 503 응답
+    --latency-ms  응답 전에 기다리는 시간 (TLS/구글 쪽 처리 시간 대신)
+    --down        처음부터 중단 상태 (GET /up, /down 으로 바꿈)
+GET / 는 지금까지 받은 요청/행 수를 JSON 으로 알려 줍니다.
+
+사용 예 (피코의 WEBHOOK_URL 을 http://<PC IP>:8090/ 로 바꾸고):
+    python3 bench/sheets_standin.py --port 8090 --csv rows.csv
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class SheetStandIn:
+    """Rows received so far plus the failure settings (shared by all handler threads)"""
+
+    def __init__(self, fail_rate=0.0, latency_ms=0, down=False, csv_path=None, seed=None):
+        self.fail_rate = fail_rate
+        self.latency_ms = latency_ms
+        self.down = down
+        self.csv_path = csv_path
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.rows = []
+        self.last_written = {}  # 장치 -> 마지막으로 기록한 timestamp
+        self.posts = 0
+        self.failed = 0
+        self.bytes_received = 0
+
+    def receive(self, body):
+        """Return (status, text) for one POST body"""
+        with self.lock:
+            self.posts += 1
+            self.bytes_received += len(body)
+            if self.down or self.random.random() < self.fail_rate:
+                self.failed += 1
+                return 503, "Service Unavailable"
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        batch = None
+        try:
+            data = json.loads(body)
+            if isinstance(data, list):
+                device, records = None, data
+            elif isinstance(data, dict) and isinstance(data.get("records"), list):
+                device, batch, records = data.get("device"), data.get("batch"), data["records"]
+            else:
+                device, records = None, [data]
+            with self.lock:
+                written, skipped = self._write(device, records)
+        except (ValueError, AttributeError, TypeError) as e:
+            # Apps Script 도 오류를 200 으로 돌려줌
+            return 200, json.dumps({"ok": False, "batch": batch, "error": str(e)})
+        return 200, json.dumps({"ok": True, "batch": batch, "written": written, "skipped": skipped})
+
+    def _write(self, device, records):
+        now = time.time()
+        rows = []
+        skipped = 0
+        for r in records:
+            name = r.get("device") or device or ""
+            timestamp = r.get("timestamp") or 0
+            if timestamp and timestamp <= self.last_written.get(name, 0):
+                skipped += 1
+                continue
+            if timestamp:
+                self.last_written[name] = timestamp
+            rows.append([timestamp or now, r.get("temperature"), r.get("humidity"), name])
+        self.rows.extend(rows)
+        if self.csv_path and rows:
+            with open(self.csv_path, "a") as f:
+                for row in rows:
+                    f.write(",".join(str(v) for v in row) + "\n")
+        return len(rows), skipped
+
+    def summary(self):
+        with self.lock:
+            return {"posts": self.posts, "failed": self.failed, "rows": len(self.rows), "down": self.down}
+
+
+def make_server(standin, host="127.0.0.1", port=0):
+    """Return a ThreadingHTTPServer serving standin (port 0 picks a free port)"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _reply(self, status, text, content_type="text/plain"):
+            body = text.encode()
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            status, text = standin.receive(body)
+            self._reply(status, text, "application/json" if status == 200 else "text/plain")
+
+        def do_GET(self):
+            if self.path in ("/up", "/down"):
+                standin.down = self.path == "/down"
+            self._reply(200, json.dumps(standin.summary()), "application/json")
+
+        def log_message(self, format, *args):
+            pass
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="구글 시트 웹훅 대신 쓰는 HTTP 서버")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="503 으로 답할 요청 비율 (0~1)")
+    parser.add_argument("--latency-ms", type=int, default=0, help="응답 지연 (ms)")
+    parser.add_argument("--down", action="store_true", help="중단 상태로 시작")
+    parser.add_argument("--csv", help="받은 행을 이 파일에 덧붙임")
+    args = parser.parse_args()
+
+    standin = SheetStandIn(args.fail_rate, args.latency_ms, args.down, args.csv)
+    server = make_server(standin, args.host, args.port)
+    print("웹훅 대신 서버: http://%s:%d/" % server.server_address)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print(json.dumps(standin.summary()))
+
+
+if __name__ == "__main__":
+    main()
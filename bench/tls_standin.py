@@ -0,0 +1,184 @@
+"""
+Apps Script 웹훅을 흉내 내는 PC용 HTTPS 서버 (lib/httpclient.py 시험용)
+
+실제 구글처럼
+    POST /macros/s/<id>/exec  -> 302, Location: https://<다른 호스트>/macros/echo?key=N
+    GET  /macros/echo?key=N   -> 200, chunked 로 확인(ack) JSON
+으로 답합니다. 받은 묶음은 sheets_standin.SheetStandIn 과 같은 규칙으로 처리합니다.
+리디렉션 대상 호스트는 기본으로 127.0.0.1 (요청은 localhost 로 보내면 호스트가 두 개가 됨).
+인증서는 실행할 때 openssl 명령으로 만든 자체 서명 인증서를 씁니다 (localhost, 127.0.0.1).
+
+    --handshake-ms  새 연결마다 TLS 핸드셰이크 전에 기다리는 시간 (피코의 느린 핸드셰이크 대신)
+    --idle-close    연결 유지 중 이 시간(초) 동안 요청이 없으면 서버가 연결을 닫음
+
+사용 예:
+    python3 bench/tls_standin.py --port 8443 --redirect-host <PC IP>
+    (인증서 파일 경로가 출력됨, PC 클라이언트는 이 파일을 CA 로 사용, 피코는 인증서를 검사하지 않음)
+    피코의 WEBHOOK_URL 을 https://<PC IP>:8443/macros/s/test/exec 로 바꿔서 시험
+"""
+
+import argparse
+import json
+import os
+import socket
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sheets_standin import SheetStandIn  # noqa: E402
+
+
+def make_certificate(directory):
+    """Create a self-signed certificate for localhost/127.0.0.1; returns (cert, key) paths"""
+    cert = os.path.join(directory, "cert.pem")
+    key = os.path.join(directory, "key.pem")
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+            "-keyout", key, "-out", cert, "-subj", "/CN=localhost",
+            "-addext", "subjectAltName=DNS:localhost,IP:127.0.0.1",
+        ],
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return cert, key
+
+
+class TlsStandIn(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, cert, key, redirect_host="127.0.0.1", handshake_ms=0, idle_close=30.0, sheet=None):
+        self.context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        self.context.load_cert_chain(cert, key)
+        self.redirect_host = redirect_host
+        self.handshake_ms = handshake_ms
+        self.idle_close = idle_close
+        self.sheet = sheet or SheetStandIn()
+        self.lock = threading.Lock()
+        self.handshakes = 0
+        self.requests = 0
+        self.pending = {}  # echo key -> ack JSON
+        self.next_key = 0
+        super().__init__(address, Handler)
+
+    def get_request(self):
+        sock, address = super().get_request()
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)  # 구글 서버처럼 작은 응답도 바로 보냄
+        # 핸드셰이크는 처리 스레드에서 첫 읽기 때 (느린 클라이언트가 accept 를 막지 않도록)
+        return self.context.wrap_socket(sock, server_side=True, do_handshake_on_connect=False), address
+
+    def stats(self):
+        with self.lock:
+            return {"handshakes": self.handshakes, "requests": self.requests}
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        server = self.server
+        if server.handshake_ms:
+            time.sleep(server.handshake_ms / 1000)
+        self.request.settimeout(server.idle_close)
+        self.request.do_handshake()
+        with server.lock:
+            server.handshakes += 1
+        super().setup()
+
+    def _count(self):
+        with self.server.lock:
+            self.server.requests += 1
+
+    def do_POST(self):
+        self._count()
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if not self.path.startswith("/macros/s/"):
+            return self._reply(404, b"Not Found")
+        status, text = self.server.sheet.receive(body)
+        with self.server.lock:
+            self.server.next_key += 1
+            key = self.server.next_key
+            self.server.pending[key] = (status, text)
+        port = self.server.server_address[1]
+        html = b"<HTML><HEAD><TITLE>Moved Temporarily</TITLE></HEAD></HTML>"
+        self.send_response(302)
+        self.send_header("Location", "https://%s:%d/macros/echo?key=%d" % (self.server.redirect_host, port, key))
+        self.send_header("Content-Type", "text/html; charset=UTF-8")
+        self.send_header("Content-Length", str(len(html)))
+        self.end_headers()
+        self.wfile.write(html)
+
+    def do_GET(self):
+        self._count()
+        parts = urlsplit(self.path)
+        if parts.path != "/macros/echo":
+            return self._reply(200, json.dumps(self.server.sheet.summary()).encode())
+        key = int(parse_qs(parts.query).get("key", ["0"])[0])
+        with self.server.lock:
+            status, text = self.server.pending.pop(key, (404, "unknown key"))
+        if status != 200:
+            return self._reply(status, text.encode())
+        # 구글처럼 chunked 로 응답
+        data = text.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        half = len(data) // 2
+        for piece in (data[:half], data[half:]):
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(piece), piece))
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _reply(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start(directory, port=0, host="127.0.0.1", **options):
+    """Start a stand-in in a background thread; returns (server, cert path)"""
+    cert, key = make_certificate(directory)
+    server = TlsStandIn((host, port), cert, key, **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, cert
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apps Script 웹훅을 흉내 내는 HTTPS 서버")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8443)
+    parser.add_argument("--redirect-host", default="127.0.0.1")
+    parser.add_argument("--handshake-ms", type=int, default=0)
+    parser.add_argument("--idle-close", type=float, default=30.0)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    server, cert = start(
+        directory, args.port, args.host,
+        redirect_host=args.redirect_host, handshake_ms=args.handshake_ms, idle_close=args.idle_close,
+    )
+    print("HTTPS 웹훅 대신 서버: https://localhost:%d/macros/s/test/exec" % args.port)
+    print("CA 인증서:", cert)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    print(json.dumps(server.stats()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+피코 웹소켓(/ws) 부하 테스트 (PC/리눅스에서 실행)
+
+여러 웹소켓 클라이언트를 동시에 연결해 두고
+1. 피코가 밀어 주는 측정값 프레임 수
+2. {"ping": ...} 메시지를 보내고 {"pong": ...} 답장을 받기까지의 왕복 시간 (에코)
+3. 임계값 변경 메시지의 확인(ack) 왕복 시간
+을 측정합니다. 연결 수 제한(MAX_CONNECTIONS)을 넘은 클라이언트는 rejected 로 셉니다.
+
+사용 예:
+    python3 bench/ws_load.py 192.168.1.105 --clients 3 --duration 10
+    python3 bench/ws_load.py 127.0.0.1 --clients 50 --ping-interval 0.05 --json
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import struct
+import time
+
+GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+def client_frame(opcode, payload):
+    """클라이언트 프레임 (마스크 필수)"""
+    mask = os.urandom(4)
+    length = len(payload)
+    if length < 126:
+        head = struct.pack("!BB", 0x80 | opcode, 0x80 | length)
+    elif length < 0x10000:
+        head = struct.pack("!BBH", 0x80 | opcode, 0x80 | 126, length)
+    else:
+        head = struct.pack("!BBQ", 0x80 | opcode, 0x80 | 127, length)
+    masked = bytes(b ^ mask[i & 3] for i, b in enumerate(payload))
+    return head + mask + masked
+
+
+async def read_frame(reader):
+    head = await reader.readexactly(2)
+    opcode = head[0] & 0x0F
+    length = head[1] & 0x7F
+    if length == 126:
+        (length,) = struct.unpack("!H", await reader.readexactly(2))
+    elif length == 127:
+        (length,) = struct.unpack("!Q", await reader.readexactly(8))
+    return opcode, await reader.readexactly(length)
+
+
+async def handshake(host, port, timeout):
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    key = base64.b64encode(os.urandom(16))
+    writer.write(
+        b"GET /ws HTTP/1.1\r\nHost: " + host.encode() + b"\r\n"
+        b"Upgrade: websocket\r\nConnection: Upgrade\r\n"
+        b"Sec-WebSocket-Key: " + key + b"\r\nSec-WebSocket-Version: 13\r\n\r\n"
+    )
+    await writer.drain()
+    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout)
+    if not head.startswith(b"HTTP/1.1 101"):
+        writer.close()
+        return None, None, head.split(b"\r\n", 1)[0].decode()
+    expected = base64.b64encode(hashlib.sha1(key + GUID).digest())
+    if b"Sec-WebSocket-Accept: " + expected not in head:
+        writer.close()
+        raise ValueError("bad Sec-WebSocket-Accept")
+    return reader, writer, None
+
+
+async def client(args, stats, deadline):
+    try:
+        reader, writer, refused = await handshake(args.host, args.port, args.timeout)
+    except (OSError, asyncio.TimeoutError, ValueError, asyncio.IncompleteReadError):
+        stats["errors"] += 1
+        return
+    if reader is None:
+        stats["rejected"] += 1
+        return
+    stats["connected"] += 1
+
+    sent = {}  # ping 번호 -> 보낸 시각
+    acks = {}
+
+    async def receive():
+        while True:
+            opcode, payload = await read_frame(reader)
+            if opcode == 0x8:
+                return
+            if opcode != 0x1:
+                continue
+            message = json.loads(payload)
+            now = time.perf_counter()
+            if "pong" in message:
+                start = sent.pop(message["pong"], None)
+                if start is not None:
+                    stats["rtt"].append(now - start)
+            elif message.get("ack") == "thresholds":
+                start = acks.pop("thresholds", None)
+                if start is not None:
+                    stats["ack_rtt"].append(now - start)
+            elif "seq" in message:
+                stats["readings"] += 1
+
+    receiver = asyncio.create_task(receive())
+    count = 0
+    try:
+        while time.perf_counter() < deadline and not receiver.done():
+            count += 1
+            sent[count] = time.perf_counter()
+            writer.write(client_frame(0x1, json.dumps({"ping": count}).encode()))
+            if args.thresholds and count % 10 == 0:
+                acks["thresholds"] = time.perf_counter()
+                message = {"thresholds": {"temperature": 1000000.0}}
+                writer.write(client_frame(0x1, json.dumps(message).encode()))
+            await writer.drain()
+            await asyncio.sleep(args.ping_interval)
+        stats["lost_pings"] += len(sent)
+        writer.write(client_frame(0x8, struct.pack("!H", 1000)))
+        await writer.drain()
+        await asyncio.wait_for(receiver, args.timeout)
+    except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+        stats["errors"] += 1
+    finally:
+        receiver.cancel()
+        writer.close()
+
+
+def percentile_ms(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(len(values) * p))] * 1000, 2)
+
+
+async def run(args):
+    stats = {
+        "connected": 0,
+        "rejected": 0,
+        "errors": 0,
+        "readings": 0,
+        "lost_pings": 0,
+        "rtt": [],
+        "ack_rtt": [],
+    }
+    start = time.perf_counter()
+    deadline = start + args.duration
+    await asyncio.gather(*(client(args, stats, deadline) for _ in range(args.clients)))
+    elapsed = time.perf_counter() - start
+    rtt = stats.pop("rtt")
+    ack_rtt = stats.pop("ack_rtt")
+    report = {"host": args.host, "clients": args.clients, "duration_s": round(elapsed, 2)}
+    report.update(stats)
+    report.update(
+        {
+            "pings_per_s": round(len(rtt) / elapsed, 1),
+            "rtt_ms_p50": percentile_ms(rtt, 0.50),
+            "rtt_ms_p95": percentile_ms(rtt, 0.95),
+            "rtt_ms_max": percentile_ms(rtt, 1.0),
+            "ack_ms_p50": percentile_ms(ack_rtt, 0.50),
+            "ack_ms_p95": percentile_ms(ack_rtt, 0.95),
+        }
+    )
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="피코 웹소켓 동시 연결 부하 테스트")
+    parser.add_argument("host", help="피코 IP 주소 (OLED에 표시된 값)")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--clients", type=int, default=3, help="동시 웹소켓 연결 수")
+    parser.add_argument("--duration", type=float, default=10.0, help="측정 시간 (초)")
+    parser.add_argument("--ping-interval", type=float, default=0.2, help="클라이언트마다 ping 을 보내는 간격 (초)")
+    parser.add_argument("--thresholds", action="store_true", help="ping 10번마다 임계값 변경 메시지도 보냄")
+    parser.add_argument("--timeout", type=float, default=2.0, help="연결/종료 타임아웃 (초)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 한 줄로 출력")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report))
+    else:
+        for key, value in report.items():
+            print(f"{key:>12}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""
+고정 속도 ADC 수집 라이브러리 (RP2040 ADC FIFO + DMA, 미리 잡은 array('H') 버퍼, 한 번에 계산하는 통계)
+"""
+
+import math
+import sys
+from array import array
+
+import utime
+from micropython import const
+
+try:
+    import rp2
+    from machine import mem32
+except ImportError:
+    rp2 = None
+
+NATIVE = sys.implementation.name == "micropython"
+
+# RP2040 ADC 레지스터 (데이터시트 4.9.6), 주소는 small int 범위를 넘어서 const 로 만들지 않음
+_CS = 0x4004C000
+_FCS = 0x4004C008
+_FIFO = 0x4004C00C
+_DIV = 0x4004C010
+_CS_START_MANY = const(0x08)
+_CS_AINSEL_MASK = const(0x7000)
+_CS_RROBIN_MASK = const(0x1F0000)
+_FCS_EN = const(0x01)
+_FCS_DREQ_EN = const(0x08)
+_FCS_EMPTY = const(0x100)
+_FCS_UNDER_OVER = const(0xC00)  # 쓰기로 지우는 오류 표시
+_FCS_THRESH_1 = const(0x1000000)
+_DREQ_ADC = const(36)
+_ADC_CLOCK = const(48000000)
+_MIN_DIVIDER = const(96)  # 변환 하나에 96 클록 = 최대 500 kS/s
+
+ADC_PINS = (26, 27, 28, 29)
+MIDSCALE = const(2048)  # 12비트 값의 가운데
+MIN_DB = -100.0  # 소리가 전혀 없을 때의 dB 값
+_CHUNK = const(256)  # 제곱합이 32비트 부호 있는 정수를 넘지 않는 최대 샘플 수 (2048² x 256 = 2³⁰)
+
+if NATIVE:
+    import micropython
+
+    @micropython.viper
+    def _scan(buf, start: int, stop: int, acc) -> int:
+        # acc = [최솟값, 최댓값, 합계] 를 갱신하고, 가운데(2048)에서 벗어난 값의 제곱합을 반환
+        src = ptr16(buf)
+        out = ptr32(acc)
+        low = out[0]
+        high = out[1]
+        total = out[2]
+        squares = 0
+        i = start
+        while i < stop:
+            x = src[i] & 0xFFF  # DMA 로 받은 값은 15번 비트에 변환 오류 표시가 있을 수 있음
+            if x < low:
+                low = x
+            if x > high:
+                high = x
+            total += x
+            d = x - 2048
+            squares += d * d
+            i += 1
+        out[0] = low
+        out[1] = high
+        out[2] = total
+        return squares
+
+    @micropython.viper
+    def _drain_fifo(buf, count: int, fcs_address: int, fifo_address: int):
+        # ADC 가 정한 속도로 FIFO 에 넣는 값을 count 개 꺼냄 (DMA 가 없는 펌웨어용)
+        fcs = ptr32(fcs_address)
+        fifo = ptr32(fifo_address)
+        out = ptr16(buf)
+        i = 0
+        while i < count:
+            if fcs[0] & _FCS_EMPTY:
+                continue
+            out[i] = fifo[0] & 0xFFF
+            i += 1
+
+else:
+
+    def _scan(buf, start, stop, acc):
+        low, high, total = acc[0], acc[1], acc[2]
+        squares = 0
+        for i in range(start, stop):
+            x = buf[i] & 0xFFF
+            if x < low:
+                low = x
+            if x > high:
+                high = x
+            total += x
+            squares += (x - MIDSCALE) * (x - MIDSCALE)
+        acc[0], acc[1], acc[2] = low, high, total
+        return squares
+
+
+class Capture:
+    """Samples one ADC input at a fixed rate into a preallocated array('H').
+
+    Samples are 12-bit (0..4095). Three engines, chosen at construction:
+      "dma"  -- RP2040 free-running ADC paced by its clock divider, FIFO
+                drained by DMA; capture_async() lets other tasks run meanwhile
+      "fifo" -- same pacing, FIFO drained by a viper loop (firmware without rp2.DMA);
+                blocks for the whole capture, also in capture_async()
+      "loop" -- read_u16() paced with ticks_us/sleep_us (other ports, the PC simulator);
+                capture_async() yields to other tasks between samples
+    stats() then returns (peak_to_peak, rms, db) in one pass over the buffer;
+    peak_to_peak and rms use read_u16() units (0..65535) so existing thresholds
+    still apply, rms has the DC level removed and db is relative to full scale.
+    """
+
+    def __init__(self, adc, pin, size=256, rate=16000, engine=None):
+        if pin not in ADC_PINS:
+            raise ValueError("pin %d has no ADC input" % pin)
+        self.adc = adc
+        self.channel = pin - ADC_PINS[0]
+        self.buf = array("H", bytes(2 * size))
+        self.size = size
+        self._acc = array("i", (0, 0, 0))
+        self._dma = None
+        if engine is None:
+            if rp2 is None:
+                engine = "loop"
+            else:
+                engine = "dma" if hasattr(rp2, "DMA") else "fifo"
+        self.engine = engine
+        self.set_rate(rate)
+
+    def set_rate(self, rate):
+        """Set the sample rate in Hz (the RP2040 divider gives 48 MHz / 96 .. 48 MHz / 65536)"""
+        divider = _ADC_CLOCK * 256 // rate  # 1/256 클록 단위
+        divider = min(max(divider, _MIN_DIVIDER * 256), 0xFFFF00)
+        self._div = divider - 256  # DIV 레지스터는 (주기 - 1) 을 INT.FRAC 로 저장
+        self.rate = _ADC_CLOCK * 256 // divider
+
+    def duration_ms(self):
+        """Time one capture takes"""
+        return (self.size * 1000 + self.rate - 1) // self.rate
+
+    # --- ADC FIFO 설정 (dma / fifo) ---
+    def _start_adc(self, dreq):
+        mem32[_CS] &= ~_CS_START_MANY
+        mem32[_DIV] = self._div
+        mem32[_FCS] = _FCS_EN | _FCS_THRESH_1 | _FCS_UNDER_OVER | (_FCS_DREQ_EN if dreq else 0)
+        while not mem32[_FCS] & _FCS_EMPTY:  # 남아 있던 값 버리기
+            mem32[_FIFO]
+        mem32[_CS] = (mem32[_CS] & ~(_CS_AINSEL_MASK | _CS_RROBIN_MASK)) | (self.channel << 12)
+
+    def _stop_adc(self):
+        mem32[_CS] &= ~_CS_START_MANY
+        while not mem32[_FCS] & _FCS_EMPTY:
+            mem32[_FIFO]
+        mem32[_FCS] = _FCS_UNDER_OVER  # FIFO 끄기: 다른 곳의 read_u16() 가 그대로 동작
+        mem32[_DIV] = 0
+
+    def start(self):
+        """Begin a capture in the background ("dma" engine; other engines capture now)"""
+        if self.engine != "dma":
+            self.capture()
+            return
+        if self._dma is None:
+            self._dma = rp2.DMA()
+        self._start_adc(True)
+        ctrl = self._dma.pack_ctrl(size=1, inc_read=False, inc_write=True, treq_sel=_DREQ_ADC)
+        self._dma.config(read=_FIFO, write=self.buf, count=self.size, ctrl=ctrl, trigger=True)
+        mem32[_CS] |= _CS_START_MANY
+
+    def done(self):
+        """True once the buffer is full (and the ADC is back to single conversions)"""
+        if self.engine != "dma" or self._dma is None:
+            return True
+        if self._dma.active():
+            return False
+        self._stop_adc()
+        self._dma.close()
+        self._dma = None
+        return True
+
+    def capture(self):
+        """Fill the buffer and return it"""
+        if self.engine == "dma":
+            self.start()
+            utime.sleep_ms(self.duration_ms())
+            while not self.done():
+                pass
+        elif self.engine == "fifo":
+            self._start_adc(False)
+            mem32[_CS] |= _CS_START_MANY
+            _drain_fifo(self.buf, self.size, _FCS, _FIFO)
+            self._stop_adc()
+        else:
+            self._capture_loop()
+        return self.buf
+
+    async def capture_async(self, poll_ms=1):
+        """Like capture(), but lets other tasks run during the capture ("dma", "loop")"""
+        try:
+            import asyncio
+        except ImportError:
+            import uasyncio as asyncio
+
+        if self.engine == "loop":
+            await self._capture_loop_async(asyncio)
+            return self.buf
+        self.start()
+        if self.engine == "dma":
+            await asyncio.sleep(self.duration_ms() / 1000)
+            while not self.done():
+                await asyncio.sleep(poll_ms / 1000)
+        return self.buf
+
+    def _capture_loop(self):
+        buf = self.buf
+        read = self.adc.read_u16
+        rate = self.rate
+        ticks_us = utime.ticks_us
+        ticks_diff = utime.ticks_diff
+        start = ticks_us()
+        for i in range(self.size):
+            buf[i] = read() >> 4
+            # 다음 샘플 시각은 시작 시각에서 계산 (주기가 정수 µs 가 아니어도 오차가 쌓이지 않음)
+            wait = ticks_diff(utime.ticks_add(start, (i + 1) * 1000000 // rate), ticks_us())
+            if wait > 0:
+                utime.sleep_us(wait)
+
+    async def _capture_loop_async(self, asyncio):
+        # _capture_loop() 과 같은 시각에 읽되, 샘플 사이를 기다리는 동안 다른 작업에 양보
+        # (다른 작업이 샘플 간격보다 오래 걸리면 그 샘플은 늦게 읽힘)
+        buf = self.buf
+        read = self.adc.read_u16
+        rate = self.rate
+        ticks_us = utime.ticks_us
+        ticks_diff = utime.ticks_diff
+        start = ticks_us()
+        for i in range(self.size):
+            buf[i] = read() >> 4
+            deadline = utime.ticks_add(start, (i + 1) * 1000000 // rate)
+            while ticks_diff(deadline, ticks_us()) > 0:
+                await asyncio.sleep(0)
+
+    def stats(self, count=None):
+        """Return (peak_to_peak, rms, db) of the first count samples (default: all)"""
+        count = self.size if count is None else count
+        acc = self._acc
+        acc[0] = 4095
+        acc[1] = 0
+        acc[2] = 0
+        squares = 0
+        for start in range(0, count, _CHUNK):
+            squares += _scan(self.buf, start, min(start + _CHUNK, count), acc)
+        offset = acc[2] / count - MIDSCALE  # 가운데에서 벗어난 평균 (DC)
+        variance = squares / count - offset * offset
+        rms = math.sqrt(variance) if variance > 0 else 0.0
+        db = 20 * math.log10(rms / MIDSCALE) if rms > 0 else MIN_DB
+        return (acc[1] - acc[0]) << 4, rms * 16, db
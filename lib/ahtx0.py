@@ -15,8 +15,11 @@ class AHT10:
     AHTX0_CMD_SOFTRESET = const(0xBA)  # Soft reset command
     AHTX0_STATUS_BUSY = const(0x80)  # Status bit for busy
     AHTX0_STATUS_CALIBRATED = const(0x08)  # Status bit for calibrated
+    AHTX0_MEASUREMENT_TIME_MS = const(80)  # Typical conversion time, no need to poll earlier
 
-    def __init__(self, i2c, address=AHTX0_I2CADDR_DEFAULT):
+    def __init__(self, i2c, address=AHTX0_I2CADDR_DEFAULT, cache_ms=0):
+        """cache_ms -- if non-zero, the temperature/relative_humidity properties reuse
+        the last conversion while it is younger than this many milliseconds"""
         utime.sleep_ms(20)  # 20ms delay to wake up
         self._i2c = i2c
         self._address = address
@@ -26,6 +29,10 @@ class AHT10:
             raise RuntimeError("Could not initialize")
         self._temp = None
         self._humidity = None
+        self._measured_at = None
+        self._started_at = utime.ticks_ms()
+        self._result_ready = False
+        self.cache_ms = cache_ms
 
     def reset(self):
         """Perform a soft-reset of the AHT"""
@@ -53,21 +60,82 @@ class AHT10:
     @property
     def relative_humidity(self):
         """The measured relative humidity in percent."""
-        self._perform_measurement()
-        self._humidity = (
-            (self._buf[1] << 12) | (self._buf[2] << 4) | (self._buf[3] >> 4)
-        )
-        self._humidity = (self._humidity * 100) / 0x100000
+        self._refresh()
         return self._humidity
 
     @property
     def temperature(self):
         """The measured temperature in degrees Celcius."""
-        self._perform_measurement()
-        self._temp = ((self._buf[3] & 0xF) << 16) | (self._buf[4] << 8) | self._buf[5]
-        self._temp = ((self._temp * 200.0) / 0x100000) - 50
+        self._refresh()
         return self._temp
 
+    def measure(self):
+        """Trigger a single conversion and return (temperature, relative_humidity).
+        Both values are decoded from the same 6-byte reading."""
+        self.start_measurement()
+        utime.sleep_ms(self.AHTX0_MEASUREMENT_TIME_MS)
+        return self.read_result()
+
+    read_both = measure
+
+    def start_measurement(self):
+        """Trigger a conversion and return immediately. Poll is_ready(), then call read_result()."""
+        self._trigger_measurement()
+        self._started_at = utime.ticks_ms()
+        self._result_ready = False
+
+    def is_ready(self):
+        """True once the conversion started by start_measurement() has finished.
+        The bus is not touched before the typical conversion time has passed."""
+        if self._result_ready:
+            return True
+        if utime.ticks_diff(utime.ticks_ms(), self._started_at) < self.AHTX0_MEASUREMENT_TIME_MS:
+            return False
+        # The status read returns the whole 6-byte reading, so keep it for read_result()
+        self._read_to_buffer()
+        self._result_ready = not self._buf[0] & self.AHTX0_STATUS_BUSY
+        return self._result_ready
+
+    def read_result(self):
+        """Return (temperature, relative_humidity) of the last conversion.
+        Blocks until it has finished if is_ready() has not returned True yet."""
+        while not self.is_ready():
+            utime.sleep_ms(5)
+        self._decode_buffer()
+        return self._temp, self._humidity
+
+    async def measure_async(self, poll_ms=5):
+        """Like measure(), but awaits the conversion so other tasks keep running."""
+        try:
+            import asyncio
+        except ImportError:
+            import uasyncio as asyncio
+
+        self.start_measurement()
+        await asyncio.sleep(self.AHTX0_MEASUREMENT_TIME_MS / 1000)
+        while not self.is_ready():
+            await asyncio.sleep(poll_ms / 1000)
+        return self.read_result()
+
+    def _refresh(self):
+        """Measure again unless the cached conversion is younger than cache_ms"""
+        if (
+            self.cache_ms
+            and self._measured_at is not None
+            and utime.ticks_diff(utime.ticks_ms(), self._measured_at) < self.cache_ms
+        ):
+            return
+        self.measure()
+
+    def _decode_buffer(self):
+        """Convert the raw reading in the buffer to temperature and humidity"""
+        buf = self._buf
+        humidity = (buf[1] << 12) | (buf[2] << 4) | (buf[3] >> 4)
+        self._humidity = (humidity * 100) / 0x100000
+        temp = ((buf[3] & 0xF) << 16) | (buf[4] << 8) | buf[5]
+        self._temp = ((temp * 200.0) / 0x100000) - 50
+        self._measured_at = utime.ticks_ms()
+
     def _read_to_buffer(self):
         """Read sensor data to buffer"""
         self._i2c.readfrom_into(self._address, self._buf)
@@ -84,12 +152,6 @@ class AHT10:
         while self.status & self.AHTX0_STATUS_BUSY:
             utime.sleep_ms(5)
 
-    def _perform_measurement(self):
-        """Trigger measurement and write result to buffer"""
-        self._trigger_measurement()
-        self._wait_for_idle()
-        self._read_to_buffer()
-
 
 class AHT20(AHT10):
     AHTX0_CMD_INITIALIZE = 0xBE  # Calibration command
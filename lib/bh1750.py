@@ -5,7 +5,7 @@ BH1750 조도 센서 라이브러
 import math
 
 from micropython import const
-from utime import sleep_ms
+from utime import sleep_ms, ticks_diff, ticks_ms
 
 
 class BH1750:
@@ -25,12 +25,25 @@ class BH1750:
     MEASUREMENT_TIME_MIN = const(31)
     MEASUREMENT_TIME_MAX = const(254)
 
+    # Maximum conversion time in ms at MEASUREMENT_TIME_DEFAULT, indexed by resolution.
+    # It scales linearly with the measurement time (MTreg).
+    CONVERSION_TIME_MS = (180, 180, 24)
+
+    # Auto-ranging keeps the raw count between these limits by adjusting MTreg
+    AUTO_RANGE_LOW = const(1000)
+    AUTO_RANGE_HIGH = const(50000)
+    AUTO_RANGE_TARGET = const(20000)
+
     def __init__(self, address, i2c):
         self._address = address
         self._i2c = i2c
         self._measurement_mode = BH1750.MEASUREMENT_MODE_ONE_TIME
         self._resolution = BH1750.RESOLUTION_HIGH
         self._measurement_time = BH1750.MEASUREMENT_TIME_DEFAULT
+        self._started_at = ticks_ms()
+        self._settle_ms = 0
+        self._last_lux = None
+        self.auto_range = False
 
         self._write_measurement_time()
         self._write_measurement_mode()
@@ -59,11 +72,26 @@ class BH1750:
         self._write_measurement_time()
         self._write_measurement_mode()
 
+    def start_continuous(
+        self,
+        resolution: int = RESOLUTION_HIGH,
+        measurement_time: int = MEASUREMENT_TIME_DEFAULT,
+        auto_range: bool = False,
+    ):
+        """Configures the sensor once for continuous measurement. Afterwards every read of
+        measurement is a single 2-byte read of the latest conversion, without any sleep.
+
+        Keyword arguments:
+        auto_range -- adjust the measurement time for dim or bright scenes while reading
+        """
+        self.auto_range = auto_range
+        self.configure(BH1750.MEASUREMENT_MODE_CONTINUOUSLY, resolution, measurement_time)
+
     def _write_measurement_time(self):
         buffer = bytearray(1)
 
         high_bit = 1 << 6 | self._measurement_time >> 5
-        low_bit = 3 << 5 | (self._measurement_time << 3) >> 3
+        low_bit = 3 << 5 | (self._measurement_time & 0x1F)
 
         buffer[0] = high_bit
         self._i2c.writeto(self._address, buffer)
@@ -72,11 +100,23 @@ class BH1750:
         self._i2c.writeto(self._address, buffer)
 
     def _write_measurement_mode(self):
+        self._send_measurement_mode()
+        sleep_ms(self._conversion_time_ms())
+
+    def _send_measurement_mode(self):
         buffer = bytearray(1)
 
         buffer[0] = self._measurement_mode << 4 | self._resolution
         self._i2c.writeto(self._address, buffer)
-        sleep_ms(24 if self._measurement_time == BH1750.RESOLUTION_LOW else 180)
+        self._started_at = ticks_ms()
+        self._settle_ms = self._conversion_time_ms()
+
+    def _conversion_time_ms(self) -> int:
+        return math.ceil(
+            BH1750.CONVERSION_TIME_MS[self._resolution]
+            * self._measurement_time
+            / BH1750.MEASUREMENT_TIME_DEFAULT
+        )
 
     def reset(self):
         """Clear the illuminance data register."""
@@ -90,22 +130,85 @@ class BH1750:
         """Powers off the BH1750."""
         self._i2c.writeto(self._address, bytearray(b"\x00"))
 
+    def start_measurement(self):
+        """Starts a conversion and returns immediately. Poll is_ready(), then call read_result().
+        In continuous mode the sensor is already converting, so nothing is sent."""
+        if self._measurement_mode == BH1750.MEASUREMENT_MODE_ONE_TIME:
+            self._send_measurement_mode()
+
+    def is_ready(self) -> bool:
+        """Returns True once the conversion time of the last started measurement has passed."""
+        return ticks_diff(ticks_ms(), self._started_at) >= self._settle_ms
+
+    def read_result(self) -> float:
+        """Returns the result of the last conversion, waiting for it to finish if needed.
+        In continuous mode the previous result is returned instead of waiting (only
+        after an auto-range change, until the first conversion with the new MTreg is done)."""
+        remaining = self._settle_ms - ticks_diff(ticks_ms(), self._started_at)
+        if remaining > 0:
+            if self._keeps_last_result():
+                return self._last_lux
+            sleep_ms(remaining)
+        return self._read_lux()
+
+    async def measure_async(self) -> float:
+        """Like measurement, but awaits the conversion so other tasks keep running."""
+        try:
+            import asyncio
+        except ImportError:
+            import uasyncio as asyncio
+
+        self.start_measurement()
+        remaining = self._settle_ms - ticks_diff(ticks_ms(), self._started_at)
+        if remaining > 0:
+            if self._keeps_last_result():
+                return self._last_lux
+            await asyncio.sleep(remaining / 1000)
+        return self._read_lux()
+
     @property
     def measurement(self) -> float:
         """Returns the latest measurement."""
-        if self._measurement_mode == BH1750.MEASUREMENT_MODE_ONE_TIME:
-            self._write_measurement_mode()
+        self.start_measurement()
+        return self.read_result()
 
+    def _read_lux(self) -> float:
         buffer = bytearray(2)
         self._i2c.readfrom_into(self._address, buffer)
-        lux = (buffer[0] << 8 | buffer[1]) / (
-            1.2 * (BH1750.MEASUREMENT_TIME_DEFAULT / self._measurement_time)
-        )
+        count = buffer[0] << 8 | buffer[1]
 
+        # A longer measurement time raises the count for the same light level
+        lux = count / (1.2 * (self._measurement_time / BH1750.MEASUREMENT_TIME_DEFAULT))
         if self._resolution == BH1750.RESOLUTION_HIGH_2:
-            return lux / 2
-        else:
-            return lux
+            lux /= 2
+        self._last_lux = lux
+
+        if self.auto_range:
+            self._adjust_range(count)
+        return lux
+
+    def _keeps_last_result(self) -> bool:
+        # Continuous conversions only restart after an auto-range change (see _adjust_range)
+        return self._measurement_mode == BH1750.MEASUREMENT_MODE_CONTINUOUSLY and self._last_lux is not None
+
+    def _adjust_range(self, count: int):
+        """Moves MTreg so the next conversions land near AUTO_RANGE_TARGET counts."""
+        if BH1750.AUTO_RANGE_LOW <= count <= BH1750.AUTO_RANGE_HIGH:
+            return
+        measurement_time = self._measurement_time * BH1750.AUTO_RANGE_TARGET // max(count, 1)
+        measurement_time = min(
+            max(measurement_time, BH1750.MEASUREMENT_TIME_MIN), BH1750.MEASUREMENT_TIME_MAX
+        )
+        if measurement_time == self._measurement_time:
+            return
+
+        self._measurement_time = measurement_time
+        self._write_measurement_time()
+        # The sensor switches to the new MTreg at some conversion boundary we cannot see,
+        # so restart the conversion: the first result after its conversion time is new-scale.
+        # In one-time mode the next start_measurement() does that anyway.
+        if self._measurement_mode == BH1750.MEASUREMENT_MODE_CONTINUOUSLY:
+            self._send_measurement_mode()
 
     def measurements(self) -> float:
         """This is a generator function that continues to provide the latest measurement. Because the measurement time
@@ -121,13 +224,4 @@ class BH1750:
             yield self.measurement
 
             if self._measurement_mode == BH1750.MEASUREMENT_MODE_CONTINUOUSLY:
-                base_measurement_time = (
-                    16 if self._measurement_time == BH1750.RESOLUTION_LOW else 120
-                )
-                sleep_ms(
-                    math.ceil(
-                        base_measurement_time
-                        * self._measurement_time
-                        / BH1750.MEASUREMENT_TIME_DEFAULT
-                    )
-                )
+                sleep_ms(self._conversion_time_ms())
@@ -0,0 +1,203 @@
+"""
+플래시 저장용 이진 로그 라이브러리 (고정 크기 레코드, 모아서 쓰기, 파일 나누기, CRC 검사)
+"""
+
+import os
+import struct
+import time
+
+try:
+    from binascii import crc32
+except ImportError:  # 펌웨어에 binascii.crc32 가 없는 경우
+    _crc_table = None
+
+    def crc32(data, crc=0):
+        global _crc_table
+        if _crc_table is None:
+            _crc_table = []
+            for n in range(256):
+                c = n
+                for _ in range(8):
+                    c = (c >> 1) ^ 0xEDB88320 if c & 1 else c >> 1
+                _crc_table.append(c)
+        crc ^= 0xFFFFFFFF
+        for byte in data:
+            crc = _crc_table[(crc ^ byte) & 0xFF] ^ (crc >> 8)
+        return crc ^ 0xFFFFFFFF
+
+
+MAGIC = b"BLG1"
+HEADER = "<4sHH"  # magic, record size, reserved
+HEADER_SIZE = struct.calcsize(HEADER)
+CRC = "<I"
+CRC_SIZE = 4
+
+
+class BinLog:
+    """Append-only log of fixed-size records kept in rotating segment files.
+
+    Each record is struct fmt followed by a CRC32 of the packed values. Appended
+    records are packed into a preallocated buffer and written to flash in one
+    write when buffer_records are waiting (or after flush_ms, see poll()), which
+    keeps the number of small LittleFS writes down. A segment holds at most
+    segment_records records; when a new one is started the oldest segments beyond
+    max_segments are deleted, so the log never grows past a fixed size.
+
+    records() replays everything still stored (oldest first), skipping records
+    whose CRC does not match and a partial record left by a power cut.
+    """
+
+    def __init__(self, prefix, fmt, segment_records=1024, max_segments=4, buffer_records=16, flush_ms=None):
+        self.prefix = prefix
+        self.fmt = fmt
+        self.payload = struct.calcsize(fmt)
+        self.size = self.payload + CRC_SIZE
+        self.segment_records = segment_records
+        self.max_segments = max_segments
+        self.buffer_records = buffer_records
+        self.flush_ms = flush_ms
+        self.buf = bytearray(self.size * buffer_records)
+        self.mv = memoryview(self.buf)
+        self.pending = 0
+        self._pending_since = 0
+        self.bytes_written = 0
+        self.writes = 0
+        self.corrupt = 0
+
+        self._segments = self._find_segments()
+        self._used = 0  # records in the newest segment
+        if self._segments:
+            path = self._path(self._segments[-1])
+            stored = os.stat(path)[6] - HEADER_SIZE
+            if stored < 0 or stored % self.size or not self._header_ok(path):
+                self._new_segment()  # damaged tail: never append after a partial record
+            else:
+                self._used = stored // self.size
+
+    # --- files ---
+    def _path(self, number):
+        return "%s.%d" % (self.prefix, number)
+
+    def _find_segments(self):
+        slash = self.prefix.rfind("/")
+        directory = self.prefix[:slash] if slash > 0 else ("/" if slash == 0 else "")
+        base = self.prefix[slash + 1 :] + "."
+        numbers = []
+        for name in os.listdir(directory) if directory else os.listdir():
+            if name.startswith(base) and name[len(base) :].isdigit():
+                numbers.append(int(name[len(base) :]))
+        numbers.sort()
+        return numbers
+
+    def _header_ok(self, path):
+        with open(path, "rb") as f:
+            header = f.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE:
+            return False
+        magic, size, _ = struct.unpack(HEADER, header)
+        return magic == MAGIC and size == self.size
+
+    def _new_segment(self):
+        number = self._segments[-1] + 1 if self._segments else 0
+        with open(self._path(number), "wb") as f:
+            f.write(struct.pack(HEADER, MAGIC, self.size, 0))
+        self.bytes_written += HEADER_SIZE
+        self.writes += 1
+        self._segments.append(number)
+        self._used = 0
+        while len(self._segments) > self.max_segments:
+            os.remove(self._path(self._segments.pop(0)))
+
+    def segment_paths(self):
+        return [self._path(number) for number in self._segments]
+
+    def capacity(self):
+        """Maximum number of records kept on flash"""
+        return self.segment_records * self.max_segments
+
+    # --- writing ---
+    def append(self, *values):
+        """Add one record (values in fmt order); it reaches flash at the next flush"""
+        offset = self.pending * self.size
+        struct.pack_into(self.fmt, self.buf, offset, *values)
+        end = offset + self.payload
+        struct.pack_into(CRC, self.buf, end, crc32(self.mv[offset:end]) & 0xFFFFFFFF)
+        if self.pending == 0 and self.flush_ms is not None:
+            self._pending_since = time.ticks_ms()
+        self.pending += 1
+        if self.pending == self.buffer_records:
+            self.flush()
+
+    def flush(self):
+        """Write all buffered records (at most two writes, more only when segments roll over)"""
+        start = 0
+        while start < self.pending:
+            if not self._segments or self._used == self.segment_records:
+                self._new_segment()
+            count = min(self.pending - start, self.segment_records - self._used)
+            with open(self._path(self._segments[-1]), "ab") as f:
+                f.write(self.mv[start * self.size : (start + count) * self.size])
+            self.bytes_written += count * self.size
+            self.writes += 1
+            self._used += count
+            start += count
+        self.pending = 0
+
+    def poll(self):
+        """Flush if the oldest buffered record has waited flush_ms; call from the main loop"""
+        if self.pending and self.flush_ms is not None:
+            if time.ticks_diff(time.ticks_ms(), self._pending_since) >= self.flush_ms:
+                self.flush()
+
+    # --- reading ---
+    def _check(self, mv, offset):
+        end = offset + self.payload
+        (stored,) = struct.unpack_from(CRC, mv, end)
+        if crc32(mv[offset:end]) & 0xFFFFFFFF != stored:
+            self.corrupt += 1
+            return None
+        return struct.unpack_from(self.fmt, mv, offset)
+
+    def records(self, chunk_records=32):
+        """Yield every stored record as a tuple, oldest first (including unflushed ones)"""
+        chunk = bytearray(self.size * chunk_records)
+        mv = memoryview(chunk)
+        for path in self.segment_paths():
+            try:
+                f = open(path, "rb")
+            except OSError:
+                continue
+            with f:
+                header = f.read(HEADER_SIZE)
+                if len(header) < HEADER_SIZE or struct.unpack(HEADER, header)[:2] != (MAGIC, self.size):
+                    continue
+                while True:
+                    got = f.readinto(chunk)
+                    if not got:
+                        break
+                    for offset in range(0, got - self.size + 1, self.size):
+                        values = self._check(mv, offset)
+                        if values is not None:
+                            yield values
+                    if got < len(chunk):
+                        break
+        for n in range(self.pending):
+            values = self._check(self.mv, n * self.size)
+            if values is not None:
+                yield values
+
+    def last(self):
+        """Return the newest record, or None"""
+        if self.pending:
+            return self._check(self.mv, (self.pending - 1) * self.size)
+        for number in reversed(self._segments):
+            path = self._path(number)
+            stored = (os.stat(path)[6] - HEADER_SIZE) // self.size
+            if stored <= 0 or not self._header_ok(path):
+                continue
+            data = bytearray(self.size)
+            with open(path, "rb") as f:
+                f.seek(HEADER_SIZE + (stored - 1) * self.size)
+                f.readinto(data)
+            return self._check(memoryview(data), 0)
+        return None
@@ -0,0 +1,339 @@
+"""
+ADC 수집 버퍼(array('H'), 12비트 값) 신호 분석 라이브러리 (RMS, 포락선, 영교차율, 고정소수점 FFT 대역 에너지)
+"""
+
+import math
+import sys
+from array import array
+
+from micropython import const
+
+NATIVE = sys.implementation.name == "micropython"
+
+try:
+    import numpy as np  # PC 에서 Analyzer(engine="numpy") 를 고를 때만 사용
+except ImportError:
+    np = None
+if NATIVE:
+    np = None  # 피코(ulab 포함)에서는 viper 커널만 사용
+
+# (하한 Hz, 상한 Hz): 웅웅거림/바람, 목소리 기본음, 목소리 배음/경보음, 날카로운 소리
+DEFAULT_BANDS = ((0, 300), (300, 1000), (1000, 3000), (3000, 8000))
+_SQUARES_CHUNK = const(64)  # 제곱합이 32비트 부호 있는 정수를 넘지 않는 샘플 수 (4095² x 64 < 2³¹)
+
+if NATIVE:
+    import micropython
+
+    @micropython.viper
+    def _sum(buf, n: int) -> int:
+        src = ptr16(buf)
+        total = 0
+        i = 0
+        while i < n:
+            total += src[i] & 0xFFF
+            i += 1
+        return total
+
+    @micropython.viper
+    def _squares(buf, start: int, stop: int, dc: int) -> int:
+        src = ptr16(buf)
+        total = 0
+        i = start
+        while i < stop:
+            d = (src[i] & 0xFFF) - dc
+            total += d * d
+            i += 1
+        return total
+
+    @micropython.viper
+    def _envelope(buf, n: int, dc: int, window: int, reciprocal: int, out):
+        # out[i] = 마지막 window 개 샘플의 |x - dc| 평균 (앞쪽은 모자란 만큼 0 으로 보고 나눔)
+        src = ptr16(buf)
+        dst = ptr16(out)
+        running = 0
+        i = 0
+        while i < n:
+            d = (src[i] & 0xFFF) - dc
+            if d < 0:
+                d = -d
+            running += d
+            if i >= window:
+                d = (src[i - window] & 0xFFF) - dc
+                if d < 0:
+                    d = -d
+                running -= d
+            dst[i] = (running * reciprocal) >> 16
+            i += 1
+
+    @micropython.viper
+    def _crossings(buf, n: int, dc: int, hysteresis: int) -> int:
+        # dc - hysteresis 아래에서 dc + hysteresis 위로(또는 반대로) 넘어간 횟수
+        src = ptr16(buf)
+        state = 0
+        count = 0
+        i = 0
+        while i < n:
+            d = (src[i] & 0xFFF) - dc
+            if d > hysteresis:
+                if state < 0:
+                    count += 1
+                state = 1
+            elif d < -hysteresis:
+                if state > 0:
+                    count += 1
+                state = -1
+            i += 1
+        return count
+
+    @micropython.viper
+    def _load(buf, n: int, dc: int, window, order, re, im):
+        # 창 함수를 곱해 비트 역순 자리에 넣음: (x - dc) x 8 x w (12비트 -> 15비트)
+        src = ptr16(buf)
+        w = ptr32(window)
+        rev = ptr16(order)
+        r = ptr32(re)
+        m = ptr32(im)
+        i = 0
+        while i < n:
+            j = rev[i]
+            r[j] = (((src[i] & 0xFFF) - dc) * w[i]) >> 12
+            m[j] = 0
+            i += 1
+
+    @micropython.viper
+    def _fft(re, im, n: int, cos_table, sin_table):
+        # 시간 솎음 radix-2 FFT, 단계마다 1/2 로 줄여 결과는 X / n (넘침 없음)
+        r = ptr32(re)
+        m = ptr32(im)
+        c = ptr32(cos_table)
+        s = ptr32(sin_table)
+        half = 1
+        step = n >> 1
+        while half < n:
+            start = 0
+            while start < n:
+                k = 0
+                while k < half:
+                    a = start + k
+                    b = a + half
+                    wr = c[k * step]
+                    wi = s[k * step]
+                    tr = (wr * r[b] + wi * m[b]) >> 15
+                    ti = (wr * m[b] - wi * r[b]) >> 15
+                    r[b] = (r[a] - tr) >> 1
+                    m[b] = (m[a] - ti) >> 1
+                    r[a] = (r[a] + tr) >> 1
+                    m[a] = (m[a] + ti) >> 1
+                    k += 1
+                start += half << 1
+            half <<= 1
+            step >>= 1
+
+    @micropython.viper
+    def _power(re, im, k0: int, k1: int) -> int:
+        # 전체 합이 평균 제곱(< 2³¹) 이하라 32비트로 충분
+        r = ptr32(re)
+        m = ptr32(im)
+        total = 0
+        k = k0
+        while k < k1:
+            total += r[k] * r[k] + m[k] * m[k]
+            k += 1
+        return total
+
+else:
+    # PC 용: viper 커널과 같은 정수 계산 (NumPy 가 없을 때 사용)
+
+    def _sum(buf, n):
+        total = 0
+        for i in range(n):
+            total += buf[i] & 0xFFF
+        return total
+
+    def _squares(buf, start, stop, dc):
+        total = 0
+        for i in range(start, stop):
+            d = (buf[i] & 0xFFF) - dc
+            total += d * d
+        return total
+
+    def _envelope(buf, n, dc, window, reciprocal, out):
+        running = 0
+        for i in range(n):
+            running += abs((buf[i] & 0xFFF) - dc)
+            if i >= window:
+                running -= abs((buf[i - window] & 0xFFF) - dc)
+            out[i] = (running * reciprocal) >> 16
+
+    def _crossings(buf, n, dc, hysteresis):
+        state = 0
+        count = 0
+        for i in range(n):
+            d = (buf[i] & 0xFFF) - dc
+            if d > hysteresis:
+                if state < 0:
+                    count += 1
+                state = 1
+            elif d < -hysteresis:
+                if state > 0:
+                    count += 1
+                state = -1
+        return count
+
+    def _load(buf, n, dc, window, order, re, im):
+        for i in range(n):
+            j = order[i]
+            re[j] = (((buf[i] & 0xFFF) - dc) * window[i]) >> 12
+            im[j] = 0
+
+    def _fft(re, im, n, cos_table, sin_table):
+        half = 1
+        step = n >> 1
+        while half < n:
+            for start in range(0, n, half << 1):
+                for k in range(half):
+                    a = start + k
+                    b = a + half
+                    wr = cos_table[k * step]
+                    wi = sin_table[k * step]
+                    tr = (wr * re[b] + wi * im[b]) >> 15
+                    ti = (wr * im[b] - wi * re[b]) >> 15
+                    re[b] = (re[a] - tr) >> 1
+                    im[b] = (im[a] - ti) >> 1
+                    re[a] = (re[a] + tr) >> 1
+                    im[a] = (im[a] + ti) >> 1
+            half <<= 1
+            step >>= 1
+
+    def _power(re, im, k0, k1):
+        total = 0
+        for k in range(k0, k1):
+            total += re[k] * re[k] + im[k] * im[k]
+        return total
+
+
+def _reverse_bits(value, bits):
+    result = 0
+    for _ in range(bits):
+        result = (result << 1) | (value & 1)
+        value >>= 1
+    return result
+
+
+class Analyzer:
+    """Signal statistics for capture buffers of one size and sample rate.
+
+    All tables and work buffers are allocated here, once. Samples are 12-bit
+    (as filled by adccap.Capture); levels are returned in read_u16() units
+    (0..65535) like adccap.Capture.stats(). Two engines, chosen at construction:
+      "kernel" -- fixed-point loops: viper on the Pico, plain Python on the PC
+      "numpy"  -- NumPy (PC only, must be asked for); float FFT, so band levels
+                  differ slightly from "kernel" (bench/bench_dsp.py compares them)
+
+    The FFT is a fixed-point radix-2 transform over a Hann-windowed, DC-removed
+    copy of the buffer. band_levels() gives the RMS of the signal within each
+    (low Hz, high Hz) band, so sqrt(sum(level ** 2)) is close to rms().
+    """
+
+    def __init__(self, size=256, rate=16000, bands=DEFAULT_BANDS, window=32, engine="kernel"):
+        if size & (size - 1) or not 8 <= size <= 1024:
+            raise ValueError("size must be a power of two from 8 to 1024")
+        if engine not in ("kernel", "numpy"):
+            raise ValueError("engine must be 'kernel' or 'numpy'")
+        if engine == "numpy" and np is None:
+            raise ValueError("engine 'numpy' needs NumPy on the PC")
+        self.engine = engine
+        self.size = size
+        self.rate = rate
+        self.window = window
+        self.bands = bands
+        self.band_bins = []
+        for low, high in bands:
+            first = max(1, -(-low * size // rate))  # 직류(0번) 칸은 뺌
+            stop = min(size // 2, -(-high * size // rate))
+            self.band_bins.append((first, max(first, stop)))
+        self.levels = [0.0] * len(bands)
+
+        self._reciprocal = 65536 // window
+        self.envelope_buf = array("H", bytes(2 * size))
+        self._re = array("i", bytes(4 * size))
+        self._im = array("i", bytes(4 * size))
+        self._cos = array("i", [round(32767 * math.cos(2 * math.pi * k / size)) for k in range(size // 2)])
+        self._sin = array("i", [round(32767 * math.sin(2 * math.pi * k / size)) for k in range(size // 2)])
+        self._window = array("i", [round(32767 * 0.5 * (1 - math.cos(2 * math.pi * i / size))) for i in range(size)])
+        self._order = array("H", [_reverse_bits(i, size.bit_length() - 1) for i in range(size)])
+        window_power = sum((w / 32768) ** 2 for w in self._window) / size  # Hann: 0.375
+        self._level_scale = 8 / window_power
+        if engine == "numpy":
+            self._np_window = np.array(self._window, dtype=float) / 32768
+            self._np_masks = [
+                (np.arange(size // 2 + 1) >= first) & (np.arange(size // 2 + 1) < stop)
+                for first, stop in self.band_bins
+            ]
+
+    def dc(self, buf):
+        """Mean sample value, rounded (12-bit units)"""
+        return (_sum(buf, self.size) + self.size // 2) // self.size
+
+    def rms(self, buf):
+        """RMS with the DC level removed, in read_u16() units"""
+        n = self.size
+        if self.engine == "numpy":
+            return float(np.std(np.frombuffer(buf, dtype=np.uint16)[:n] & 0xFFF)) * 16
+        dc = self.dc(buf)
+        squares = 0
+        for start in range(0, n, _SQUARES_CHUNK):
+            squares += _squares(buf, start, min(start + _SQUARES_CHUNK, n), dc)
+        offset = _sum(buf, n) / n - dc
+        variance = squares / n - offset * offset
+        return math.sqrt(variance) * 16 if variance > 0 else 0.0
+
+    def envelope(self, buf):
+        """Sliding mean of |x - DC| over the last `window` samples (12-bit units).
+
+        Returns envelope_buf, which the next call overwrites.
+        """
+        n = self.size
+        if self.engine == "numpy":
+            x = np.frombuffer(buf, dtype=np.uint16)[:n] & 0xFFF
+            deviation = np.abs(x.astype(np.int32) - self.dc(buf))
+            running = np.cumsum(deviation)
+            running[self.window :] -= running[: -self.window].copy()
+            self.envelope_buf[:] = array("H", ((running * self._reciprocal) >> 16).astype(np.uint16).tobytes())
+            return self.envelope_buf
+        _envelope(buf, n, self.dc(buf), self.window, self._reciprocal, self.envelope_buf)
+        return self.envelope_buf
+
+    def zero_crossing_rate(self, buf, hysteresis=8):
+        """Crossings of the DC level per second (a pure tone of f Hz gives about 2 f).
+
+        A crossing counts only when the signal moves from below DC - hysteresis to
+        above DC + hysteresis (12-bit units) or back, so idle noise is ignored.
+        """
+        n = self.size
+        dc = self.dc(buf)
+        if self.engine == "numpy":
+            d = (np.frombuffer(buf, dtype=np.uint16)[:n] & 0xFFF).astype(np.int32) - dc
+            side = np.where(d > hysteresis, 1, np.where(d < -hysteresis, -1, 0))
+            side = side[side != 0]
+            count = int(np.count_nonzero(side[1:] != side[:-1]))
+        else:
+            count = _crossings(buf, n, dc, hysteresis)
+        return count * self.rate / n
+
+    def band_levels(self, buf):
+        """RMS level in each band (read_u16() units); returns self.levels, reused by the next call"""
+        n = self.size
+        levels = self.levels
+        if self.engine == "numpy":
+            x = (np.frombuffer(buf, dtype=np.uint16)[:n] & 0xFFF).astype(float)
+            spectrum = np.fft.rfft((x - round(x.mean())) * self._np_window)
+            power = np.abs(spectrum) ** 2 * (64 / (n * n))  # viper 커널과 같은 배율 (X / n, 15비트)
+            for index, mask in enumerate(self._np_masks):
+                levels[index] = math.sqrt(float(power[mask].sum()) * self._level_scale)
+            return levels
+        _load(buf, n, self.dc(buf), self._window, self._order, self._re, self._im)
+        _fft(self._re, self._im, n, self._cos, self._sin)
+        for index, (first, stop) in enumerate(self.band_bins):
+            levels[index] = math.sqrt(_power(self._re, self._im, first, stop) * self._level_scale)
+        return levels
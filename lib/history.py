@@ -0,0 +1,195 @@
+"""
+센서 측정 기록 저장 라이브러리 (고정 크기 array 원형 버퍼, 구간 조회)
+"""
+
+from array import array
+
+# typecode -> value stored for "no reading" (e.g. mic while the water sensor is selected)
+MISSING = {
+    "b": -128,
+    "B": 255,
+    "h": -32768,
+    "H": 65535,
+    "i": -2147483648,
+    "l": -2147483648,
+    "f": float("nan"),
+}
+
+
+class RingHistory:
+    """Fixed-capacity history of samples stored column by column in arrays.
+
+    fields is a sequence of (name, typecode, scale): a value v is stored as
+    round(v * scale) for integer typecodes and as v for "f" (scale then only sets
+    the rounding of the JSON output); None is stored as the MISSING sentinel of the
+    typecode, and a reading that rounds to the sentinel (e.g. 65535 for "H") is
+    stored one step inside the range so it does not turn into a gap. Every record also has a seq (increasing) and a timestamp (whole
+    seconds). All memory is allocated in the constructor.
+    """
+
+    def __init__(self, capacity, fields):
+        self.capacity = capacity
+        self.fields = tuple(fields)
+        self.seq = array("L", [0] * capacity)
+        self.timestamp = array("l", [0] * capacity)
+        self.columns = {}
+        for name, typecode, scale in self.fields:
+            self.columns[name] = array(typecode, [0] * capacity)
+        self.count = 0
+        self.head = 0  # index where the next record goes
+        self.appended = 0  # (추가) records stored so far, to spot overwrites during iter_json
+
+    def __len__(self):
+        return self.count
+
+    def memory_bytes(self):
+        """Bytes held by the record arrays"""
+        total = self.capacity * (self.seq.itemsize + self.timestamp.itemsize)
+        for column in self.columns.values():
+            total += self.capacity * column.itemsize
+        return total
+
+    def encode(self, values):
+        """Return the stored form of a values dict as a list in field order"""
+        stored = []
+        for name, typecode, scale in self.fields:
+            value = values.get(name)
+            if value is None:
+                value = MISSING[typecode]
+            elif typecode == "f":
+                value = float(value)
+            else:
+                value = int(round(value * scale))
+                if value == MISSING[typecode]:
+                    value += 1 if value < 0 else -1  # 실제 값이 "없음" 표시와 겹치지 않게
+            stored.append(value)
+        return stored
+
+    def decode(self, stored):
+        """Inverse of encode(): dict of real values (None for missing)"""
+        values = {}
+        for (name, typecode, scale), value in zip(self.fields, stored):
+            if typecode == "f":
+                values[name] = None if value != value else value
+            else:
+                values[name] = None if value == MISSING[typecode] else value / scale
+        return values
+
+    def append(self, seq, timestamp, values):
+        """Store one record; values is a dict (missing keys are stored as MISSING)"""
+        self.append_encoded(seq, timestamp, self.encode(values))
+
+    def append_encoded(self, seq, timestamp, stored):
+        """Store one record given in encode() form (e.g. replayed from flash)"""
+        i = self.head
+        self.seq[i] = seq
+        self.timestamp[i] = int(timestamp)
+        for (name, _, _), value in zip(self.fields, stored):
+            self.columns[name][i] = value
+        self.head = (i + 1) % self.capacity
+        self.appended += 1
+        if self.count < self.capacity:
+            self.count += 1
+
+    def oldest_timestamp(self):
+        """Timestamp of the oldest stored record (None if empty)"""
+        return self.timestamp[self._index(0)] if self.count else None
+
+    def _index(self, n):
+        """Array index of the n-th oldest stored record"""
+        return (self.head - self.count + n) % self.capacity
+
+    def _first_after(self, since):
+        """Position (0 = oldest) of the first record with seq > since"""
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            if self.seq[self._index(mid)] <= since:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def select(self, since=None, limit=None):
+        """Return (start, stop) positions of the records to send.
+
+        With since: the oldest records with seq > since (page forward from there).
+        Without since: the newest records.
+        """
+        if limit is None or limit > self.count:
+            limit = self.count
+        if since is None:
+            return self.count - limit, self.count
+        start = self._first_after(since)
+        return start, min(self.count, start + limit)
+
+    def column(self, name, first, count, lost=0):
+        """Return a JSON array string of count records of one column.
+
+        first is the array index of the first record (not a position, so the
+        records stay the same when more are appended); the first lost of them
+        have been overwritten since and are sent as null.
+        """
+        if name == "seq":
+            data, typecode, scale = self.seq, "L", 1
+        elif name == "timestamp":
+            data, typecode, scale = self.timestamp, "l", 1
+        else:
+            data = self.columns[name]
+            typecode, scale = self._spec(name)
+        missing = MISSING.get(typecode)
+        out = ["null"] * lost
+        for n in range(lost, count):
+            value = data[(first + n) % self.capacity]
+            if typecode == "f":
+                if value != value:  # NaN
+                    out.append("null")
+                else:
+                    out.append(str(round(value * scale) / scale))
+            elif value == missing:
+                out.append("null")
+            elif scale == 1:
+                out.append(str(value))
+            else:
+                out.append(str(value / scale))
+        return "[" + ",".join(out) + "]"
+
+    def _spec(self, name):
+        for field, typecode, scale in self.fields:
+            if field == name:
+                return typecode, scale
+        raise KeyError(name)
+
+    def iter_json(self, since=None, limit=None, fields=None):
+        """Yield a columnar JSON object piece by piece (one column per piece).
+
+        {"count": n, "first": seq, "last": seq, "more": bool,
+         "seq": [...], "timestamp": [...], "<field>": [...], ...}
+        Unknown names in fields are ignored. The records are fixed by the first
+        piece (which carries "seq"): records appended while the rest is drained are
+        not sent, and selected records overwritten meanwhile (full buffer) are null
+        in the later columns, so every column lines up with "seq".
+        """
+        start, stop = self.select(since, limit)
+        names = [name for name, _, _ in self.fields]
+        if fields is not None:
+            names = [name for name in names if name in fields]
+        count = stop - start
+        first = self.seq[self._index(start)] if count else None
+        last = self.seq[self._index(stop - 1)] if count else None
+        # (수정) 보내는 도중 append 돼도 같은 레코드를 읽도록 배열 위치와 기록 수를 미리 잡아 둠
+        first_index = self._index(start)
+        appended = self.appended
+        # appends that may follow before the oldest selected record is overwritten
+        room = self.capacity - self.count + start
+        yield '{"count": %d, "first": %s, "last": %s, "more": %s, "seq": %s' % (
+            count,
+            "null" if first is None else first,
+            "null" if last is None else last,
+            "true" if stop < self.count else "false",
+            self.column("seq", first_index, count),
+        )
+        for name in ["timestamp"] + names:
+            lost = min(count, max(0, self.appended - appended - room))
+            yield ', "%s": %s' % (name, self.column(name, first_index, count, lost))
+        yield "}"
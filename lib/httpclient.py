@@ -0,0 +1,295 @@
+"""
+작은 HTTP/HTTPS 클라이언트 라이브러리 (연결 유지, DNS 결과 재사용, 리디렉션 처리, 단계별 소요 시간)
+"""
+
+import json
+import socket
+import sys
+import time
+
+try:
+    import ssl
+except ImportError:  # 예전 MicroPython 펌웨어
+    import ussl as ssl
+
+REDIRECTS = (301, 302, 303, 307, 308)
+
+
+def split_url(url):
+    """Return (scheme, host, port, path) of an http(s) URL"""
+    scheme, _, rest = url.partition("://")
+    if scheme not in ("http", "https"):
+        raise ValueError("unsupported URL: " + url)
+    host, slash, path = rest.partition("/")
+    port = 443 if scheme == "https" else 80
+    if ":" in host:
+        host, port = host.rsplit(":", 1)
+        port = int(port)
+    return scheme, host, port, slash + path if slash else "/"
+
+
+def default_context():
+    """TLS context for https: system CAs on a PC; no certificate check on MicroPython (like urequests)"""
+    if hasattr(ssl, "create_default_context"):
+        return ssl.create_default_context()
+    if hasattr(ssl, "SSLContext"):
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        context.verify_mode = ssl.CERT_NONE
+        return context
+    return None  # ssl.wrap_socket() 만 있는 펌웨어
+
+
+class Response:
+    """Status, lower-case headers and the complete body of one response"""
+
+    def __init__(self, status, headers, body, timings):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.timings = timings
+
+    @property
+    def text(self):
+        return self.body.decode("utf-8")
+
+    def json(self):
+        return json.loads(self.body)
+
+
+class Connection:
+    """One open (optionally TLS) connection to host:port"""
+
+    def __init__(self, sock, stream, key):
+        self.sock = sock
+        self.stream = stream
+        self.key = key
+        self.requests = 0
+        self.responded = False  # status line of the current request received
+
+    def close(self):
+        for obj in (self.stream, self.sock):
+            try:
+                obj.close()
+            except Exception:
+                pass
+
+
+class HttpClient:
+    """HTTP/1.1 client that keeps connections open between requests.
+
+    One connection per (scheme, host, port) stays open after a response that
+    allows it, so a sequence of uploads pays DNS, TCP and TLS setup once.
+    Resolved addresses are cached for dns_ttl_ms. Redirects are followed
+    (301/302/303 become a GET without body, as Apps Script expects; 307/308
+    repeat the request) on the pooled connection of the target host.
+
+    If a reused connection turns out to be closed by the server before any
+    response byte arrives, the request is sent once more on a new connection.
+
+    Every Response carries timings in ms: dns, connect, tls, send, wait (until
+    the status line), receive, total, plus redirects and reused (requests that
+    went over an already open connection). The same dict is kept in
+    last_timings.
+    """
+
+    def __init__(self, timeout=10, max_redirects=3, dns_ttl_ms=3600000, ssl_context=None, max_body=4096):
+        self.timeout = timeout
+        self.max_redirects = max_redirects
+        self.dns_ttl_ms = dns_ttl_ms
+        self.ssl_context = ssl_context
+        self.max_body = max_body
+        self._dns = {}  # (host, port) -> (address, resolved at ticks_ms)
+        self._pool = {}  # (scheme, host, port) -> Connection
+        self.last_timings = None
+        self.connections_opened = 0
+        self.dns_lookups = 0
+
+    # --- connections ---
+    def _resolve(self, host, port, timings):
+        start = time.ticks_ms()
+        cached = self._dns.get((host, port))
+        if cached is not None and time.ticks_diff(start, cached[1]) < self.dns_ttl_ms:
+            return cached[0]
+        address = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)[0][-1]
+        self._dns[(host, port)] = (address, start)
+        self.dns_lookups += 1
+        timings["dns"] += time.ticks_diff(time.ticks_ms(), start)
+        return address
+
+    def _open(self, scheme, host, port, timings):
+        address = self._resolve(host, port, timings)
+        start = time.ticks_ms()
+        sock = socket.socket()
+        try:
+            sock.settimeout(self.timeout)
+            sock.connect(address)
+            connected = time.ticks_ms()
+            timings["connect"] += time.ticks_diff(connected, start)
+            if scheme == "https":
+                if self.ssl_context is None:
+                    self.ssl_context = default_context()
+                if self.ssl_context is None:
+                    sock = ssl.wrap_socket(sock, server_hostname=host)
+                else:
+                    sock = self.ssl_context.wrap_socket(sock, server_hostname=host)
+                timings["tls"] += time.ticks_diff(time.ticks_ms(), connected)
+        except Exception:
+            sock.close()
+            raise
+        # PC 에서는 버퍼가 있는 파일 객체, MicroPython 에서는 소켓 자체 (read/readline/write 지원)
+        stream = sock.makefile("rwb") if sys.implementation.name != "micropython" else sock
+        self.connections_opened += 1
+        return Connection(sock, stream, (scheme, host, port))
+
+    def close(self):
+        """Close all pooled connections (e.g. after WiFi reconnects)"""
+        for connection in self._pool.values():
+            connection.close()
+        self._pool = {}
+
+    def forget_dns(self):
+        self._dns = {}
+
+    # --- one request on one connection ---
+    def _read_exactly(self, stream, count, keep):
+        """Read count bytes; keep at most keep of them (the rest is read and dropped)"""
+        data = bytearray()
+        while count > 0:
+            chunk = stream.read(min(count, 512))
+            if not chunk:
+                raise OSError("connection closed in body")
+            count -= len(chunk)
+            if len(data) < keep:
+                data += chunk[: keep - len(data)]
+        return data
+
+    def _read_body(self, stream, headers, method, status):
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            return b"", True
+        if "chunked" in headers.get("transfer-encoding", ""):
+            body = bytearray()
+            while True:
+                size_line = stream.readline()
+                if not size_line:
+                    raise OSError("connection closed in chunked body")
+                size = int(size_line.split(b";")[0].strip(), 16)
+                if size == 0:
+                    while stream.readline() not in (b"\r\n", b"\n", b""):
+                        pass  # trailer
+                    return bytes(body), True
+                body += self._read_exactly(stream, size, self.max_body - len(body))
+                stream.readline()  # CRLF after the chunk
+        if "content-length" in headers:
+            return bytes(self._read_exactly(stream, int(headers["content-length"]), self.max_body)), True
+        # no length: body runs until the server closes the connection
+        body = bytearray()
+        while True:
+            chunk = stream.read(512)
+            if not chunk:
+                return bytes(body[: self.max_body]), False
+            if len(body) < self.max_body:
+                body += chunk
+
+    def _exchange(self, connection, method, host, path, body, headers, timings):
+        """Send one request and read its response; returns (status, headers, body, reusable)"""
+        start = time.ticks_ms()
+        connection.responded = False
+        lines = ["%s %s HTTP/1.1\r\nHost: %s\r\n" % (method, path, host)]
+        for name, value in headers.items():
+            lines.append("%s: %s\r\n" % (name, value))
+        if body is not None or method in ("POST", "PUT"):
+            lines.append("Content-Length: %d\r\n" % (len(body) if body else 0))
+        lines.append("\r\n")
+        request = "".join(lines).encode()
+        if body:
+            request += body  # 헤더와 본문을 한 번에 씀 (나눠 쓰면 Nagle/지연 ACK 로 수십 ms 멈춤)
+        stream = connection.stream
+        stream.write(request)
+        if hasattr(stream, "flush"):
+            stream.flush()
+        sent = time.ticks_ms()
+        timings["send"] += time.ticks_diff(sent, start)
+
+        status_line = stream.readline()
+        first_byte = time.ticks_ms()
+        timings["wait"] += time.ticks_diff(first_byte, sent)
+        if not status_line:
+            raise OSError("connection closed before response")
+        connection.responded = True
+        parts = status_line.split(None, 2)
+        version = parts[0].decode()
+        status = int(parts[1])
+        response_headers = {}
+        while True:
+            line = stream.readline()
+            if not line:
+                raise OSError("connection closed in headers")
+            if line in (b"\r\n", b"\n"):
+                break
+            name, _, value = line.decode().partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+        data, complete = self._read_body(stream, response_headers, method, status)
+        timings["receive"] += time.ticks_diff(time.ticks_ms(), first_byte)
+        connection_header = response_headers.get("connection", "").lower()
+        reusable = complete and (
+            "keep-alive" in connection_header if version == "HTTP/1.0" else "close" not in connection_header
+        )
+        return status, response_headers, data, reusable
+
+    def _send(self, method, scheme, host, port, path, body, headers, timings):
+        key = (scheme, host, port)
+        host_header = host if port == (443 if scheme == "https" else 80) else "%s:%d" % (host, port)
+        connection = self._pool.pop(key, None)
+        reused = connection is not None
+        for attempt in (0, 1):
+            if connection is None:
+                connection = self._open(scheme, host, port, timings)
+            try:
+                result = self._exchange(connection, method, host_header, path, body, headers, timings)
+            except OSError:
+                connection.close()
+                # 오래 쉬는 동안 서버가 닫은 연결: 응답을 하나도 못 받았으면 새 연결로 한 번 더
+                if reused and attempt == 0 and not connection.responded:
+                    connection = None
+                    reused = False
+                    continue
+                raise
+            connection.requests += 1
+            if reused:
+                timings["reused"] += 1
+            if result[3]:
+                self._pool[key] = connection
+            else:
+                connection.close()
+            return result
+
+    # --- public API ---
+    def request(self, method, url, body=None, headers=None):
+        """Send a request, following redirects; returns a Response"""
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        headers = headers or {}
+        timings = {"dns": 0, "connect": 0, "tls": 0, "send": 0, "wait": 0, "receive": 0, "redirects": 0, "reused": 0}
+        start = time.ticks_ms()
+        for _ in range(self.max_redirects + 1):
+            scheme, host, port, path = split_url(url)
+            status, response_headers, data, _ = self._send(method, scheme, host, port, path, body, headers, timings)
+            location = response_headers.get("location")
+            if status not in REDIRECTS or not location:
+                break
+            timings["redirects"] += 1
+            if location.startswith("/"):
+                location = "%s://%s:%d%s" % (scheme, host, port, location)
+            url = location
+            if status in (301, 302, 303):
+                method, body = "GET", None
+                headers = {k: v for k, v in headers.items() if k.lower() != "content-type"}
+        timings["total"] = time.ticks_diff(time.ticks_ms(), start)
+        self.last_timings = timings
+        return Response(status, response_headers, data, timings)
+
+    def post_json(self, url, obj, headers=None):
+        all_headers = {"Content-Type": "application/json"}
+        if headers:
+            all_headers.update(headers)
+        return self.request("POST", url, json.dumps(obj), all_headers)
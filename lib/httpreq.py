@@ -0,0 +1,240 @@
+"""
+피코 웹 서버용 HTTP 요청 파서 (나눠서 도착하는 요청을 이어서 해석)
+"""
+
+# feed() 결과
+NEED_MORE = 0  # 요청이 아직 다 도착하지 않음
+DONE = 1  # 요청 하나를 다 읽음 (parser.request)
+ERROR = 2  # 잘못된 요청 (parser.error 에 응답할 상태 코드)
+
+METHODS = (b"GET", b"POST", b"OPTIONS", b"HEAD", b"PUT", b"DELETE")
+
+# 따로 저장하는 헤더 (소문자). 나머지 헤더는 검사만 하고 버립니다.
+HEADERS = (
+    b"content-length",
+    b"connection",
+    b"content-type",
+    b"accept",
+    b"transfer-encoding",
+    b"last-event-id",
+    b"upgrade",
+    b"sec-websocket-key",
+    b"sec-websocket-version",
+)
+
+
+class Request:
+    """One parsed request. Header names in headers are lower-case str."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.method = ""
+        self.path = ""
+        self.query = ""
+        self.version = ""
+        self.headers = {}
+        self.content_length = 0
+        self.body = b""
+
+    def header(self, name, default=None):
+        return self.headers.get(name, default)
+
+    def keep_alive(self):
+        """True if the client wants to keep the connection open after this request"""
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.1":
+            return "close" not in connection
+        return "keep-alive" in connection
+
+    def query_params(self):
+        """Return the query string as a dict (no percent-decoding)"""
+        params = {}
+        if self.query:
+            for pair in self.query.split("&"):
+                key, _, value = pair.partition("=")
+                if key:
+                    params[key] = value
+        return params
+
+
+class RequestParser:
+    """Incremental parser for HTTP/1.x requests.
+
+    Bytes given to feed() are copied into a preallocated buffer. The request line is
+    checked as soon as it is complete, the header block once the blank line arrives,
+    and then exactly Content-Length body bytes are collected. On malformed input
+    feed() returns ERROR right away and error holds the status code to answer with.
+    Bytes that follow a complete request are kept for the next one (pipelining);
+    call next() after handling a request.
+    """
+
+    def __init__(self, max_header=1024, max_body=1024, headers=HEADERS):
+        self.max_header = max_header
+        self.max_body = max_body
+        self.wanted = headers
+        self.buf = bytearray(max_header + max_body)
+        self.mv = memoryview(self.buf)
+        self.request = Request()
+        self.length = 0
+        self._extra = b""
+        self._reset_request()
+
+    def _reset_request(self):
+        self.request.reset()
+        self.state = NEED_MORE
+        self.error = 0
+        self._scan = 0  # where the search for the end of the current line continues
+        self._line_end = -1  # index of the CRLF after the request line
+        self._header_end = -1  # index after the blank line
+        self._end = -1  # index after the body
+
+    def feed(self, data):
+        """Add received bytes and return NEED_MORE, DONE or ERROR"""
+        if self.state != NEED_MORE:
+            # already have a complete request (or an error): keep the bytes for later
+            self._extra += data
+            return self.state
+
+        room = len(self.buf) - self.length
+        if len(data) > room:
+            self._extra += data[room:]
+            data = data[:room]
+        self.buf[self.length : self.length + len(data)] = data
+        self.length += len(data)
+        return self._parse()
+
+    def next(self):
+        """Forget the handled request and start on bytes that followed it.
+
+        Returns the state for the next request (DONE if it was already buffered).
+        """
+        rest = b""
+        if self._end >= 0:
+            rest = bytes(self.mv[self._end : self.length])
+        rest += self._extra
+        self._extra = b""
+        self.length = 0
+        self._reset_request()
+        if rest:
+            return self.feed(rest)
+        return NEED_MORE
+
+    def reset(self):
+        """Drop all buffered bytes, e.g. when the connection is closed"""
+        self.length = 0
+        self._extra = b""
+        self._reset_request()
+
+    def _fail(self, status):
+        self.state = ERROR
+        self.error = status
+        return ERROR
+
+    def _find(self, pattern):
+        """Find pattern in the buffered bytes from self._scan on, -1 if missing.
+
+        Only the bytes received since the last miss are searched: on a miss the
+        scan offset moves to the end, less len(pattern) - 1 bytes so a pattern
+        split across two feeds is still found.
+        """
+        # (수정) bytes() 복사 없이 버퍼에서 바로 찾기
+        index = self.buf.find(pattern, self._scan, self.length)
+        if index < 0:
+            self._scan = max(self._scan, self.length - len(pattern) + 1)
+        return index
+
+    def _parse(self):
+        if self._header_end < 0:
+            if self._line_end < 0:
+                eol = self._find(b"\r\n")
+                if eol < 0:
+                    if self.length >= self.max_header:
+                        return self._fail(414)
+                    return NEED_MORE
+                if not self._parse_request_line(bytes(self.mv[:eol])):
+                    return self._fail(400)
+                self._line_end = eol
+                self._scan = eol
+
+            end = self._find(b"\r\n\r\n")
+            if end < 0:
+                if self.length >= self.max_header:
+                    return self._fail(431)
+                return NEED_MORE
+            if end + 4 > self.max_header:
+                return self._fail(431)
+            try:
+                status = self._parse_headers(bytes(self.mv[self._line_end + 2 : end]))
+            except ValueError:  # header value is not valid UTF-8
+                status = 400
+            if status:
+                return self._fail(status)
+            self._header_end = end + 4
+
+        self._end = self._header_end + self.request.content_length
+        if self.length < self._end:
+            return NEED_MORE
+        if self.request.content_length:
+            self.request.body = bytes(self.mv[self._header_end : self._end])
+        self.state = DONE
+        return DONE
+
+    def _parse_request_line(self, line):
+        parts = line.split(b" ")
+        if len(parts) != 3:
+            return False
+        method, target, version = parts
+        if method not in METHODS:
+            return False
+        if version != b"HTTP/1.1" and version != b"HTTP/1.0":
+            return False
+        if not target.startswith(b"/"):
+            return False
+        for byte in target:
+            if byte <= 0x20 or byte >= 0x7F:
+                return False
+        request = self.request
+        request.method = method.decode()
+        request.version = version.decode()
+        path, _, query = target.partition(b"?")
+        request.path = path.decode()
+        request.query = query.decode()
+        return True
+
+    def _parse_headers(self, block):
+        """Parse the header lines, return 0 or an error status code"""
+        request = self.request
+        content_length = None
+        if not block:
+            return 0
+        for line in block.split(b"\r\n"):
+            colon = line.find(b":")
+            # no whitespace before the colon, no obsolete line folding
+            if colon <= 0 or line[0] <= 0x20 or line[colon - 1] <= 0x20:
+                return 400
+            name = line[:colon].lower()
+            if name not in self.wanted:
+                continue
+            value = line[colon + 1 :].strip()
+            if name == b"content-length":
+                if not value or not 0x30 <= value[0] <= 0x39:
+                    return 400
+                try:
+                    length = int(value)
+                except ValueError:
+                    return 400
+                if content_length is not None and length != content_length:
+                    return 400
+                content_length = length
+            elif name == b"transfer-encoding":
+                # chunked request bodies are not supported
+                return 501
+            request.headers[name.decode()] = value.decode()
+
+        if content_length is not None:
+            if content_length > self.max_body:
+                return 413
+            request.content_length = content_length
+        return 0
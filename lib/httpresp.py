@@ -0,0 +1,167 @@
+"""
+피코 웹 서버용 HTTP 응답 작성 라이브러리 (미리 만든 헤더 bytes와 재사용 버퍼 사용)
+"""
+
+STATUS_LINES = {
+    200: b"HTTP/1.1 200 OK\r\n",
+    204: b"HTTP/1.1 204 No Content\r\n",
+    400: b"HTTP/1.1 400 Bad Request\r\n",
+    404: b"HTTP/1.1 404 Not Found\r\n",
+    405: b"HTTP/1.1 405 Method Not Allowed\r\n",
+    413: b"HTTP/1.1 413 Payload Too Large\r\n",
+    414: b"HTTP/1.1 414 URI Too Long\r\n",
+    431: b"HTTP/1.1 431 Request Header Fields Too Large\r\n",
+    500: b"HTTP/1.1 500 Internal Server Error\r\n",
+    501: b"HTTP/1.1 501 Not Implemented\r\n",
+    503: b"HTTP/1.1 503 Service Unavailable\r\n",
+}
+
+# 모든 응답에 붙는 CORS 헤더 (대시보드 HTML은 다른 출처에서 열림)
+CORS_HEADERS = (
+    b"Access-Control-Allow-Origin: *\r\n"
+    b"Access-Control-Allow-Methods: GET, POST, OPTIONS\r\n"
+    b"Access-Control-Allow-Headers: Content-Type\r\n"
+)
+CONNECTION_CLOSE = b"Connection: close\r\n"
+CONNECTION_KEEP_ALIVE = b"Connection: keep-alive\r\n"
+CHUNKED = b"Transfer-Encoding: chunked\r\n"
+CONTENT_LENGTH = b"Content-Length: "
+CRLF = b"\r\n"
+LAST_CHUNK = b"0\r\n\r\n"
+NO_CACHE = b"Cache-Control: no-cache\r\n"
+
+# _header() length for a body that simply ends when the connection is closed
+UNTIL_CLOSE = -1
+
+_content_types = {}
+
+
+def content_type_line(content_type):
+    """Return the Content-Type header line as bytes, built once per type"""
+    line = _content_types.get(content_type)
+    if line is None:
+        line = b"Content-Type: " + content_type.encode() + CRLF
+        _content_types[content_type] = line
+    return line
+
+
+def status_line(status):
+    line = STATUS_LINES.get(status)
+    if line is None:
+        line = b"HTTP/1.1 %d \r\n" % status
+    return line
+
+
+def keep_alive_lines(timeout, max_requests):
+    """Return the Connection/Keep-Alive header lines advertising the server limits"""
+    return CONNECTION_KEEP_ALIVE + b"Keep-Alive: timeout=%d, max=%d\r\n" % (timeout, max_requests)
+
+
+def sendall(sock, data):
+    """Write all of data to a blocking socket, continuing after partial writes"""
+    mv = memoryview(data)
+    sent = 0
+    while sent < len(mv):
+        count = sock.send(mv[sent:])
+        if count:
+            sent += count
+
+
+class ResponseWriter:
+    """Writes HTTP responses using one reusable buffer.
+
+    The header block is assembled in the buffer from precomputed bytes. If the body
+    fits as well it is copied behind the header so the whole response goes out in a
+    single write; otherwise the header is written first and the body is written
+    straight from the caller's object. Content-Length is the UTF-8 byte length of
+    the body. Bodies given as an iterable of chunks are sent with chunked encoding.
+
+    The same writer may be shared by several connections of an asyncio server, as
+    long as nothing is awaited between building a response and handing it to write().
+
+    Responses carry the connection line (Connection: close by default); a call with
+    keep_alive=True uses the keep_alive lines instead, see keep_alive_lines().
+    """
+
+    def __init__(self, size=1024, connection=CONNECTION_CLOSE, keep_alive=CONNECTION_KEEP_ALIVE):
+        self.buf = bytearray(size)
+        self.mv = memoryview(self.buf)
+        self.connection = connection
+        self.keep_alive = keep_alive
+
+    def _put(self, pos, data):
+        end = pos + len(data)
+        if end > len(self.buf):
+            raise ValueError("response header does not fit the buffer")
+        self.buf[pos:end] = data
+        return end
+
+    def _header(self, status, content_type, length, extra, keep_alive=False):
+        """Build the header block in the buffer, return its length"""
+        pos = self._put(0, status_line(status))
+        pos = self._put(pos, content_type_line(content_type))
+        pos = self._put(pos, CORS_HEADERS)
+        if length is None:
+            pos = self._put(pos, CHUNKED)
+        elif length == UNTIL_CLOSE:
+            keep_alive = False
+        else:
+            pos = self._put(pos, CONTENT_LENGTH)
+            pos = self._put(pos, b"%d\r\n" % length)
+        pos = self._put(pos, self.keep_alive if keep_alive else self.connection)
+        if extra:
+            pos = self._put(pos, extra)
+        return self._put(pos, CRLF)
+
+    def parts(self, status, content_type, body, extra=b"", keep_alive=False):
+        """Return the buffers to write for a response with a complete body.
+
+        The result is either (response,) or (header, body); the memoryview points into
+        the writer's buffer and is only valid until the next call.
+        """
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        end = self._header(status, content_type, len(body), extra, keep_alive)
+        if end + len(body) <= len(self.buf):
+            end = self._put(end, body)
+            return (self.mv[:end],)
+        return (self.mv[:end], body)
+
+    def send(self, sock, status, content_type, body, extra=b"", keep_alive=False):
+        """Send a response on a blocking socket"""
+        for part in self.parts(status, content_type, body, extra, keep_alive):
+            sendall(sock, part)
+
+    async def awrite(self, writer, status, content_type, body, extra=b"", keep_alive=False):
+        """Send a response on an asyncio stream writer"""
+        for part in self.parts(status, content_type, body, extra, keep_alive):
+            writer.write(part)
+        await writer.drain()
+
+    async def awrite_stream_head(self, writer, status, content_type, extra=b""):
+        """Send only the header of a response whose body runs until the connection closes.
+
+        Used for streams such as text/event-stream; the caller writes the body itself.
+        """
+        end = self._header(status, content_type, UNTIL_CLOSE, extra)
+        writer.write(self.mv[:end])
+        await writer.drain()
+
+    async def awrite_chunked(self, writer, status, content_type, chunks, extra=b"", keep_alive=False):
+        """Send a response whose body is produced piece by piece (chunked encoding).
+
+        chunks is an iterable of str or bytes; empty pieces are skipped.
+        """
+        end = self._header(status, content_type, None, extra, keep_alive)
+        writer.write(self.mv[:end])
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            if not chunk:
+                continue
+            writer.write(b"%x\r\n" % len(chunk))
+            writer.write(chunk)
+            writer.write(CRLF)
+            await writer.drain()
+        writer.write(LAST_CHUNK)
+        await writer.drain()
@@ -0,0 +1,197 @@
+"""
+가벼운 성능 지표 라이브러리 (고정 크기 히스토그램, 카운터, 게이지, Prometheus 텍스트 형식 출력)
+"""
+
+import gc
+
+from utime import ticks_diff, ticks_us
+
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+# 시간 히스토그램의 기본 구간 상한 (µs): 100 µs ~ 1 s, 그보다 긴 값은 +Inf 구간
+US_BUCKETS = (100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000, 250000, 1000000)
+
+
+class Histogram:
+    """Counts observations into fixed buckets (upper bounds, inclusive).
+
+    The bucket counters are allocated once; observe() only increments small ints,
+    so recording allocates nothing until the sum outgrows a small int.
+    labels is a preformatted label list such as 'sensor="aht20"'.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name, description, labels="", buckets=US_BUCKETS):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+
+    def observe(self, value):
+        index = 0
+        for bound in self.buckets:
+            if value <= bound:
+                break
+            index += 1
+        self.counts[index] += 1
+        self.sum += value
+
+    def since(self, start_us):
+        """Observe the microseconds elapsed since start_us (a ticks_us() value)"""
+        self.observe(ticks_diff(ticks_us(), start_us))
+
+    def wrap(self, function):
+        """Return function timed into this histogram on every call"""
+
+        def timed(*args, **kwargs):
+            start = ticks_us()
+            result = function(*args, **kwargs)
+            self.observe(ticks_diff(ticks_us(), start))
+            return result
+
+        return timed
+
+    def count(self):
+        return sum(self.counts)
+
+    def samples(self):
+        prefix = "%s_bucket{%s" % (self.name, self.labels + "," if self.labels else "")
+        labels = "{%s}" % self.labels if self.labels else ""
+        lines = []
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            lines.append('%sle="%d"} %d\n' % (prefix, bound, total))
+        total += self.counts[-1]
+        lines.append('%sle="+Inf"} %d\n' % (prefix, total))
+        lines.append("%s_sum%s %d\n%s_count%s %d\n" % (self.name, labels, self.sum, self.name, labels, total))
+        return "".join(lines)
+
+
+class Counter:
+    """Monotonic counter, optionally split by one label.
+
+    values lists the label values known in advance; they are reported as 0
+    before the first inc(). Keep the set of label values small and fixed.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name, description, label=None, values=()):
+        self.name = name
+        self.description = description
+        self.label = label
+        self.values = {value: 0 for value in values} if label else {None: 0}
+
+    def inc(self, value=None, amount=1):
+        self.values[value] = self.values.get(value, 0) + amount
+
+    def samples(self):
+        if self.label is None:
+            return "%s %d\n" % (self.name, self.values[None])
+        return "".join(
+            '%s{%s="%s"} %d\n' % (self.name, self.label, value, count) for value, count in self.values.items()
+        )
+
+
+class Gauge:
+    """Value read from function() when the metrics are rendered"""
+
+    kind = "gauge"
+
+    def __init__(self, name, description, function):
+        self.name = name
+        self.description = description
+        self.function = function
+
+    def samples(self):
+        return "%s %d\n" % (self.name, self.function())
+
+
+class _Null:
+    """Stand-in for every metric when the registry is disabled"""
+
+    def observe(self, value):
+        pass
+
+    def since(self, start_us):
+        pass
+
+    def inc(self, value=None, amount=1):
+        pass
+
+    def wrap(self, function):
+        return function
+
+
+NULL = _Null()
+
+
+class Registry:
+    """Holds the metrics in registration order and renders them as Prometheus text.
+
+    Metrics registered under the same name (e.g. one histogram per label value)
+    share one HELP/TYPE header, so register them one after another.
+    With enabled=False every factory returns NULL, whose methods do nothing.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.metrics = []
+
+    def add(self, metric):
+        if not self.enabled:
+            return NULL
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, name, description, labels="", buckets=US_BUCKETS):
+        return self.add(Histogram(name, description, labels, buckets))
+
+    def counter(self, name, description, label=None, values=()):
+        return self.add(Counter(name, description, label, values))
+
+    def gauge(self, name, description, function):
+        return self.add(Gauge(name, description, function))
+
+    def render(self):
+        """Yield the exposition text piece by piece (one piece per metric)"""
+        name = None
+        for metric in self.metrics:
+            if metric.name != name:
+                name = metric.name
+                yield "# HELP %s %s\n# TYPE %s %s\n" % (name, metric.description, name, metric.kind)
+            yield metric.samples()
+
+
+class HeapMonitor:
+    """Free heap gauges and a count of garbage collections.
+
+    MicroPython has no GC run counter, so a collection is detected when
+    gc.mem_alloc() went down since the previous sample(): several collections
+    between two samples count as one. Call sample() regularly (e.g. once per
+    sensor reading); rendering the metrics samples as well.
+    """
+
+    def __init__(self, registry, prefix="pico"):
+        self._last_alloc = gc.mem_alloc()
+        self.min_free = gc.mem_free()
+        self.gc_runs = registry.counter(prefix + "_gc_runs_total", "Garbage collections seen between heap samples")
+        registry.gauge(prefix + "_heap_free_bytes", "Free heap", self._free)
+        registry.gauge(prefix + "_heap_free_min_bytes", "Lowest free heap seen", lambda: self.min_free)
+
+    def _free(self):
+        self.sample()
+        return gc.mem_free()
+
+    def sample(self):
+        alloc = gc.mem_alloc()
+        if alloc < self._last_alloc:
+            self.gc_runs.inc()
+        self._last_alloc = alloc
+        free = gc.mem_free()
+        if free < self.min_free:
+            self.min_free = free
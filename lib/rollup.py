@@ -0,0 +1,184 @@
+"""
+측정 기록 요약 라이브러리 (1분/10분/1시간 구간별 최소/최대/평균, 고정 크기 메모리)
+"""
+
+from array import array
+
+
+def _scaled(value, scale):
+    """value (already multiplied by scale) as a JSON number in real units"""
+    value = round(value)
+    return str(value if scale == 1 else value / scale)
+
+
+class Tier:
+    """Ring of fixed-length time buckets; per field min, max, sum and count.
+
+    min/max use the field's typecode and scale like RingHistory (sum is kept as a
+    float in real units), so a bucket costs about as much as 2-3 raw samples.
+    """
+
+    def __init__(self, bucket_s, capacity, fields):
+        self.bucket_s = bucket_s
+        self.capacity = capacity
+        self.fields = fields
+        self.start = array("l", [0] * capacity)
+        self.min = {}
+        self.max = {}
+        self.sum = {}
+        self.count = {}
+        for name, typecode, scale in fields:
+            self.min[name] = array(typecode, [0] * capacity)
+            self.max[name] = array(typecode, [0] * capacity)
+            self.sum[name] = array("f", [0] * capacity)
+            self.count[name] = array("H", [0] * capacity)
+        self.used = 0
+        self.head = 0  # index of the next bucket to open
+        self.opened = 0  # (추가) buckets opened so far, to spot overwrites during iter_json
+
+    def memory_bytes(self):
+        total = self.capacity * self.start.itemsize
+        for name, _, _ in self.fields:
+            total += self.capacity * (
+                self.min[name].itemsize
+                + self.max[name].itemsize
+                + self.sum[name].itemsize
+                + self.count[name].itemsize
+            )
+        return total
+
+    def _index(self, n):
+        """Array index of the n-th oldest bucket"""
+        return (self.head - self.used + n) % self.capacity
+
+    def _open(self, start):
+        i = self.head
+        self.start[i] = start
+        for name, _, _ in self.fields:
+            self.count[name][i] = 0
+            self.sum[name][i] = 0.0
+        self.head = (i + 1) % self.capacity
+        self.opened += 1
+        if self.used < self.capacity:
+            self.used += 1
+        return i
+
+    def add(self, timestamp, values):
+        start = timestamp - timestamp % self.bucket_s
+        if self.used and self.start[self._index(self.used - 1)] == start:
+            i = self._index(self.used - 1)
+        elif self.used and start < self.start[self._index(self.used - 1)]:
+            return  # clock went backwards: ignore until it catches up
+        else:
+            i = self._open(start)
+        for name, typecode, scale in self.fields:
+            value = values.get(name)
+            if value is None:
+                continue
+            stored = float(value) if typecode == "f" else int(round(value * scale))
+            count = self.count[name]
+            if count[i] == 0:
+                self.min[name][i] = stored
+                self.max[name][i] = stored
+            elif stored < self.min[name][i]:
+                self.min[name][i] = stored
+            elif stored > self.max[name][i]:
+                self.max[name][i] = stored
+            self.sum[name][i] += value
+            if count[i] < 65535:
+                count[i] += 1
+
+    def oldest(self):
+        """Start time of the oldest bucket (None if empty)"""
+        return self.start[self._index(0)] if self.used else None
+
+    def positions(self, since):
+        """Positions of the buckets that end after since"""
+        first = 0
+        while first < self.used and self.start[self._index(first)] + self.bucket_s <= since:
+            first += 1
+        return first, self.used
+
+    def _stat_json(self, name, stat, first_index, buckets, lost, scale):
+        """JSON array of one stat for buckets buckets from array index first_index
+        (the first lost of them were overwritten since and are sent as null)"""
+        out = ["null"] * lost
+        count = self.count[name]
+        for n in range(lost, buckets):
+            i = (first_index + n) % self.capacity
+            if count[i] == 0:
+                out.append("null")
+            elif stat == "mean":
+                out.append(_scaled(self.sum[name][i] / count[i] * scale, scale))
+            elif stat == "count":
+                out.append(str(count[i]))
+            else:
+                value = (self.min if stat == "min" else self.max)[name][i]
+                if isinstance(value, float):  # "f" fields are stored unscaled
+                    value *= scale
+                out.append(_scaled(value, scale))
+        return "[" + ",".join(out) + "]"
+
+    def iter_json(self, since, fields=None):
+        """Yield {"tier": s, "count": n, "start": [...], "<field>": {"min", "max", "mean", "count"}}
+
+        The buckets are fixed by the first piece like RingHistory.iter_json():
+        buckets opened while the rest is drained are not sent, and sent buckets
+        overwritten meanwhile are null in the later fields.
+        """
+        first, stop = self.positions(since)
+        buckets = stop - first
+        # (수정) 보내는 도중 구간이 새로 열려도 같은 구간을 읽도록 배열 위치를 미리 잡아 둠
+        first_index = self._index(first)
+        opened = self.opened
+        room = self.capacity - self.used + first
+        yield '{"tier": %d, "count": %d, "start": [%s]' % (
+            self.bucket_s,
+            buckets,
+            ",".join(str(self.start[(first_index + n) % self.capacity]) for n in range(buckets)),
+        )
+        for name, _, scale in self.fields:
+            if fields is not None and name not in fields:
+                continue
+            yield ', "%s": {' % name
+            lost = min(buckets, max(0, self.opened - opened - room))
+            yield ", ".join(
+                '"%s": %s' % (stat, self._stat_json(name, stat, first_index, buckets, lost, scale))
+                for stat in ("min", "max", "mean", "count")
+            )
+            yield "}"
+        yield "}"
+
+
+class Rollup:
+    """Several Tiers fed from the same samples.
+
+    tiers is a sequence of (bucket_s, capacity), finest first. fields is a sequence
+    of (name, typecode, scale) as for history.RingHistory.
+    """
+
+    def __init__(self, fields, tiers):
+        fields = tuple(fields)
+        self.tiers = [Tier(bucket_s, capacity, fields) for bucket_s, capacity in tiers]
+
+    def memory_bytes(self):
+        return sum(tier.memory_bytes() for tier in self.tiers)
+
+    def add(self, timestamp, values):
+        timestamp = int(timestamp)
+        for tier in self.tiers:
+            tier.add(timestamp, values)
+
+    def choose(self, now, range_s, points):
+        """Pick the finest tier that covers range_s seconds with at most points buckets.
+
+        Falls back to the coarsest tier if none covers the whole range.
+        """
+        since = now - range_s
+        for tier in self.tiers:
+            if range_s // tier.bucket_s > points:
+                continue  # too many points for the budget
+            oldest = tier.oldest()
+            if tier.used < tier.capacity or oldest is None or oldest <= since + tier.bucket_s:
+                return tier  # holds everything since start-up, or reaches back far enough
+        return self.tiers[-1]
@@ -0,0 +1,100 @@
+"""
+센서 측정값 이진 형식 라이브러리 (버전 붙은 고정 크기 struct 레코드, 미리 만든 버퍼 재사용)
+"""
+
+import struct
+
+from history import MISSING
+
+# 레코드 (little-endian, 28 bytes):
+#   version B, flags B, seq I, timestamp I (초), age_ms H,
+#   temperature h (x10), humidity h (x10), light f, mic H, water_distance h (x100), water_adc H,
+#   mic_level H (버전 2 에서 추가: 보드가 마이크 알람에 비교한 값)
+# 값이 없으면 history.MISSING 의 값 (h: -32768, H: 65535, f: NaN)
+VERSION = 2
+FORMAT = "<BBIIHhhfHhHH"
+SIZE = struct.calcsize(FORMAT)
+AGE_OFFSET = 10  # age_ms 위치 (응답마다 이 2바이트만 고침)
+CONTENT_TYPE = "application/octet-stream"
+
+# flags
+FLAG_WATER = 0x01  # sensor_type 이 "water" (아니면 "mic")
+FLAG_ALARM = 0x02
+FLAG_ERROR = 0x04  # 센서 읽기 실패 (측정값은 모두 MISSING)
+
+# (이름, 타입, 배율): 레코드 뒤쪽의 측정값 항목
+FIELDS = (
+    ("temperature", "h", 10),
+    ("humidity", "h", 10),
+    ("light", "f", 1),
+    ("mic", "H", 1),
+    ("water_distance", "h", 100),
+    ("water_adc", "H", 1),
+    ("mic_level", "H", 1),
+)
+
+# 정수 항목에 넣을 수 있는 범위 (MISSING 값은 빼고, 벗어난 값은 끝 값으로 저장)
+LIMITS = {"h": (-32767, 32767), "H": (0, 65534)}
+
+
+def _stored(value, typecode, scale):
+    if value is None:
+        return MISSING[typecode]
+    if typecode == "f":
+        return float(value)
+    low, high = LIMITS[typecode]
+    return min(max(int(round(value * scale)), low), high)
+
+
+class SensorPacker:
+    """Packs sensor data dicts (as built by the dashboard) into one reused buffer.
+
+    The record for a seq is packed once; later calls with the same seq only
+    rewrite age_ms, so serving the latest reading allocates nothing. The returned
+    bytearray is overwritten by the next call: write or copy it before yielding.
+    """
+
+    def __init__(self):
+        self.buf = bytearray(SIZE)
+        self.seq = None
+
+    def pack(self, data, age_ms=0):
+        seq = data.get("seq", 0)
+        if seq != self.seq or not seq:
+            flags = 0
+            if data.get("sensor_type") == "water":
+                flags |= FLAG_WATER
+            if data.get("alarm"):
+                flags |= FLAG_ALARM
+            error = "error" in data
+            if error:
+                flags |= FLAG_ERROR
+            values = [
+                MISSING[typecode] if error else _stored(data.get(name), typecode, scale)
+                for name, typecode, scale in FIELDS
+            ]
+            struct.pack_into(FORMAT, self.buf, 0, VERSION, flags, seq, int(data.get("timestamp", 0)), 0, *values)
+            self.seq = seq
+        struct.pack_into("<H", self.buf, AGE_OFFSET, min(max(age_ms, 0), 0xFFFF))
+        return self.buf
+
+
+def unpack(record):
+    """Decode a record into a dict shaped like the /sensors JSON (missing values left out)"""
+    values = struct.unpack_from(FORMAT, record)
+    if values[0] != VERSION:
+        raise ValueError("unsupported record version %d" % values[0])
+    flags = values[1]
+    data = {"seq": values[2], "timestamp": values[3], "age_ms": values[4]}
+    if flags & FLAG_ERROR:
+        data["error"] = "sensor read failed"
+        return data
+    data["sensor_type"] = "water" if flags & FLAG_WATER else "mic"
+    data["alarm"] = bool(flags & FLAG_ALARM)
+    for (name, typecode, scale), value in zip(FIELDS, values[5:]):
+        if typecode == "f":
+            if value == value:  # NaN 은 값 없음
+                data[name] = round(value, 1)
+        elif value != MISSING[typecode]:
+            data[name] = value if scale == 1 else value / scale
+    return data
@@ -2,9 +2,13 @@
 SSD1306 OLED 화면을 위한 라이브러리
 """
 
+import sys
+
 from micropython import const
 import framebuf
 
+NATIVE = sys.implementation.name == "micropython"
+
 
 # register definitions
 SET_CONTRAST = const(0x81)
@@ -27,6 +31,53 @@ SET_VCOM_DESEL = const(0xDB)
 SET_CHARGE_PUMP = const(0x8D)
 
 
+# show() helpers: compare/copy a page of the framebuffer with its shadow in place
+# (slicing would allocate two page-sized copies per page on every refresh)
+if NATIVE:
+    import micropython
+
+    @micropython.viper
+    def _changed_range(buf, shadow, start: int, end: int) -> int:
+        # (first << 16) | (last + 1) of the bytes that differ in [start, end), 0 if none
+        a = ptr8(buf)
+        b = ptr8(shadow)
+        first = start
+        while first < end and a[first] == b[first]:
+            first += 1
+        if first == end:
+            return 0
+        last = end - 1
+        while a[last] == b[last]:
+            last -= 1
+        return (first << 16) | (last + 1)
+
+    @micropython.viper
+    def _copy(dst, src, start: int, end: int):
+        d = ptr8(dst)
+        s = ptr8(src)
+        i = start
+        while i < end:
+            d[i] = s[i]
+            i += 1
+
+else:
+
+    def _changed_range(buf, shadow, start, end):
+        first = start
+        while first < end and buf[first] == shadow[first]:
+            first += 1
+        if first == end:
+            return 0
+        last = end - 1
+        while buf[last] == shadow[last]:
+            last -= 1
+        return (first << 16) | (last + 1)
+
+    def _copy(dst, src, start, end):
+        for i in range(start, end):
+            dst[i] = src[i]
+
+
 # Subclassing FrameBuffer provides support for graphics primitives
 # http://docs.micropython.org/en/latest/pyboard/library/framebuf.html
 class SSD1306(framebuf.FrameBuffer):
@@ -36,11 +87,20 @@ class SSD1306(framebuf.FrameBuffer):
         self.external_vcc = external_vcc
         self.pages = self.height // 8
         self.buffer = bytearray(self.pages * self.width)
+        # copy of what the display RAM currently holds, used by show() to send only changes
+        self.shadow = bytearray(self.pages * self.width)
+        self.buffer_mv = memoryview(self.buffer)
+        self.full_refresh = True
+        # preallocated SET_COL_ADDR x0 x1 SET_PAGE_ADDR p0 p1 sequence for set_window()
+        self.window_cmds = bytearray((SET_COL_ADDR, 0, 0, SET_PAGE_ADDR, 0, 0))
         super().__init__(self.buffer, self.width, self.height, framebuf.MONO_VLSB)
         self.init_display()
 
     def init_display(self):
-        for cmd in (
+        # the display RAM may hold anything after (re)initialisation, so the shadow is stale
+        self.invalidate()
+        # the whole sequence goes out as one bus transaction
+        self.write_cmds(bytearray((
             SET_DISP,  # display off
             # address setting
             SET_MEM_ADDR,
@@ -73,8 +133,7 @@ class SSD1306(framebuf.FrameBuffer):
             SET_CHARGE_PUMP,
             0x10 if self.external_vcc else 0x14,
             SET_DISP | 0x01,  # display on
-        ):  # on
-            self.write_cmd(cmd)
+        )))
         self.fill(0)
         self.show()
 
@@ -85,31 +144,60 @@ class SSD1306(framebuf.FrameBuffer):
         self.write_cmd(SET_DISP | 0x01)
 
     def contrast(self, contrast):
-        self.write_cmd(SET_CONTRAST)
-        self.write_cmd(contrast)
+        self.write_cmds(bytearray((SET_CONTRAST, contrast)))
 
     def invert(self, invert):
         self.write_cmd(SET_NORM_INV | (invert & 1))
 
     def rotate(self, rotate):
-        self.write_cmd(SET_COM_OUT_DIR | ((rotate & 1) << 3))
-        self.write_cmd(SET_SEG_REMAP | (rotate & 1))
+        self.write_cmds(
+            bytearray((SET_COM_OUT_DIR | ((rotate & 1) << 3), SET_SEG_REMAP | (rotate & 1)))
+        )
+
+    def invalidate(self):
+        """Make the next show() resend the whole framebuffer"""
+        self.full_refresh = True
+
+    def show(self, full=False):
+        """Send the framebuffer to the display.
+
+        Only the changed column range of each changed page is sent, compared with
+        what was sent before. full=True (or invalidate()) sends the whole buffer.
+        """
+        if full or self.full_refresh:
+            self.set_window(0, self.width - 1, 0, self.pages - 1)
+            self.write_data(self.buffer)
+            self.shadow[:] = self.buffer
+            self.full_refresh = False
+            return
 
-    def show(self):
-        x0 = 0
-        x1 = self.width - 1
+        buf = self.buffer
+        shadow = self.shadow
+        width = self.width
+        for page in range(self.pages):
+            page_start = page * width
+            changed = _changed_range(buf, shadow, page_start, page_start + width)
+            if not changed:
+                continue
+            start = changed >> 16
+            end = changed & 0xFFFF
+            self.set_window(start - page_start, end - page_start - 1, page, page)
+            self.write_data(self.buffer_mv[start:end])
+            _copy(shadow, buf, start, end)
+
+    def set_window(self, x0, x1, page0, page1):
+        """Set the column and page range that the next write_data() fills"""
         if self.width != 128:
             # narrow displays use centred columns
             col_offset = (128 - self.width) // 2
             x0 += col_offset
             x1 += col_offset
-        self.write_cmd(SET_COL_ADDR)
-        self.write_cmd(x0)
-        self.write_cmd(x1)
-        self.write_cmd(SET_PAGE_ADDR)
-        self.write_cmd(0)
-        self.write_cmd(self.pages - 1)
-        self.write_data(self.buffer)
+        cmds = self.window_cmds
+        cmds[1] = x0
+        cmds[2] = x1
+        cmds[4] = page0
+        cmds[5] = page1
+        self.write_cmds(cmds)
 
 
 class SSD1306_I2C(SSD1306):
@@ -118,6 +206,7 @@ class SSD1306_I2C(SSD1306):
         self.addr = addr
         self.temp = bytearray(2)
         self.write_list = [b"\x40", None]  # Co=0, D/C#=1
+        self.cmd_list = [b"\x00", None]  # Co=0, D/C#=0: all following bytes are commands
         super().__init__(width, height, external_vcc)
 
     def write_cmd(self, cmd):
@@ -125,6 +214,10 @@ class SSD1306_I2C(SSD1306):
         self.temp[1] = cmd
         self.i2c.writeto(self.addr, self.temp)
 
+    def write_cmds(self, cmds):
+        self.cmd_list[1] = cmds
+        self.i2c.writevto(self.addr, self.cmd_list)
+
     def write_data(self, buf):
         self.write_list[1] = buf
         self.i2c.writevto(self.addr, self.write_list)
@@ -133,6 +226,7 @@ class SSD1306_I2C(SSD1306):
 class SSD1306_SPI(SSD1306):
     def __init__(self, width, height, spi, dc, res, cs, external_vcc=False):
         self.rate = 10 * 1024 * 1024
+        self.cmd_buf = bytearray(1)
         dc.init(dc.OUT, value=0)
         res.init(res.OUT, value=0)
         cs.init(cs.OUT, value=1)
@@ -150,11 +244,15 @@ class SSD1306_SPI(SSD1306):
         super().__init__(width, height, external_vcc)
 
     def write_cmd(self, cmd):
+        self.cmd_buf[0] = cmd
+        self.write_cmds(self.cmd_buf)
+
+    def write_cmds(self, cmds):
         self.spi.init(baudrate=self.rate, polarity=0, phase=0)
         self.cs(1)
         self.dc(0)
         self.cs(0)
-        self.spi.write(bytearray([cmd]))
+        self.spi.write(cmds)
         self.cs(1)
 
     def write_data(self, buf):
@@ -0,0 +1,80 @@
+"""
+OLED 텍스트 화면 관리 라이브러리 (바뀐 줄만 다시 그리기)
+"""
+
+from utime import ticks_diff, ticks_ms
+
+
+def _noop(*args, **kwargs):
+    return False
+
+
+class TextDisplay:
+    """Line-based text screen on top of an SSD1306 (or any FrameBuffer with show()).
+
+    The lines currently on screen are remembered, and only the bands of lines whose
+    text changed are cleared and redrawn. Refreshes are limited to max_fps; a change
+    that comes too soon stays pending until the next show(), set_line() or poll().
+
+    Passing oled=None gives a display whose methods do nothing.
+    """
+
+    def __init__(self, oled, lines=4, line_height=16, max_fps=5):
+        self.oled = oled
+        self.line_height = line_height
+        self.lines = [""] * lines
+        self._min_interval_ms = 1000 // max_fps if max_fps else 0
+        self._last_flush = None
+        self._pending = False
+
+        if oled is None:
+            self.show = self.set_line = self.clear = self.poll = _noop
+            return
+
+        self.width = oled.width
+        # Start from a blank screen so the line model matches the framebuffer
+        oled.fill(0)
+        self._pending = True
+
+    def show(self, lines, force=False):
+        """Show a list of strings, one per line. Missing lines are cleared, extra lines ignored."""
+        for index in range(len(self.lines)):
+            self._draw_line(index, lines[index] if index < len(lines) else "")
+        return self.poll(force)
+
+    def set_line(self, index, text, force=False):
+        """Change a single line"""
+        self._draw_line(index, text)
+        return self.poll(force)
+
+    def clear(self, force=False):
+        """Clear all lines"""
+        return self.show((), force)
+
+    def poll(self, force=False):
+        """Refresh the display if there are pending changes and max_fps allows it.
+
+        Returns True if the display was refreshed.
+        """
+        if not self._pending:
+            return False
+        now = ticks_ms()
+        if (
+            not force
+            and self._last_flush is not None
+            and ticks_diff(now, self._last_flush) < self._min_interval_ms
+        ):
+            return False
+        self.oled.show()
+        self._last_flush = now
+        self._pending = False
+        return True
+
+    def _draw_line(self, index, text):
+        if self.lines[index] == text:
+            return
+        self.lines[index] = text
+        y = index * self.line_height
+        self.oled.fill_rect(0, y, self.width, self.line_height, 0)
+        self.oled.text(text, 0, y)
+        self._pending = True
@@ -0,0 +1,169 @@
+"""
+측정값 묶음 전송 라이브러리 (RAM 대기열 + 플래시 보관, N개/T초마다 한 번에 전송, 실패하면 점점 길게 쉬었다가 재시도)
+"""
+
+import random
+import time
+
+from binlog import BinLog
+
+
+class Uploader:
+    """Queues samples and hands them to a send function in batches.
+
+    add() queues a sample (timestamp, *values) in RAM. poll() sends a batch when
+    batch_size samples are waiting or the oldest has waited batch_ms, and keeps
+    sending full batches (up to max_batches per call) to drain a backlog.
+    send(batch) gets a list of (timestamp, *values) tuples and returns True when
+    the receiver accepted them; False or an exception is a failure, after which
+    nothing is sent for backoff_ms, doubled on every further failure up to
+    max_backoff_ms (with jitter so several devices do not retry in step).
+
+    While sends fail the RAM queue fills up to capacity. Beyond that the oldest
+    samples move to a BinLog spool on flash (records "<II" + fmt: seq, timestamp,
+    values), which survives a reboot and is sent first once the receiver is back;
+    a one-field cursor log remembers the last delivered spool seq. Without
+    spool_prefix the oldest samples are dropped instead. The spool itself is a
+    ring, so in a very long outage its oldest samples are lost as well.
+    """
+
+    def __init__(
+        self,
+        send,
+        fmt,
+        batch_size=12,
+        batch_ms=60000,
+        capacity=60,
+        spool_prefix=None,
+        spool_records=256,
+        spool_segments=4,
+        backoff_ms=5000,
+        max_backoff_ms=300000,
+    ):
+        self.send = send
+        self.batch_size = batch_size
+        self.batch_ms = batch_ms
+        self.capacity = capacity
+        self.min_backoff_ms = backoff_ms
+        self.max_backoff_ms = max_backoff_ms
+        self.backoff_ms = backoff_ms
+        self.queue = []
+        self._oldest_ms = 0
+        self._retry_at = None
+
+        self.posts = 0
+        self.sent = 0
+        self.failures = 0
+        self.dropped = 0
+        self.spooled = 0
+        self.last_error = None
+
+        self.spool = None
+        self.spool_seq = 0
+        self.cursor = 0
+        if spool_prefix is not None:
+            values = fmt[1:] if fmt[0] in "<>!=@" else fmt
+            self.spool = BinLog(spool_prefix, "<II" + values, spool_records, spool_segments, batch_size)
+            self._cursor_log = BinLog(spool_prefix + "_sent", "<I", 256, 2, 1)
+            last = self.spool.last()
+            self.spool_seq = last[0] if last else 0
+            sent = self._cursor_log.last()
+            self.cursor = min(sent[0], self.spool_seq) if sent else 0
+
+    def backlog(self):
+        """Samples not yet delivered (RAM queue + spool)"""
+        return len(self.queue) + self.spool_backlog()
+
+    def spool_backlog(self):
+        if self.spool is None:
+            return 0
+        return min(self.spool_seq - self.cursor, self.spool.capacity())
+
+    def add(self, timestamp, *values):
+        if not self.queue:
+            self._oldest_ms = time.ticks_ms()
+        self.queue.append((timestamp,) + values)
+        if len(self.queue) > self.capacity:
+            oldest = self.queue.pop(0)
+            if self.spool is None:
+                self.dropped += 1
+            else:
+                self._spool(oldest)
+
+    def _spool(self, sample):
+        self.spool_seq += 1
+        self.spool.append(self.spool_seq, *sample)
+        self.spooled += 1
+
+    def _spooled_batch(self):
+        """Oldest undelivered spool records: (batch, seq of the last one)"""
+        batch = []
+        last_seq = self.cursor
+        for record in self.spool.records():
+            if record[0] <= self.cursor:
+                continue
+            if not batch and record[0] > self.cursor + 1:
+                self.dropped += record[0] - self.cursor - 1  # overwritten by the ring
+            batch.append(record[1:])
+            last_seq = record[0]
+            if len(batch) == self.batch_size:
+                break
+        return batch, last_seq
+
+    def _try(self, batch):
+        self.posts += 1
+        try:
+            ok = self.send(batch)
+            if not ok:
+                self.last_error = "rejected"
+        except Exception as e:
+            ok = False
+            self.last_error = repr(e)
+        if ok:
+            self.last_error = None
+            self.sent += len(batch)
+            self.backoff_ms = self.min_backoff_ms
+            self._retry_at = None
+            return True
+        self.failures += 1
+        half = self.backoff_ms // 2
+        self._retry_at = time.ticks_add(time.ticks_ms(), half + random.getrandbits(16) % (half + 1))
+        self.backoff_ms = min(self.backoff_ms * 2, self.max_backoff_ms)
+        return False
+
+    def poll(self, max_batches=4):
+        """Send what is due; returns the number of batches delivered. Call from the main loop"""
+        if self._retry_at is not None and time.ticks_diff(time.ticks_ms(), self._retry_at) < 0:
+            return 0
+        delivered = 0
+        while delivered < max_batches:
+            if self.spool_backlog():
+                batch, last_seq = self._spooled_batch()
+                if not batch:  # cursor already at the end (e.g. spool files removed)
+                    self.cursor = self.spool_seq
+                    continue
+                if not self._try(batch):
+                    break
+                self.cursor = last_seq
+                self._cursor_log.append(last_seq)
+            else:
+                waited = time.ticks_diff(time.ticks_ms(), self._oldest_ms)
+                if len(self.queue) < self.batch_size and not (self.queue and waited >= self.batch_ms):
+                    break
+                batch = self.queue[: self.batch_size]
+                if not self._try(batch):
+                    break
+                del self.queue[: len(batch)]
+                self._oldest_ms = time.ticks_ms()
+            delivered += 1
+        return delivered
+
+    def flush(self):
+        """Move the RAM queue to the spool and write it to flash (e.g. on exit or before
+        a planned reset); the samples are sent from the spool on the next poll() or boot"""
+        if self.spool is None:
+            return
+        for sample in self.queue:
+            self._spool(sample)
+        self.queue = []
+        self.spool.flush()
@@ -0,0 +1,193 @@
+"""
+피코 웹 서버용 최소 WebSocket(RFC 6455) 라이브러리 (서버 쪽, asyncio 스트림 사용)
+"""
+
+import binascii
+import hashlib
+
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
+
+GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+# opcodes
+CONT = 0x0
+TEXT = 0x1
+BINARY = 0x2
+CLOSE = 0x8
+PING = 0x9
+PONG = 0xA
+
+# close status codes
+CLOSE_NORMAL = 1000
+CLOSE_PROTOCOL_ERROR = 1002
+CLOSE_TOO_BIG = 1009
+
+
+class ProtocolError(Exception):
+    """The peer sent a frame that breaks RFC 6455 (or our size limit)"""
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+
+def accept_key(key):
+    """Return the Sec-WebSocket-Accept value for a Sec-WebSocket-Key"""
+    if isinstance(key, str):
+        key = key.encode()
+    digest = hashlib.sha1(key + GUID).digest()
+    return binascii.b2a_base64(digest).strip()
+
+
+def is_upgrade(request):
+    """True if an httpreq.Request asks for a WebSocket upgrade"""
+    return (
+        request.method == "GET"
+        and request.header("upgrade", "").lower() == "websocket"
+        and "upgrade" in request.header("connection", "").lower()
+        and request.header("sec-websocket-version") == "13"
+        and bool(request.header("sec-websocket-key"))
+    )
+
+
+def upgrade_response(key):
+    """Return the 101 Switching Protocols response for a handshake"""
+    return (
+        b"HTTP/1.1 101 Switching Protocols\r\n"
+        b"Upgrade: websocket\r\n"
+        b"Connection: Upgrade\r\n"
+        b"Sec-WebSocket-Accept: " + accept_key(key) + b"\r\n\r\n"
+    )
+
+
+def frame_header(opcode, length):
+    """Return the header of an unmasked, final server frame with a payload of length bytes"""
+    first = 0x80 | opcode
+    if length < 126:
+        return bytes((first, length))
+    if length < 0x10000:
+        return bytes((first, 126, length >> 8, length & 0xFF))
+    return bytes((first, 127)) + length.to_bytes(8, "big")
+
+
+def frame(opcode, payload):
+    """Return a complete server frame as bytes"""
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8")
+    return frame_header(opcode, len(payload)) + payload
+
+
+def unmask(payload, mask):
+    """XOR a client payload with its 4-byte mask (in place for bytearray)"""
+    for i in range(len(payload)):
+        payload[i] ^= mask[i & 3]
+    return payload
+
+
+class WebSocket:
+    """Server side of one WebSocket connection on asyncio streams.
+
+    recv() returns complete text/binary messages, joining fragments and answering
+    ping and close frames on its own. Sends are serialized with a lock so a reader
+    task and a writer task may share the connection.
+    """
+
+    def __init__(self, reader, writer, max_size=1024):
+        self.reader = reader
+        self.writer = writer
+        self.max_size = max_size
+        self.closed = False
+        self._lock = asyncio.Lock()
+
+    async def _read_frame(self):
+        head = await self.reader.readexactly(2)
+        fin = head[0] & 0x80
+        opcode = head[0] & 0x0F
+        if head[0] & 0x70:
+            raise ProtocolError(CLOSE_PROTOCOL_ERROR, "reserved bits set")
+        if not head[1] & 0x80:
+            raise ProtocolError(CLOSE_PROTOCOL_ERROR, "client frame not masked")
+        length = head[1] & 0x7F
+        if length == 126:
+            length = int.from_bytes(await self.reader.readexactly(2), "big")
+        elif length == 127:
+            length = int.from_bytes(await self.reader.readexactly(8), "big")
+        if opcode >= CLOSE and (length > 125 or not fin):
+            raise ProtocolError(CLOSE_PROTOCOL_ERROR, "bad control frame")
+        if length > self.max_size:
+            raise ProtocolError(CLOSE_TOO_BIG, "message too big")
+        mask = await self.reader.readexactly(4)
+        payload = bytearray(await self.reader.readexactly(length)) if length else bytearray()
+        return fin, opcode, unmask(payload, mask)
+
+    async def recv(self):
+        """Return (opcode, payload) of the next message, or None once the connection is closed"""
+        message = None
+        message_opcode = None
+        while not self.closed:
+            try:
+                fin, opcode, payload = await self._read_frame()
+            except ProtocolError as e:
+                await self.close(e.code)
+                return None
+            except (EOFError, OSError):  # IncompleteReadError is an EOFError
+                self.closed = True
+                return None
+
+            if opcode == PING:
+                await self.send(PONG, payload)
+            elif opcode == PONG:
+                pass
+            elif opcode == CLOSE:
+                code = int.from_bytes(payload[:2], "big") if len(payload) >= 2 else CLOSE_NORMAL
+                await self.close(code)
+                return None
+            elif opcode == CONT:
+                if message is None:
+                    await self.close(CLOSE_PROTOCOL_ERROR)
+                    return None
+                message += payload
+            elif opcode in (TEXT, BINARY):
+                if message is not None:
+                    await self.close(CLOSE_PROTOCOL_ERROR)
+                    return None
+                message = payload
+                message_opcode = opcode
+            else:
+                await self.close(CLOSE_PROTOCOL_ERROR)
+                return None
+
+            if message is not None:
+                if len(message) > self.max_size:
+                    await self.close(CLOSE_TOO_BIG)
+                    return None
+                if fin:
+                    return message_opcode, bytes(message)
+        return None
+
+    async def send_raw(self, data):
+        """Write already encoded frame bytes (e.g. one frame shared by many clients)"""
+        async with self._lock:
+            self.writer.write(data)
+            await self.writer.drain()
+
+    async def send(self, opcode, payload):
+        if self.closed:
+            raise OSError("websocket closed")
+        await self.send_raw(frame(opcode, payload))
+
+    async def send_text(self, text):
+        await self.send(TEXT, text)
+
+    async def close(self, code=CLOSE_NORMAL):
+        """Send a close frame (once); the caller closes the TCP connection afterwards"""
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            await self.send_raw(frame(CLOSE, code.to_bytes(2, "big")))
+        except OSError:
+            pass
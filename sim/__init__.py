@@ -0,0 +1,99 @@
+"""
+PC(CPython)에서 피코 스크립트를 실행하기 위한 가짜 하드웨어 (I2C 센서, OLED, ADC, PWM, 네오픽셀, WiFi)
+
+install() 을 부르면 machine / neopixel / network / framebuf / micropython / utime / ntptime
+모듈 대신 이 패키지의 가짜 모듈이 import 되고, time 모듈에 ticks_ms 같은 MicroPython 함수가 생깁니다.
+가짜 장치는 모두 버스 트랜잭션 수와 (계산한) 버스 시간을 세고, 그 시간만큼 가상 시계가 흐릅니다.
+
+사용 예:
+    python3 -m sim 06_web_dashboard_WIFI.py --seconds 30
+    python3 -m sim 04_temp.py --seconds 10 --json
+
+    import sim
+    board = sim.install()
+    board.aht20.temperature = 31.5
+    exec(open("04_temp_alarm.py").read())
+"""
+
+import importlib
+import os
+import sys
+
+from .clock import Clock, SimulationEnd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LIB = os.path.join(ROOT, "lib")
+
+MODULES = ("machine", "neopixel", "network", "framebuf", "micropython", "ntptime")
+HEAP_BYTES = 192 * 1024  # 피코 W 의 MicroPython 힙 크기 (대략)
+
+board = None
+clock = None
+
+
+def install(board_obj=None, realtime=False, seconds=None, start_ms=0):
+    """Install the simulated modules and return the Board.
+
+    realtime -- sleep() really waits; otherwise sleeps only advance the simulated clock
+    seconds -- end the simulation (SimulationEnd) after this much simulated time
+    start_ms -- initial ticks_ms() value, e.g. close to the 2**30 wrap
+    """
+    global board, clock
+    from .board import Board
+
+    clock = Clock(realtime=realtime, start_ms=start_ms)
+    if seconds is not None:
+        clock.end_after(seconds * 1000)
+    board = board_obj or Board()
+    clock.patch_time()
+    for name in MODULES:
+        sys.modules[name] = importlib.import_module("sim." + name)
+    import time
+
+    sys.modules["utime"] = time
+    _patch_gc()
+    if LIB not in sys.path:
+        sys.path.insert(0, LIB)
+    return board
+
+
+GC_BLOCK_BYTES = 16  # MicroPython 힙의 블록 크기
+
+
+def _mem_alloc():
+    """Bytes traced by tracemalloc while it runs (tracemalloc.start(), python3 -X tracemalloc).
+
+    Otherwise an estimate from the number of allocated blocks, so that scripts calling
+    it on every reading (metrics.HeapMonitor) are not slowed down by tracing.
+    """
+    import tracemalloc
+
+    if tracemalloc.is_tracing():
+        return tracemalloc.get_traced_memory()[0]
+    return sys.getallocatedblocks() * GC_BLOCK_BYTES
+
+
+def _patch_gc():
+    """Add MicroPython's gc.mem_alloc()/mem_free()/threshold() to CPython's gc"""
+    import gc
+
+    if hasattr(gc, "mem_alloc"):
+        return
+    gc.mem_alloc = _mem_alloc
+    gc.mem_free = lambda: max(HEAP_BYTES - _mem_alloc(), 0)
+    gc.threshold = lambda amount=None: -1 if amount is None else None
+
+
+def stats():
+    """Counters of the clock and every simulated device, as a JSON-friendly dict"""
+    result = {"clock": clock.stats()}
+    result.update(board.stats())
+    return result
+
+
+def reset_stats():
+    clock.reset_stats()
+    board.reset_stats()
+
+
+__all__ = ["install", "stats", "reset_stats", "Clock", "SimulationEnd", "board", "clock"]
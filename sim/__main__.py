@@ -0,0 +1,87 @@
+"""
+저장소의 피코 스크립트를 가짜 하드웨어로 실행하고 버스/장치 통계를 출력
+
+사용 예:
+    python3 -m sim 04_temp.py --seconds 10
+    python3 -m sim 04_temp_alarm.py --seconds 20 --set aht20.temperature=30 --json
+    python3 -m sim 04_button_led.py --seconds 5 --set inputs.20=0     (버튼 누름)
+    python3 -m sim 06_web_dashboard_WIFI.py --seconds 60    (그동안 http://127.0.0.1:8080 접속 가능)
+    printf 'Class 1\\n' | python3 -m sim 02_danger_AI.py --seconds 5
+
+파일(로그, 측정 기록)은 --fs 폴더(기본: 임시 폴더)에 만들어집니다.
+"""
+
+import argparse
+import json
+import os
+import runpy
+import shutil
+import sys
+import tempfile
+
+import sim
+
+
+def apply_setting(board, text):
+    """'aht20.temperature=30' -> board.aht20.temperature = 30.0, 'inputs.20=0' -> board.inputs[20] = 0.0"""
+    target, _, value = text.partition("=")
+    path = [int(name) if name.isdigit() else name for name in target.split(".")]
+    obj = board
+    for name in path[:-1]:
+        obj = obj[name] if isinstance(obj, dict) else getattr(obj, name)
+    if isinstance(obj, dict):
+        obj[path[-1]] = float(value)
+    else:
+        setattr(obj, path[-1], float(value))
+
+
+def run_script(path, seconds=None, realtime=False, fs=None, settings=()):
+    """Run one script under the simulator; returns (outcome, stats)"""
+    path = os.path.abspath(path)
+    board = sim.install(realtime=realtime, seconds=seconds)
+    for text in settings:
+        apply_setting(board, text)
+    sys.path.insert(0, os.path.dirname(path))
+    directory = fs or tempfile.mkdtemp(prefix="sim-fs-")
+    cwd = os.getcwd()
+    os.chdir(directory)
+    sys.argv = [path]
+    try:
+        runpy.run_path(path, run_name="__main__")
+        outcome = "finished"
+    except sim.SimulationEnd:
+        outcome = "time limit"
+    except KeyboardInterrupt:
+        outcome = "interrupted"
+    except SystemExit as e:
+        outcome = "exit %s" % (e.code,)
+    finally:
+        sim.clock.end_after(None)
+        os.chdir(cwd)
+        if fs is None:
+            shutil.rmtree(directory, ignore_errors=True)
+    return outcome, sim.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="피코 스크립트를 가짜 하드웨어로 실행")
+    parser.add_argument("script", help="실행할 스크립트 (예: 04_temp.py)")
+    parser.add_argument("--seconds", type=float, default=30, help="가상 시간으로 이만큼 지나면 멈춤")
+    parser.add_argument("--realtime", action="store_true", help="sleep 을 실제로 기다림 (기본: 가상 시계만 넘김)")
+    parser.add_argument("--fs", help="스크립트가 파일을 만들 폴더 (기본: 임시 폴더, 끝나면 지움)")
+    parser.add_argument("--set", action="append", default=[], metavar="장치.속성=값", help="예: bh1750.lux=20")
+    parser.add_argument("--json", action="store_true", help="통계를 JSON 한 줄로 출력")
+    args = parser.parse_args()
+
+    outcome, stats = run_script(args.script, args.seconds, args.realtime, args.fs, args.set)
+    stats["outcome"] = outcome
+    if args.json:
+        print(json.dumps(stats))
+        return
+    print("\n--- 시뮬레이션 종료: %s ---" % outcome)
+    for key, value in stats.items():
+        print("%10s: %s" % (key, json.dumps(value)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+가짜 피코 W 보드 (I2C 버스와 연결된 장치, ADC 입력, 핀 입력, 출력 기록, WiFi)
+"""
+
+import errno
+
+import sim
+
+from . import signals
+from .devices import AHT20, BH1750, SSD1306
+
+ADC_PINS = {26: 0, 27: 1, 28: 2, 29: 3}  # GPIO -> ADC 채널 (4 = 내부 온도 센서)
+
+
+def i2c_bus_us(freq, data_bytes):
+    """Time of one I2C transfer: start, address byte, data bytes (9 clocks each with ACK), stop"""
+    return (2 + 9 * (1 + data_bytes)) * 1000000 // freq
+
+
+class Bus:
+    """One I2C controller with the devices wired to it"""
+
+    def __init__(self, bus_id):
+        self.id = bus_id
+        self.devices = {}
+        self.reset_stats()
+
+    def attach(self, address, device):
+        self.devices[address] = device
+        return device
+
+    def reset_stats(self):
+        self.transactions = 0
+        self.bytes_written = 0
+        self.bytes_read = 0
+        self.busy_us = 0
+        self.nacks = 0
+        self.by_address = {}
+
+    def _account(self, address, freq, written, read):
+        us = i2c_bus_us(freq, written + read)
+        self.transactions += 1
+        self.bytes_written += written
+        self.bytes_read += read
+        self.busy_us += us
+        entry = self.by_address.setdefault(address, [0, 0, 0])
+        entry[0] += 1
+        entry[1] += written + read
+        entry[2] += us
+        sim.clock.advance_us(us)
+
+    def _device(self, address):
+        device = self.devices.get(address)
+        if device is None:
+            self.nacks += 1
+            raise OSError(errno.EIO, "I2C address 0x%02x did not acknowledge" % address)
+        return device
+
+    def write(self, address, data, freq):
+        self._account(address, freq, len(data), 0)
+        self._device(address).write(bytes(data))
+        return len(data)
+
+    def read(self, address, count, freq):
+        self._account(address, freq, 0, count)
+        return self._device(address).read(count)
+
+    def stats(self):
+        return {
+            "transactions": self.transactions,
+            "bytes_written": self.bytes_written,
+            "bytes_read": self.bytes_read,
+            "busy_us": self.busy_us,
+            "nacks": self.nacks,
+            "by_address": {
+                "0x%02x" % address: {"transactions": t, "bytes": b, "busy_us": us}
+                for address, (t, b, us) in sorted(self.by_address.items())
+            },
+        }
+
+
+class Wifi:
+    """Loopback WiFi: connect() succeeds after connect_ms and the station gets 127.0.0.1,
+    so servers on the Pico are reachable from the PC. fail=True makes connects fail."""
+
+    def __init__(self, connect_ms=1500, fail=False, ip="127.0.0.1"):
+        self.connect_ms = connect_ms
+        self.fail = fail
+        self.ifconfig = (ip, "255.0.0.0", "127.0.0.1", "127.0.0.1")
+        self.ssid = None
+        self.active = False
+        self.connected_at = None
+        self.connects = 0
+        self.drops = 0
+
+    def connect(self, ssid):
+        self.ssid = ssid
+        self.connects += 1
+        self.connected_at = None if self.fail else sim.clock.now_us() + self.connect_ms * 1000
+
+    def isconnected(self):
+        return self.active and self.connected_at is not None and sim.clock.now_us() >= self.connected_at
+
+    def drop(self):
+        """Lose the link, as when the access point goes away"""
+        self.connected_at = None
+        self.drops += 1
+
+    def stats(self):
+        return {"connects": self.connects, "drops": self.drops, "connected": self.isconnected()}
+
+
+class Board:
+    """Everything the scripts can reach through machine/neopixel/network.
+
+    I2C bus 0 has the AHT20 (0x38), BH1750 (0x23) and SSD1306 (0x3C) of the kit.
+    adc maps ADC channels to signal sources (functions of simulated µs returning
+    a 0..65535 level); channel 2 (GP28) plays signals.default_mic(). inputs maps
+    pin ids to levels (or functions of simulated seconds) for Pin.value().
+    PWM, NeoPixel and Pin outputs register themselves in pwm, neopixels and
+    outputs when the script creates them.
+    """
+
+    def __init__(self):
+        self.i2c = {0: Bus(0), 1: Bus(1)}
+        self.aht20 = self.i2c[0].attach(AHT20.ADDRESS, AHT20())
+        self.bh1750 = self.i2c[0].attach(BH1750.ADDRESS, BH1750())
+        self.oled = self.i2c[0].attach(SSD1306.ADDRESS, SSD1306())
+        self.adc = {
+            0: signals.Constant(0),
+            1: signals.Constant(0),
+            2: signals.default_mic(),
+            3: signals.Constant(21845),  # VSYS/3 = 5 V / 3
+            4: signals.Constant(14022),  # 내부 온도 센서 0.706 V (27 °C)
+        }
+        self.inputs = {}
+        self.outputs = {}
+        self.pwm = {}
+        self.neopixels = {}
+        self.wifi = Wifi()
+        self.adc_reads = 0
+        self.unique_id = bytes.fromhex("e6614c311b4f8a2e")
+
+    def input_level(self, pin_id, pull_up):
+        level = self.inputs.get(pin_id, 1 if pull_up else 0)
+        return int(level((sim.clock.now_us() - sim.clock.origin_us) / 1000000)) if callable(level) else int(level)
+
+    def reset_stats(self):
+        for bus in self.i2c.values():
+            bus.reset_stats()
+            for device in bus.devices.values():
+                device.reset_stats()
+        for recorder in list(self.pwm.values()) + list(self.neopixels.values()):
+            recorder.reset_stats()
+        self.adc_reads = 0
+
+    def stats(self):
+        result = {"i2c%d" % bus_id: bus.stats() for bus_id, bus in self.i2c.items() if bus.transactions}
+        for bus in self.i2c.values():
+            for device in bus.devices.values():
+                result[device.name] = device.stats()
+        result["adc_reads"] = self.adc_reads
+        result["pwm"] = {str(pin): pwm.stats() for pin, pwm in self.pwm.items()}
+        result["neopixel"] = {str(pin): strip.stats() for pin, strip in self.neopixels.items()}
+        result["pins"] = {str(pin): value for pin, value in self.outputs.items()}
+        result["wifi"] = self.wifi.stats()
+        return result
@@ -0,0 +1,123 @@
+"""
+가상 시계 (MicroPython ticks 함수, 잠자기, 버스 시간)
+"""
+
+import time
+
+# 바꾸기 전의 CPython 함수 (install() 이 time 모듈을 고쳐도 여기서는 진짜 시간을 씀)
+_perf_counter_ns = time.perf_counter_ns
+_real_sleep = time.sleep
+_real_time = time.time
+
+TICKS_PERIOD = 1 << 30  # rp2 포트의 ticks_ms()/ticks_us() 주기
+TICKS_MAX = TICKS_PERIOD - 1
+TICKS_HALFPERIOD = TICKS_PERIOD // 2
+
+
+def ticks_diff(end, start):
+    """MicroPython's wrap-around aware ticks difference"""
+    return ((end - start + TICKS_HALFPERIOD) & TICKS_MAX) - TICKS_HALFPERIOD
+
+
+def ticks_add(ticks, delta):
+    return (ticks + delta) & TICKS_MAX
+
+
+class SimulationEnd(SystemExit):
+    """Raised by the clock when the simulated time limit is reached.
+
+    It derives from SystemExit so that the scripts' "except Exception" handlers do
+    not swallow it and asyncio passes it on out of a task and asyncio.run().
+    """
+
+
+class Clock:
+    """Simulated time: real elapsed time plus skipped sleeps plus simulated bus time.
+
+    In the default (fast) mode time.sleep()/sleep_ms()/sleep_us() return at once and
+    only move the clock forward, so a script that sleeps for minutes runs in a moment.
+    With realtime=True the sleeps really wait. Device models call advance_us() for the
+    time a bus transfer would take on the Pico; it is added to the clock in both modes.
+    """
+
+    def __init__(self, realtime=False, start_ms=0):
+        self.realtime = realtime
+        self._start_ns = _perf_counter_ns()
+        self._start_wall = _real_time()
+        self.origin_us = start_ms * 1000  # now_us() 의 시작값 (장치 입력 함수는 여기서부터 잰 시간을 받음)
+        self._offset_us = self.origin_us
+        self._deadline_us = None
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.slept_us = 0
+        self.bus_us = 0
+        self._stats_from_us = self._now()
+
+    def _now(self):
+        return (_perf_counter_ns() - self._start_ns) // 1000 + self._offset_us
+
+    def now_us(self):
+        """Simulated microseconds since the start (not wrapped)"""
+        now = self._now()
+        if self._deadline_us is not None and now >= self._deadline_us:
+            # 누가 삼켜 버려도 다시 멈추도록, finally 블록이 실행될 시간(5초)을 두고 또 발생
+            self._deadline_us = now + 5000000
+            raise SimulationEnd("simulated time limit reached")
+        return now
+
+    def end_after(self, ms):
+        """End the simulation ms of simulated time from now (None: no limit)"""
+        self._deadline_us = None if ms is None else self._now() + int(ms * 1000)
+
+    def advance_us(self, us):
+        """Account for time spent by simulated hardware (bus transfers, conversions)"""
+        self._offset_us += us
+        self.bus_us += us
+
+    def sleep_us(self, us):
+        if us <= 0:
+            return
+        if self.realtime:
+            _real_sleep(us / 1000000)
+        else:
+            self._offset_us += us
+        self.slept_us += us
+        self.now_us()  # 시간 제한 확인
+
+    # --- MicroPython time 함수 ---
+    def ticks_ms(self):
+        return (self.now_us() // 1000) & TICKS_MAX
+
+    def ticks_us(self):
+        return self.now_us() & TICKS_MAX
+
+    def sleep_ms(self, ms):
+        self.sleep_us(int(ms * 1000))
+
+    def sleep(self, seconds):
+        self.sleep_us(int(seconds * 1000000))
+
+    def time(self):
+        """Wall-clock seconds (int, like MicroPython), moved forward by skipped sleeps"""
+        return int(self._start_wall + self.now_us() / 1000000)
+
+    def patch_time(self):
+        """Give the time module the MicroPython functions, driven by this clock"""
+        time.ticks_ms = self.ticks_ms
+        time.ticks_us = self.ticks_us
+        time.ticks_cpu = self.ticks_us
+        time.ticks_diff = ticks_diff
+        time.ticks_add = ticks_add
+        time.sleep_ms = self.sleep_ms
+        time.sleep_us = self.sleep_us
+        time.sleep = self.sleep
+        time.time = self.time
+
+    def stats(self):
+        return {
+            "elapsed_ms": (self._now() - self._stats_from_us) // 1000,
+            "slept_ms": self.slept_us // 1000,
+            "bus_us": self.bus_us,
+            "realtime": self.realtime,
+        }
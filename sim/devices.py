@@ -0,0 +1,380 @@
+"""
+가짜 I2C 장치 (AHT20 온습도, BH1750 조도, SSD1306 OLED) - 데이터시트의 명령/레지스터대로 동작
+"""
+
+import sim
+
+
+def _value(source, t_us):
+    """A number, or a function of the simulated seconds since the start"""
+    return source((t_us - sim.clock.origin_us) / 1000000) if callable(source) else source
+
+
+def crc8(data, poly=0x31, init=0xFF):
+    """CRC-8 as used by the AHT20 (x^8 + x^5 + x^4 + 1, init 0xFF)"""
+    crc = init
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = ((crc << 1) ^ poly) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+    return crc
+
+
+class I2CDevice:
+    """Base class: a device answers write(data) and read(count) for one address"""
+
+    name = "device"
+
+    def __init__(self):
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.writes = 0
+        self.reads = 0
+        self.ignored = 0  # commands the device did not accept
+
+    def write(self, data):
+        self.writes += 1
+
+    def read(self, count):
+        self.reads += 1
+        return b"\xff" * count
+
+    def stats(self):
+        return {"writes": self.writes, "reads": self.reads, "ignored": self.ignored}
+
+
+class AHT20(I2CDevice):
+    """AHT20 temperature/humidity sensor at 0x38.
+
+    Commands: 0xBA soft reset, 0xBE 0x08 0x00 initialize (0xE1 on the AHT10),
+    0xAC 0x33 0x00 trigger. A read returns the status byte (bit 7 busy, bit 3
+    calibrated), 20-bit humidity, 20-bit temperature and a CRC-8 byte. While a
+    conversion runs the busy bit is set and the previous result is returned.
+
+    temperature (°C) and humidity (%RH) may be numbers or functions of the
+    simulated time in seconds; they are sampled when a conversion starts.
+    """
+
+    name = "aht20"
+    ADDRESS = 0x38
+    CMD_TRIGGER = 0xAC
+    CMD_SOFTRESET = 0xBA
+    STATUS_BUSY = 0x80
+    STATUS_CALIBRATED = 0x08
+
+    def __init__(self, temperature=22.5, humidity=45.0, conversion_ms=75, initialize_commands=(0xBE, 0xE1)):
+        self.temperature = temperature
+        self.humidity = humidity
+        self.conversion_us = conversion_ms * 1000
+        self.initialize_commands = initialize_commands
+        self.calibrated = True  # AHT20 은 공장에서 보정되어 나옴
+        self._busy_until = 0
+        self._data = bytearray(5)
+        self._pending = None
+        super().__init__()
+
+    def reset_stats(self):
+        super().reset_stats()
+        self.conversions = 0
+
+    def _busy(self, now):
+        if self._pending is not None and now >= self._busy_until:
+            self._data[:] = self._pending
+            self._pending = None
+        return now < self._busy_until
+
+    def write(self, data):
+        super().write(data)
+        now = sim.clock.now_us()
+        if not data:
+            return  # 주소만 보내는 확인 (scan)
+        command = data[0]
+        if command == self.CMD_SOFTRESET:
+            self._busy_until = now + 20000
+        elif command in self.initialize_commands and bytes(data[1:3]) == b"\x08\x00":
+            self.calibrated = True
+            self._busy_until = now + 10000
+        elif command == self.CMD_TRIGGER and bytes(data[1:3]) == b"\x33\x00" and not self._busy(now):
+            self._pending = self._encode(now)
+            self._busy_until = now + self.conversion_us
+            self.conversions += 1
+        else:
+            self.ignored += 1
+
+    def _encode(self, now):
+        humidity = min(max(_value(self.humidity, now), 0.0), 100.0)
+        temperature = min(max(_value(self.temperature, now), -50.0), 150.0)
+        h = min(int(humidity * 0x100000 / 100), 0xFFFFF)
+        t = min(int((temperature + 50) * 0x100000 / 200), 0xFFFFF)
+        return bytes((h >> 12, (h >> 4) & 0xFF, ((h & 0xF) << 4) | (t >> 16), (t >> 8) & 0xFF, t & 0xFF))
+
+    def read(self, count):
+        self.reads += 1
+        busy = self._busy(sim.clock.now_us())
+        status = 0x10 | (self.STATUS_BUSY if busy else 0) | (self.STATUS_CALIBRATED if self.calibrated else 0)
+        frame = bytes((status,)) + bytes(self._data)
+        frame += bytes((crc8(frame),))
+        return (frame + b"\xff" * count)[:count]
+
+    def stats(self):
+        result = super().stats()
+        result["conversions"] = self.conversions
+        return result
+
+
+class BH1750(I2CDevice):
+    """BH1750 ambient light sensor at 0x23 (ADDR low) or 0x5C.
+
+    Opcodes: 0x00 power down, 0x01 power on, 0x07 reset (clears the data register),
+    0x10/0x11/0x13 continuous H/H2/L resolution, 0x20/0x21/0x23 one-time (powers
+    down after the conversion), 0b01000_xxx / 0b011_xxxxx MTreg high/low bits.
+    A conversion takes 120 ms (H, H2) or 16 ms (L) at MTreg 69, scaled with
+    MTreg; an MTreg change is used from the next conversion on. The 2-byte data
+    register holds lux * 1.2 * MTreg / 69 counts (doubled in H2, steps of 4 in L).
+
+    lux may be a number or a function of the simulated time in seconds.
+    """
+
+    name = "bh1750"
+    ADDRESS = 0x23
+    TYPICAL_MS = {0: 120, 1: 120, 3: 16}  # resolution bits -> conversion time at MTreg 69
+
+    def __init__(self, lux=320.0):
+        self.lux = lux
+        self.powered = False
+        self.mtreg = 69
+        self._mtreg_high = 69 >> 5
+        self.mode = None  # (continuous, resolution) while converting
+        self._conversion_start = 0
+        self._conversion_mtreg = 69
+        self.register = 0
+        super().__init__()
+
+    def reset_stats(self):
+        super().reset_stats()
+        self.conversions = 0
+
+    def _conversion_us(self, mtreg):
+        return self.TYPICAL_MS[self.mode[1]] * 1000 * mtreg // 69
+
+    def _count(self, now, mtreg):
+        counts = _value(self.lux, now) * 1.2 * mtreg / 69
+        if self.mode[1] == 1:
+            counts *= 2
+        counts = min(max(int(counts), 0), 0xFFFF)
+        return counts & ~3 if self.mode[1] == 3 else counts
+
+    def _update(self, now):
+        """Finish the conversions that ended before now"""
+        if self.mode is None:
+            return
+        end = self._conversion_start + self._conversion_us(self._conversion_mtreg)
+        if now < end:
+            return
+        self.register = self._count(end, self._conversion_mtreg)
+        self.conversions += 1
+        if not self.mode[0]:
+            self.mode = None
+            self.powered = False
+            return
+        # 이어지는 변환은 지금의 MTreg 사용
+        period = self._conversion_us(self.mtreg)
+        done = (now - end) // period
+        if done:
+            self.register = self._count(end + done * period, self.mtreg)
+            self.conversions += done
+        self._conversion_start = end + done * period
+        self._conversion_mtreg = self.mtreg
+
+    def write(self, data):
+        super().write(data)
+        now = sim.clock.now_us()
+        if not data:
+            return
+        self._update(now)
+        for opcode in data:
+            if opcode == 0x00:
+                self.powered = False
+                self.mode = None
+            elif opcode == 0x01:
+                self.powered = True
+            elif opcode == 0x07:
+                if self.powered:
+                    self.register = 0
+                else:
+                    self.ignored += 1
+            elif opcode in (0x10, 0x11, 0x13, 0x20, 0x21, 0x23):
+                self.powered = True
+                self.mode = (opcode < 0x20, opcode & 0x03)
+                self._conversion_start = now
+                self._conversion_mtreg = self.mtreg
+            elif opcode & 0xF8 == 0x40:
+                self._mtreg_high = opcode & 0x07
+            elif opcode & 0xE0 == 0x60:
+                self.mtreg = (self._mtreg_high << 5) | (opcode & 0x1F)
+            else:
+                self.ignored += 1
+
+    def read(self, count):
+        self.reads += 1
+        self._update(sim.clock.now_us())
+        data = bytes((self.register >> 8, self.register & 0xFF))
+        return (data + b"\xff" * count)[:count]
+
+    def stats(self):
+        result = super().stats()
+        result["conversions"] = self.conversions
+        result["mtreg"] = self.mtreg
+        return result
+
+
+class SSD1306(I2CDevice):
+    """SSD1306 OLED controller at 0x3C that keeps its 128x64 display RAM.
+
+    Each transaction starts with a control byte: 0x00 = the rest are commands,
+    0x40 = the rest are display data, Co bit (0x80) set = one byte follows, then
+    another control byte. Commands with arguments are parsed (also across
+    transactions); data is written to RAM at the column/page window set with
+    0x21/0x22 (horizontal and vertical addressing) or 0xB0../0x00../0x10.. (page
+    addressing), wrapping inside the window as the chip does.
+
+    ram has the same layout as a MONO_VLSB framebuffer of the full display.
+    """
+
+    name = "ssd1306"
+    ADDRESS = 0x3C
+    ARGUMENTS = {
+        0x20: 1, 0x21: 2, 0x22: 2, 0x81: 1, 0x8D: 1, 0xA3: 2, 0xA8: 1, 0xAD: 1,
+        0xD3: 1, 0xD5: 1, 0xD9: 1, 0xDA: 1, 0xDB: 1,
+        0x26: 6, 0x27: 6, 0x29: 5, 0x2A: 5,
+    }
+
+    def __init__(self, width=128, height=64):
+        self.width = width
+        self.height = height
+        self.pages = height // 8
+        self.ram = bytearray(128 * self.pages)
+        self.display_on = False
+        self.inverted = False
+        self.contrast = 0x7F
+        self.addressing = 2  # 켤 때는 page addressing
+        self.column_range = [0, 127]
+        self.page_range = [0, self.pages - 1]
+        self.column = 0
+        self.page = 0
+        self._command = None  # 인자를 기다리는 명령과 지금까지 받은 인자
+        super().__init__()
+
+    def reset_stats(self):
+        super().reset_stats()
+        self.data_bytes = 0
+        self.command_bytes = 0
+        self.data_writes = 0
+        self.command_writes = 0
+
+    def write(self, data):
+        super().write(data)
+        index = 0
+        length = len(data)
+        wrote_data = wrote_command = False
+        while index < length:
+            control = data[index]
+            index += 1
+            single = control & 0x80
+            end = min(index + 1, length) if single else length
+            if control & 0x40:
+                self._data(data[index:end])
+                wrote_data = True
+            else:
+                for byte in data[index:end]:
+                    self._command_byte(byte)
+                wrote_command = wrote_command or end > index
+            index = end
+        self.data_writes += wrote_data
+        self.command_writes += wrote_command
+
+    def _data(self, data):
+        self.data_bytes += len(data)
+        ram = self.ram
+        for byte in data:
+            ram[self.page * 128 + self.column] = byte
+            self._advance()
+
+    def _advance(self):
+        c0, c1 = self.column_range
+        p0, p1 = self.page_range
+        if self.addressing == 0:  # horizontal
+            if self.column >= c1:
+                self.column = c0
+                self.page = p0 if self.page >= p1 else self.page + 1
+            else:
+                self.column += 1
+        elif self.addressing == 1:  # vertical
+            if self.page >= p1:
+                self.page = p0
+                self.column = c0 if self.column >= c1 else self.column + 1
+            else:
+                self.page += 1
+        else:  # page: 열만 늘어나고 끝에서 처음 열로
+            self.column = 0 if self.column >= 127 else self.column + 1
+
+    def _command_byte(self, byte):
+        self.command_bytes += 1
+        if self._command is not None:
+            self._command.append(byte)
+            if len(self._command) <= self.ARGUMENTS[self._command[0]]:
+                return
+            command, self._command = self._command, None
+            self._execute(command)
+            return
+        if byte in self.ARGUMENTS:
+            self._command = [byte]
+            return
+        self._execute((byte,))
+
+    def _execute(self, command):
+        op = command[0]
+        if op == 0x20:
+            self.addressing = command[1] & 0x03
+        elif op == 0x21:
+            self.column_range = [command[1] & 0x7F, command[2] & 0x7F]
+            self.column = self.column_range[0]
+        elif op == 0x22:
+            self.page_range = [command[1] & 0x07, command[2] & 0x07]
+            self.page = self.page_range[0]
+        elif op == 0x81:
+            self.contrast = command[1]
+        elif op in (0xAE, 0xAF):
+            self.display_on = op == 0xAF
+        elif op in (0xA6, 0xA7):
+            self.inverted = op == 0xA7
+        elif 0xB0 <= op <= 0xB7:
+            self.page = op & 0x07
+        elif op <= 0x0F:
+            self.column = (self.column & 0xF0) | op
+        elif op <= 0x1F:
+            self.column = (self.column & 0x0F) | ((op & 0x07) << 4)
+
+    def read(self, count):
+        self.reads += 1
+        status = 0x00 if self.display_on else 0x40  # bit 6: display off
+        return bytes((status,)) * count
+
+    def pixel(self, x, y):
+        return (self.ram[(y >> 3) * 128 + x] >> (y & 7)) & 1
+
+    def render(self, on="#", off="."):
+        """The display RAM as text, one string per pixel row"""
+        return ["".join(on if self.pixel(x, y) else off for x in range(self.width)) for y in range(self.height)]
+
+    def stats(self):
+        result = super().stats()
+        result.update(
+            data_bytes=self.data_bytes,
+            command_bytes=self.command_bytes,
+            data_writes=self.data_writes,
+            command_writes=self.command_writes,
+            display_on=self.display_on,
+        )
+        return result
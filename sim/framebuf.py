@@ -0,0 +1,221 @@
+"""
+가짜 framebuf 모듈 (MONO_VLSB/MONO_HLSB/MONO_HMSB/RGB565/GS8, 8x8 글꼴 text())
+"""
+
+MONO_VLSB = 0
+MVLSB = MONO_VLSB
+RGB565 = 1
+GS4_HMSB = 2
+MONO_HLSB = 3
+MONO_HMSB = 4
+GS2_HMSB = 5
+GS8 = 6
+
+# MicroPython 내장 8x8 글꼴 (font_petme128_8x8): 글자마다 세로 8픽셀 열 8개, 맨 위가 LSB, 문자 32..127
+FONT = bytes.fromhex(
+    "0000000000000000" "0000004f4f000000" "0007070000070700" "147f7f14147f7f14"
+    "00242e6b6b3a1200" "006333180c666300" "00327f4d4d777250" "0000000406030100"
+    "00001c3e63410000" "000041633e1c0000" "082a3e1c1c3e2a08" "0008083e3e080800"
+    "000080e060000000" "0008080808080800" "0000006060000000" "00406030180c0602"
+    "003e7f49457f3e00" "0040447f7f404000" "00627351494f4600" "00226349497f3600"
+    "00181814167f7f10" "00276745457d3900" "003e7f49497b3200" "000303797d070300"
+    "00367f49497f3600" "00266f49497f3e00" "0000002424000000" "000080e464000000"
+    "00081c3663414100" "0014141414141400" "00414163361c0800" "00020351590f0600"
+    "003e7f414d4f2e00" "007c7e0b0b7e7c00" "007f7f49497f3600" "003e7f4141632200"
+    "007f7f41633e1c00" "007f7f4949414100" "007f7f0909010100" "003e7f41497b3a00"
+    "007f7f08087f7f00" "0000417f7f410000" "002060417f3f0100" "007f7f1c36634100"
+    "007f7f4040404000" "007f7f060c067f7f" "007f7f0e1c7f7f00" "003e7f41417f3e00"
+    "007f7f09090f0600" "001e3f21617f5e00" "007f7f19396f4600" "00266f49497b3200"
+    "0001017f7f010100" "003f7f40407f3f00" "001f3f60603f1f00" "007f7f3018307f7f"
+    "0063771c1c776300" "00070f78780f0700" "006171594d474300" "00007f7f41410000"
+    "0002060c18306040" "000041417f7f0000" "00080c06060c0800" "c0c0c0c0c0c0c0c0"
+    "0000010306040000" "00207454547c7800" "007f7f44447c3800" "00387c44446c2800"
+    "00387c44447f7f00" "00387c54545c5800" "00087e7f09030200" "0098bca4a4fc7c00"
+    "007f7f04047c7800" "0000007d7d000000" "0040c08080fd7d00" "007f7f30386c4400"
+    "0000417f7f400000" "007c7c1830187c7c" "007c7c04047c7800" "00387c44447c3800"
+    "00fcfc24243c1800" "00183c2424fcfc00" "007c7c04040c0800" "00485c5454742400"
+    "0004043e7e444400" "003c7c40407c7c00" "001c3c60603c1c00" "001c7c7038707c1c"
+    "00446c38386c4400" "009cbca0e07c3c00" "004464745c4c4400" "0008083e77414100"
+    "000000ffff000000" "004141773e080800" "0002030103020301" "aa55aa55aa55aa55"
+)
+
+
+class FrameBuffer:
+    """Pure Python framebuf.FrameBuffer with the same pixel layout as MicroPython.
+
+    MONO_VLSB (the SSD1306 layout) has byte-wise fast paths for fill() and
+    fill_rect(); the other formats go pixel by pixel.
+    """
+
+    def __init__(self, buffer, width, height, format, stride=None):
+        self.buf = buffer
+        self.width = width
+        self.height = height
+        self.format = format
+        self.stride = width if stride is None else stride
+        if format in (MONO_HLSB, MONO_HMSB):
+            self.stride = (self.stride + 7) & ~7
+
+    # --- 픽셀 하나 ---
+    def _get(self, x, y):
+        buf = self.buf
+        fmt = self.format
+        if fmt == MONO_VLSB:
+            return (buf[(y >> 3) * self.stride + x] >> (y & 7)) & 1
+        if fmt in (MONO_HLSB, MONO_HMSB):
+            index = (x + y * self.stride) >> 3
+            shift = 7 - (x & 7) if fmt == MONO_HLSB else x & 7
+            return (buf[index] >> shift) & 1
+        if fmt == RGB565:
+            index = (x + y * self.stride) * 2
+            return buf[index] | (buf[index + 1] << 8)
+        if fmt == GS8:
+            return buf[x + y * self.stride]
+        if fmt == GS4_HMSB:
+            index = (x + y * self.stride) >> 1
+            return (buf[index] >> 4) & 0x0F if x & 1 == 0 else buf[index] & 0x0F
+        index = (x + y * self.stride) >> 2  # GS2_HMSB
+        return (buf[index] >> ((x & 3) << 1)) & 0x03
+
+    def _set(self, x, y, c):
+        buf = self.buf
+        fmt = self.format
+        if fmt == MONO_VLSB:
+            index = (y >> 3) * self.stride + x
+            bit = 1 << (y & 7)
+            buf[index] = (buf[index] | bit) if c else (buf[index] & ~bit)
+        elif fmt in (MONO_HLSB, MONO_HMSB):
+            index = (x + y * self.stride) >> 3
+            bit = 1 << (7 - (x & 7) if fmt == MONO_HLSB else x & 7)
+            buf[index] = (buf[index] | bit) if c else (buf[index] & ~bit)
+        elif fmt == RGB565:
+            index = (x + y * self.stride) * 2
+            buf[index] = c & 0xFF
+            buf[index + 1] = (c >> 8) & 0xFF
+        elif fmt == GS8:
+            buf[x + y * self.stride] = c & 0xFF
+        elif fmt == GS4_HMSB:
+            index = (x + y * self.stride) >> 1
+            if x & 1 == 0:
+                buf[index] = ((c & 0x0F) << 4) | (buf[index] & 0x0F)
+            else:
+                buf[index] = (buf[index] & 0xF0) | (c & 0x0F)
+        else:
+            index = (x + y * self.stride) >> 2
+            shift = (x & 3) << 1
+            buf[index] = (buf[index] & ~(0x03 << shift)) | ((c & 0x03) << shift)
+
+    def pixel(self, x, y, c=None):
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        if c is None:
+            return self._get(x, y)
+        self._set(x, y, c)
+
+    # --- 채우기 ---
+    def fill(self, c):
+        if self.format == MONO_VLSB:
+            size = self.stride * ((self.height + 7) >> 3)
+            self.buf[:size] = (b"\xff" if c else b"\x00") * size
+            return
+        self.fill_rect(0, 0, self.width, self.height, c)
+
+    def fill_rect(self, x, y, w, h, c):
+        x0 = max(x, 0)
+        y0 = max(y, 0)
+        x1 = min(x + w, self.width)
+        y1 = min(y + h, self.height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        if self.format == MONO_VLSB:
+            buf = self.buf
+            stride = self.stride
+            while y0 < y1:
+                page = y0 >> 3
+                bits_end = min(y1, (page + 1) << 3)
+                mask = ((1 << (bits_end - y0)) - 1) << (y0 & 7)
+                start = page * stride
+                for index in range(start + x0, start + x1):
+                    buf[index] = (buf[index] | mask) if c else (buf[index] & ~mask)
+                y0 = bits_end
+            return
+        for yy in range(y0, y1):
+            for xx in range(x0, x1):
+                self._set(xx, yy, c)
+
+    def hline(self, x, y, w, c):
+        self.fill_rect(x, y, w, 1, c)
+
+    def vline(self, x, y, h, c):
+        self.fill_rect(x, y, 1, h, c)
+
+    def rect(self, x, y, w, h, c, f=False):
+        if f:
+            self.fill_rect(x, y, w, h, c)
+            return
+        self.fill_rect(x, y, w, 1, c)
+        self.fill_rect(x, y + h - 1, w, 1, c)
+        self.fill_rect(x, y, 1, h, c)
+        self.fill_rect(x + w - 1, y, 1, h, c)
+
+    def line(self, x1, y1, x2, y2, c):
+        dx = abs(x2 - x1)
+        dy = -abs(y2 - y1)
+        sx = 1 if x1 < x2 else -1
+        sy = 1 if y1 < y2 else -1
+        err = dx + dy
+        while True:
+            self.pixel(x1, y1, c)
+            if x1 == x2 and y1 == y2:
+                return
+            e2 = 2 * err
+            if e2 >= dy:
+                err += dy
+                x1 += sx
+            if e2 <= dx:
+                err += dx
+                y1 += sy
+
+    # --- 글자, 이동, 복사 ---
+    def text(self, s, x, y, c=1):
+        for char in s:
+            code = ord(char)
+            if code < 32 or code > 127:
+                code = 127
+            glyph = FONT[(code - 32) * 8 : (code - 32) * 8 + 8]
+            for column in range(8):
+                xx = x + column
+                if 0 <= xx < self.width:
+                    bits = glyph[column]
+                    row = 0
+                    while bits:
+                        if bits & 1 and 0 <= y + row < self.height:
+                            self._set(xx, y + row, c)
+                        bits >>= 1
+                        row += 1
+            x += 8
+            if x >= self.width:
+                return
+
+    def scroll(self, xstep, ystep):
+        width, height = self.width, self.height
+        xs = range(width - 1, -1, -1) if xstep > 0 else range(width)
+        ys = range(height - 1, -1, -1) if ystep > 0 else range(height)
+        for y in ys:
+            for x in xs:
+                sx, sy = x - xstep, y - ystep
+                if 0 <= sx < width and 0 <= sy < height:
+                    self._set(x, y, self._get(sx, sy))
+
+    def blit(self, fbuf, x, y, key=-1, palette=None):
+        if isinstance(fbuf, tuple):
+            fbuf = FrameBuffer(fbuf[0], fbuf[1], fbuf[2], fbuf[3], fbuf[4] if len(fbuf) > 4 else None)
+        for sy in range(fbuf.height):
+            for sx in range(fbuf.width):
+                dx, dy = x + sx, y + sy
+                if 0 <= dx < self.width and 0 <= dy < self.height:
+                    c = fbuf._get(sx, sy)
+                    if palette is not None:
+                        c = palette._get(c, 0)
+                    if c != key:
+                        self._set(dx, dy, c)
@@ -0,0 +1,271 @@
+"""
+가짜 machine 모듈 (Pin, I2C, PWM, ADC 와 보드 함수)
+"""
+
+import collections
+
+import sim
+
+from .board import ADC_PINS
+from .clock import SimulationEnd
+from .signals import quantize_u16
+
+
+def _pin_id(pin):
+    if isinstance(pin, Pin):
+        return pin.id
+    if isinstance(pin, str):
+        if pin.startswith("GP") and pin[2:].isdigit():
+            return int(pin[2:])
+        if pin in ("LED", "WL_GPIO0"):
+            return "LED"
+        raise ValueError("unknown pin")
+    if not 0 <= pin <= 29:
+        raise ValueError("invalid pin")
+    return pin
+
+
+class Pin:
+    IN = 0
+    OUT = 1
+    OPEN_DRAIN = 2
+    ALT = 3
+    PULL_UP = 1
+    PULL_DOWN = 2
+    IRQ_FALLING = 4
+    IRQ_RISING = 8
+
+    def __init__(self, id, mode=-1, pull=-1, *, value=None, alt=-1):
+        self.id = _pin_id(id)
+        self.mode = self.IN
+        self.pull = None
+        self._value = 0
+        self._handler = None
+        self.init(mode, pull, value=value)
+
+    def init(self, mode=-1, pull=-1, *, value=None, alt=-1):
+        if mode != -1:
+            self.mode = mode
+        if pull != -1:
+            self.pull = pull
+        if value is not None:
+            self.value(value)
+
+    def value(self, x=None):
+        if x is None:
+            if self.mode == self.OUT:
+                return self._value
+            return sim.board.input_level(self.id, self.pull == self.PULL_UP)
+        self._value = 1 if x else 0
+        sim.board.outputs[self.id] = self._value
+
+    __call__ = value
+
+    def on(self):
+        self.value(1)
+
+    def off(self):
+        self.value(0)
+
+    high = on
+    low = off
+
+    def toggle(self):
+        self.value(not self._value)
+
+    def irq(self, handler=None, trigger=IRQ_FALLING | IRQ_RISING, hard=False):
+        self._handler = handler
+
+    def __repr__(self):
+        return "Pin(%s)" % (self.id,)
+
+
+class I2C:
+    """Hardware I2C controller handle; transfers go to sim.board.i2c[id].
+
+    Bus time per transfer (start, address, data, stop at freq) is added to the
+    simulated clock. A missing device raises OSError(EIO) like the rp2 port.
+    """
+
+    def __init__(self, id, *, scl=None, sda=None, freq=400000, timeout=50000):
+        if id not in (0, 1):
+            raise ValueError("I2C(%r) doesn't exist" % (id,))
+        self.id = id
+        self.freq = freq
+        self.bus = sim.board.i2c[id]
+
+    def init(self, *, scl=None, sda=None, freq=400000, timeout=50000):
+        self.freq = freq
+
+    def scan(self):
+        found = []
+        for address in range(0x08, 0x78):
+            self.bus._account(address, self.freq, 0, 0)
+            if address in self.bus.devices:
+                found.append(address)
+        return found
+
+    def writeto(self, addr, buf, stop=True):
+        return self.bus.write(addr, buf, self.freq)
+
+    def writevto(self, addr, vector, stop=True):
+        return self.bus.write(addr, b"".join(bytes(part) for part in vector), self.freq)
+
+    def readfrom(self, addr, nbytes, stop=True):
+        return self.bus.read(addr, nbytes, self.freq)
+
+    def readfrom_into(self, addr, buf, stop=True):
+        buf[:] = self.bus.read(addr, len(buf), self.freq)
+
+    def writeto_mem(self, addr, memaddr, buf, *, addrsize=8):
+        self.writeto(addr, memaddr.to_bytes(addrsize // 8, "big") + bytes(buf))
+
+    def readfrom_mem(self, addr, memaddr, nbytes, *, addrsize=8):
+        self.writeto(addr, memaddr.to_bytes(addrsize // 8, "big"), False)
+        return self.readfrom(addr, nbytes)
+
+    def readfrom_mem_into(self, addr, memaddr, buf, *, addrsize=8):
+        buf[:] = self.readfrom_mem(addr, memaddr, len(buf), addrsize=addrsize)
+
+
+SoftI2C = I2C
+
+
+class PWM:
+    """PWM output that records its settings; registers itself in sim.board.pwm.
+
+    events keeps the last (ticks_ms, freq, duty_u16) changes; on_ms is the time the
+    duty cycle was non-zero (for a buzzer: how long it sounded).
+    """
+
+    def __init__(self, dest, *, freq=None, duty_u16=None, duty_ns=None, invert=False):
+        self.pin = _pin_id(dest)
+        self._freq = 1907  # 기본 분주 설정의 주파수
+        self._duty = 0
+        self.events = collections.deque((), 1000)
+        self.reset_stats()
+        sim.board.pwm[self.pin] = self
+        if freq is not None:
+            self.freq(freq)
+        if duty_u16 is not None:
+            self.duty_u16(duty_u16)
+        if duty_ns is not None:
+            self.duty_ns(duty_ns)
+
+    def reset_stats(self):
+        self.changes = 0
+        self.on_us = 0
+        self._on_since = sim.clock.now_us() if self._duty else None
+
+    def _record(self):
+        now = sim.clock.now_us()
+        self.changes += 1
+        self.events.append((now // 1000, self._freq, self._duty))
+        if self._duty and self._on_since is None:
+            self._on_since = now
+        elif not self._duty and self._on_since is not None:
+            self.on_us += now - self._on_since
+            self._on_since = None
+
+    def freq(self, value=None):
+        if value is None:
+            return self._freq
+        if value < 8:
+            raise ValueError("freq too small")
+        self._freq = int(value)
+        self._record()
+
+    def duty_u16(self, value=None):
+        if value is None:
+            return self._duty
+        self._duty = min(max(int(value), 0), 65535)
+        self._record()
+
+    def duty_ns(self, value=None):
+        period_ns = 1000000000 // self._freq
+        if value is None:
+            return self._duty * period_ns // 65535
+        self.duty_u16(value * 65535 // period_ns)
+
+    def deinit(self):
+        self._duty = 0
+        self._record()
+
+    def stats(self):
+        on_us = self.on_us
+        if self._on_since is not None:
+            on_us += sim.clock.now_us() - self._on_since
+        return {"changes": self.changes, "on_ms": on_us // 1000, "freq": self._freq, "duty_u16": self._duty}
+
+
+class ADC:
+    """RP2040 ADC: GP26..GP29 are channels 0..3, channel 4 is the temperature sensor.
+
+    read_u16() samples sim.board.adc[channel] at the simulated time, quantises it
+    to 12 bits and spends the 2 µs conversion time of the 500 kS/s ADC.
+    """
+
+    CORE_TEMP = 4
+    CONVERSION_US = 2
+
+    def __init__(self, pin):
+        if isinstance(pin, Pin):
+            pin = pin.id
+        if pin in ADC_PINS:
+            pin = ADC_PINS[pin]
+        if pin not in (0, 1, 2, 3, 4):
+            raise ValueError("Pin doesn't have ADC capabilities")
+        self.channel = pin
+
+    def read_u16(self):
+        board = sim.board
+        board.adc_reads += 1
+        sim.clock.advance_us(self.CONVERSION_US)
+        return quantize_u16(board.adc[self.channel](sim.clock.now_us() - sim.clock.origin_us))
+
+
+def unique_id():
+    return sim.board.unique_id
+
+
+def freq(hz=None):
+    if hz is None:
+        return 125000000
+
+
+def reset():
+    raise SimulationEnd("machine.reset()")
+
+
+soft_reset = reset
+bootloader = reset
+
+PWRON_RESET = 1
+WDT_RESET = 3
+
+
+def reset_cause():
+    return PWRON_RESET
+
+
+def idle():
+    pass
+
+
+def lightsleep(time_ms=None):
+    if time_ms is not None:
+        sim.clock.sleep_ms(time_ms)
+
+
+def deepsleep(time_ms=None):
+    lightsleep(time_ms)
+    reset()
+
+
+def disable_irq():
+    return 0
+
+
+def enable_irq(state=0):
+    pass
+
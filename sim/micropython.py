@@ -0,0 +1,44 @@
+"""
+가짜 micropython 모듈 (const, native/viper 데코레이터는 그대로 통과)
+"""
+
+
+def const(value):
+    return value
+
+
+def native(function):
+    return function
+
+
+viper = native
+
+
+def opt_level(level=None):
+    return 0 if level is None else None
+
+
+def alloc_emergency_exception_buf(size):
+    pass
+
+
+def schedule(function, arg):
+    function(arg)
+
+
+def heap_lock():
+    return 0
+
+
+def heap_unlock():
+    return 0
+
+
+def kbd_intr(char):
+    pass
+
+
+def mem_info(verbose=None):
+    import gc
+
+    print("heap: used %d, free %d" % (gc.mem_alloc(), gc.mem_free()))
@@ -0,0 +1,65 @@
+"""
+가짜 neopixel 모듈 (write() 할 때마다 색을 기록)
+"""
+
+import collections
+
+import sim
+
+
+class NeoPixel:
+    """WS2812 strip; registers itself in sim.board.neopixels[pin].
+
+    The buffer is kept in GRB order like the real driver. write() records the
+    frame (as RGB tuples) in frames and spends 1.25 µs per bit plus the 50 µs latch.
+    """
+
+    ORDER = (1, 0, 2, 3)
+
+    def __init__(self, pin, n, bpp=3, timing=1):
+        self.pin = pin.id if hasattr(pin, "id") else pin
+        self.n = n
+        self.bpp = bpp
+        self.buf = bytearray(n * bpp)
+        self.frames = collections.deque((), 1000)  # (ticks_ms, (색, ...))
+        self.reset_stats()
+        sim.board.neopixels[self.pin] = self
+
+    def reset_stats(self):
+        self.writes = 0
+        self.changes = 0
+        self.busy_us = 0
+
+    def __len__(self):
+        return self.n
+
+    def __setitem__(self, index, value):
+        offset = index * self.bpp
+        for i in range(self.bpp):
+            self.buf[offset + self.ORDER[i]] = value[i]
+
+    def __getitem__(self, index):
+        offset = index * self.bpp
+        return tuple(self.buf[offset + self.ORDER[i]] for i in range(self.bpp))
+
+    def fill(self, value):
+        for index in range(self.n):
+            self[index] = value
+
+    def write(self):
+        frame = tuple(self[index] for index in range(self.n))
+        if not self.frames or self.frames[-1][1] != frame:
+            self.changes += 1
+        us = len(self.buf) * 8 * 5 // 4 + 50
+        self.writes += 1
+        self.busy_us += us
+        sim.clock.advance_us(us)
+        self.frames.append((sim.clock.now_us() // 1000, frame))
+
+    def stats(self):
+        return {
+            "writes": self.writes,
+            "changes": self.changes,
+            "busy_us": self.busy_us,
+            "last": list(self.frames[-1][1]) if self.frames else None,
+        }
@@ -0,0 +1,86 @@
+"""
+가짜 network 모듈 (루프백 WiFi: 연결되면 IP 가 127.0.0.1)
+"""
+
+import sim
+
+STA_IF = 0
+AP_IF = 1
+
+STAT_IDLE = 0
+STAT_CONNECTING = 1
+STAT_GOT_IP = 3
+STAT_CONNECT_FAIL = -1
+STAT_NO_AP_FOUND = -2
+STAT_WRONG_PASSWORD = -3
+
+PM_NONE = 0x00A11140
+PM_PERFORMANCE = 0x00111022
+PM_POWERSAVE = 0x00A11142
+
+_hostname = "PicoW"
+
+
+def hostname(name=None):
+    global _hostname
+    if name is None:
+        return _hostname
+    _hostname = name
+
+
+def country(code=None):
+    return "XX" if code is None else None
+
+
+class WLAN:
+    """Station (or AP) interface backed by sim.board.wifi"""
+
+    def __init__(self, interface_id=STA_IF):
+        self.interface = interface_id
+        self._wifi = sim.board.wifi
+        self._config = {"mac": sim.board.unique_id[:6], "pm": PM_PERFORMANCE, "hostname": _hostname}
+
+    def active(self, is_active=None):
+        if is_active is None:
+            return self._wifi.active
+        self._wifi.active = bool(is_active)
+        if not is_active:
+            self._wifi.connected_at = None
+
+    def connect(self, ssid=None, key=None, *, bssid=None):
+        if not self._wifi.active:
+            raise OSError("WLAN not active")
+        self._wifi.connect(ssid)
+
+    def disconnect(self):
+        self._wifi.connected_at = None
+
+    def isconnected(self):
+        return self.interface == STA_IF and self._wifi.isconnected()
+
+    def status(self, param=None):
+        if param == "rssi":
+            return -55
+        wifi = self._wifi
+        if not wifi.active or not wifi.connects:
+            return STAT_IDLE
+        if wifi.fail:
+            return STAT_NO_AP_FOUND
+        if wifi.connected_at is None:
+            return STAT_IDLE
+        return STAT_GOT_IP if wifi.isconnected() else STAT_CONNECTING
+
+    def ifconfig(self, config=None):
+        if config is None:
+            return self._wifi.ifconfig
+        self._wifi.ifconfig = tuple(config)
+
+    def config(self, *args, **kwargs):
+        if args:
+            if args[0] == "ssid":
+                return self._wifi.ssid
+            return self._config[args[0]]
+        self._config.update(kwargs)
+
+    def scan(self):
+        return [(b"sim-ap", b"\x02\x00\x00\x00\x00\x01", 6, -55, 3, False)]
@@ -0,0 +1,26 @@
+"""
+가짜 ntptime 모듈 (PC 시계는 이미 맞으므로 WiFi 연결만 확인)
+"""
+
+import errno
+import time as _time
+
+import sim
+
+host = "pool.ntp.org"
+timeout = 1
+requests = 0
+
+
+def time():
+    """Seconds from the NTP server (here the simulated wall clock); needs WiFi"""
+    global requests
+    if not sim.board.wifi.isconnected():
+        raise OSError(errno.ETIMEDOUT, "no network")
+    requests += 1
+    sim.clock.advance_us(30000)  # UDP 왕복 한 번
+    return _time.time()
+
+
+def settime():
+    time()
@@ -0,0 +1,79 @@
+"""
+가짜 ADC 입력 신호 (상수, 사인파 + 잡음, 시간표)
+"""
+
+import math
+import random
+
+
+class Constant:
+    """A fixed ADC level (0..65535)"""
+
+    def __init__(self, value):
+        self.value = value
+
+    def __call__(self, t_us):
+        return self.value
+
+
+class Waveform:
+    """Sum of sine tones around an offset, plus uniform noise.
+
+    tones -- ((frequency Hz, amplitude in u16 counts), ...)
+    """
+
+    def __init__(self, offset=32768, tones=(), noise=0, seed=0):
+        self.offset = offset
+        self.tones = tuple(tones)
+        self.noise = noise
+        self._random = random.Random(seed)
+
+    def __call__(self, t_us):
+        t = t_us / 1000000
+        value = self.offset
+        for frequency, amplitude in self.tones:
+            value += amplitude * math.sin(2 * math.pi * frequency * t)
+        if self.noise:
+            value += self._random.uniform(-self.noise, self.noise)
+        return value
+
+
+class Script:
+    """Plays ((duration ms, source), ...) one after another; repeats if loop is True,
+    otherwise keeps the last source"""
+
+    def __init__(self, segments, loop=True):
+        self.segments = tuple(segments)
+        self.loop = loop
+        self.period_us = sum(duration for duration, _ in self.segments) * 1000
+
+    def __call__(self, t_us):
+        if self.loop and self.period_us:
+            t_us %= self.period_us
+        start = 0
+        for duration, source in self.segments:
+            end = start + duration * 1000
+            if t_us < end:
+                return source(t_us - start)
+            start = end
+        return self.segments[-1][1](t_us - start)
+
+
+def quantize_u16(value):
+    """Clamp to the 12-bit RP2040 ADC range and scale like machine.ADC.read_u16()"""
+    raw = int(value) >> 4
+    if raw < 0:
+        raw = 0
+    elif raw > 4095:
+        raw = 4095
+    return (raw << 4) | (raw >> 8)
+
+
+def default_mic():
+    """Quiet room with a 1 kHz sound for 1 s every 5 s (pin 28 in 06)"""
+    return Script(
+        (
+            (4000, Waveform(32768, noise=300, seed=1)),
+            (1000, Waveform(32768, tones=((1000, 12000), (3100, 3000)), noise=600, seed=2)),
+        )
+    )
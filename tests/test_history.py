@@ -0,0 +1,63 @@
+"""
+lib/history.py 검사 (PC 에서 실행: python3 -m pytest tests)
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib"))
+
+from history import RingHistory  # noqa: E402
+
+FIELDS = (("temperature", "h", 10), ("humidity", "H", 10))
+
+
+def filled(capacity, records):
+    history = RingHistory(capacity, FIELDS)
+    for seq in range(1, records + 1):
+        history.append(seq, 1000 + seq, {"temperature": seq, "humidity": seq})
+    return history
+
+
+def drain(history, pieces, seq=100):
+    """Join the iter_json pieces, appending a record before every later piece"""
+    out = []
+    for piece in pieces:
+        out.append(piece)
+        seq += 1
+        history.append(seq, 1000 + seq, {"temperature": seq, "humidity": seq})
+    return json.loads("".join(out))
+
+
+def test_iter_json_ignores_appends_while_draining():
+    history = filled(10, 5)
+    result = drain(history, history.iter_json())
+    assert result["count"] == 5
+    assert result["seq"] == [1, 2, 3, 4, 5]
+    assert result["timestamp"] == [1001, 1002, 1003, 1004, 1005]
+    assert result["temperature"] == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert result["humidity"] == [1.0, 2.0, 3.0, 4.0, 5.0]
+
+
+def test_iter_json_columns_line_up_when_full_buffer_wraps():
+    history = filled(6, 20)
+    result = drain(history, history.iter_json(since=0, limit=4))
+    assert result["seq"] == [15, 16, 17, 18]
+    for name in ("timestamp", "temperature", "humidity"):
+        column = result[name]
+        assert len(column) == 4
+        for seq, value in zip(result["seq"], column):
+            # a record overwritten during the drain is null, never another record's value
+            if value is not None:
+                assert value == (1000 + seq if name == "timestamp" else seq)
+    assert result["humidity"][0] is None
+
+
+def test_iter_json_newest_records_stay_put_in_full_buffer():
+    history = filled(10, 30)
+    result = drain(history, history.iter_json(limit=3))
+    assert result["seq"] == [28, 29, 30]
+    assert result["timestamp"] == [1028, 1029, 1030]
+    assert result["temperature"] == [28.0, 29.0, 30.0]
+    assert result["humidity"] == [28.0, 29.0, 30.0]
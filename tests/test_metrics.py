@@ -0,0 +1,33 @@
+"""
+lib/metrics.py 검사 (PC 에서 실행: python3 -m pytest tests)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import sim  # noqa: E402
+
+sim.install()
+
+import metrics  # noqa: E402
+
+
+def show(full=False, page=0):
+    return ("full" if full else "partial", page)
+
+
+def test_wrap_passes_keyword_arguments():
+    registry = metrics.Registry()
+    histogram = registry.histogram("oled_refresh_us", "OLED refresh time")
+    timed = histogram.wrap(show)
+    assert timed() == ("partial", 0)
+    assert timed(full=True) == ("full", 0)
+    assert timed(True, page=3) == ("full", 3)
+    assert histogram.count() == 3
+
+
+def test_disabled_wrap_passes_keyword_arguments():
+    registry = metrics.Registry(enabled=False)
+    timed = registry.histogram("oled_refresh_us", "OLED refresh time").wrap(show)
+    assert timed(full=True) == ("full", 0)